@@ -0,0 +1,9 @@
+"""
+Folder for the performance benchmarks.
+
+Modules:
+    bson_write: The model to BSON write path benchmark.
+    fake_ergast: The local stand-in for the Ergast API.
+    startup: The CLI cold start benchmark.
+    suite: The benchmark suite run by `make bench`.
+"""
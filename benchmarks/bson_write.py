@@ -0,0 +1,175 @@
+"""
+This module contains the model to BSON write path benchmark.
+
+It compares the per-document cost and peak memory of the original write path, which
+dumps every model to a dict up front and leaves pymongo to add an _id and encode it,
+with the streamed raw BSON path used by MongoService.replace_collection.
+Pass --mongo-uri to also time real inserts of both paths into a MongoDB server.
+
+Usage:
+    python -m benchmarks.bson_write [--laps 2000] [--batch-size 1000] [--mongo-uri URI]
+
+Functions:
+    generate_races: Generate validated lap time models.
+    dict_path: Run the original dict write path.
+    raw_path: Run the streamed raw BSON write path.
+    measure: Measure the time and peak memory of a write path.
+    main: Run the benchmark.
+"""
+
+# Standard Library Imports
+import argparse
+import time
+import tracemalloc
+from collections.abc import Callable
+
+# Third Party Imports
+from bson import ObjectId, encode
+
+# Local Imports
+from src.database.mongo_service import encode_document
+from src.helpers.utilities import batched
+from src.models.lap_times import RaceLaps
+
+# Constants
+DRIVERS = 20
+
+
+def generate_races(laps: int) -> list[RaceLaps]:
+    """
+    Generate validated lap time models.
+
+    Args:
+        laps (int): The number of laps, every lap has a timing for every driver.
+
+    Returns:
+        list[RaceLaps]: A single race with the generated laps.
+    """
+    race = {
+        "season": "2023",
+        "round": "1",
+        "raceName": "Benchmark Grand Prix",
+        "Laps": [
+            {
+                "number": str(lap),
+                "Timings": [
+                    {
+                        "driverId": f"driver_{driver}",
+                        "position": str(driver),
+                        "time": "1:31.123",
+                    }
+                    for driver in range(1, DRIVERS + 1)
+                ],
+            }
+            for lap in range(1, laps + 1)
+        ],
+    }
+    return [RaceLaps.model_validate(race)]
+
+
+def dict_path(races: list[RaceLaps], batch_size: int, insert: Callable | None) -> int:
+    """
+    Run the original dict write path.
+
+    Every document is dumped to a dict before anything is written, then each dict gets
+    an _id and is encoded, which is what pymongo does with a list of dicts.
+
+    Args:
+        races (list[RaceLaps]): The races to write.
+        batch_size (int): The number of documents per insert.
+        insert (Callable | None): Insert a batch into MongoDB, None to only encode.
+
+    Returns:
+        int: The number of documents written.
+    """
+    documents = [document for race in races for document in race.documents()]
+    for batch in batched(documents, batch_size):
+        if insert:
+            insert(batch)
+            continue
+        for document in batch:
+            document["_id"] = ObjectId()
+            encode(document)
+    return len(documents)
+
+
+def raw_path(races: list[RaceLaps], batch_size: int, insert: Callable | None) -> int:
+    """
+    Run the streamed raw BSON write path.
+
+    Args:
+        races (list[RaceLaps]): The races to write.
+        batch_size (int): The number of documents per insert.
+        insert (Callable | None): Insert a batch into MongoDB, None to only encode.
+
+    Returns:
+        int: The number of documents written.
+    """
+    documents = (document for race in races for document in race.documents())
+    count = 0
+    for batch in batched(map(encode_document, documents), batch_size):
+        if insert:
+            insert(batch)
+        count += len(batch)
+    return count
+
+
+def measure(path: Callable, races: list[RaceLaps], batch_size: int, insert) -> dict:
+    """
+    Measure the time and peak memory of a write path.
+
+    Args:
+        path (Callable): The write path to measure.
+        races (list[RaceLaps]): The races to write.
+        batch_size (int): The number of documents per insert.
+        insert (Callable | None): Insert a batch into MongoDB, None to only encode.
+
+    Returns:
+        dict: The number of documents, microseconds per document and peak memory in MiB.
+    """
+    tracemalloc.start()
+    start = time.perf_counter()
+    count = path(races, batch_size, insert)
+    elapsed = time.perf_counter() - start
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+
+    return {
+        "documents": count,
+        "us_per_document": elapsed / count * 1_000_000,
+        "peak_mib": peak / 1024 / 1024,
+    }
+
+
+def main() -> None:
+    """Run the benchmark."""
+    parser = argparse.ArgumentParser(
+        description="Benchmark the model to BSON write path."
+    )
+    parser.add_argument("--laps", type=int, default=2000, help="The number of laps.")
+    parser.add_argument(
+        "--batch-size", type=int, default=1000, help="Documents per insert."
+    )
+    parser.add_argument("--mongo-uri", help="Also insert into this MongoDB server.")
+    options = parser.parse_args()
+
+    races = generate_races(options.laps)
+    insert = None
+    if options.mongo_uri:
+        from pymongo import MongoClient
+
+        collection = MongoClient(options.mongo_uri)["LyzerBenchmarks"]["bson_write"]
+        collection.drop()
+        insert = collection.insert_many
+
+    for name, path in (("dict", dict_path), ("raw", raw_path)):
+        result = measure(path, races, options.batch_size, insert)
+        print(
+            f"{name:>5}: {result['documents']} documents, "
+            f"{result['us_per_document']:.2f} us/document, "
+            f"peak {result['peak_mib']:.1f} MiB"
+        )
+
+
+if __name__ == "__main__":
+    main()
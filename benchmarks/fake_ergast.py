@@ -0,0 +1,434 @@
+"""
+This module contains the FakeErgast server used by the benchmarks.
+
+The server answers the Ergast endpoints Lyzer-ETL uses on localhost, with pagination,
+an optional delay on every response and an optional share of 429 responses, so loads
+can be measured without the network. Responses are generated for any season, unless a
+recorded fixture exists for the path, which is then served as it was recorded.
+
+Usage:
+    python -m benchmarks.fake_ergast [--port 8000] [--latency 0.05] [--throttle-rate 0.1]
+    python -m benchmarks.fake_ergast --record benchmarks/fixtures --seasons 2022 2023
+
+Classes:
+    FakeErgast: A local stand-in for the Ergast API.
+
+Functions:
+    schedule_rows: Generate the schedule of a season.
+    round_rows: Generate the rows of an endpoint for a round.
+    paginate: Build a paginated response from rows.
+    record_fixtures: Record responses from the Ergast API as fixtures.
+    main: Run the server or record fixtures.
+"""
+
+# Standard Library Imports
+import argparse
+import json
+import os
+import random
+import threading
+import time
+from datetime import date, timedelta
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import parse_qs, urlsplit
+
+# Constants
+API_PREFIX = "/api/f1/"
+DRIVERS = 20
+ROUNDS = 22
+LAPS = 60
+PIT_STOPS = 40
+DEFAULT_LIMIT = 30
+ROW_KEYS = {
+    "results": "Results",
+    "qualifying": "QualifyingResults",
+    "pitstops": "PitStops",
+    "laps": "Laps",
+}
+
+
+class FakeErgast:
+    """
+    A local stand-in for the Ergast API.
+
+    It can be used as a context manager, which starts the server on a free port in a
+    background thread and stops it on exit.
+
+    Attributes:
+        fixtures (str | None): The directory of recorded fixtures.
+        latency (float): The delay in seconds before every response.
+        throttle_rate (float): The share of requests answered with a 429.
+        requests (int): The number of requests received.
+        throttled (int): The number of requests answered with a 429.
+
+    Methods:
+        start: Start the server in a background thread.
+        stop: Stop the server.
+        respond: Build the status and body of the response to a request.
+    """
+
+    def __init__(
+        self,
+        fixtures: str | None = None,
+        latency: float = 0.0,
+        throttle_rate: float = 0.0,
+        port: int = 0,
+        seed: int = 0,
+    ) -> None:
+        """
+        Construct the FakeErgast class.
+
+        Args:
+            fixtures (str, optional): The directory of recorded fixtures.
+                Defaults to None, which generates every response.
+            latency (float, optional): The delay in seconds before every response.
+                Defaults to 0.0.
+            throttle_rate (float, optional): The share of requests answered with a 429,
+                between 0 and 1. Defaults to 0.0.
+            port (int, optional): The port to listen on. Defaults to 0, any free port.
+            seed (int, optional): The seed that decides which requests are throttled.
+                Defaults to 0.
+        """
+        self.fixtures = fixtures
+        self.latency = latency
+        self.throttle_rate = throttle_rate
+        self.port = port
+        self.random = random.Random(seed)
+        self.lock = threading.Lock()
+        self.requests = 0
+        self.throttled = 0
+        self.server = None
+
+    def __enter__(self) -> "FakeErgast":
+        """Start the server."""
+        self.start()
+        return self
+
+    def __exit__(self, *args: object) -> None:
+        """Stop the server."""
+        self.stop()
+
+    @property
+    def url(self) -> str:
+        """Get the base url of the fake API."""
+        return f"http://127.0.0.1:{self.server.server_port}{API_PREFIX.rstrip('/')}"
+
+    def start(self) -> None:
+        """Start the server in a background thread."""
+        fake = self
+
+        class Handler(BaseHTTPRequestHandler):
+            protocol_version = "HTTP/1.1"
+            disable_nagle_algorithm = True
+
+            def do_GET(self) -> None:
+                status, body = fake.respond(self.path)
+                self.send_response(status)
+                if status == 429:
+                    self.send_header("Retry-After", "0")
+                self.send_header("Content-Type", "application/json")
+                self.send_header("Content-Length", str(len(body)))
+                self.end_headers()
+                self.wfile.write(body)
+
+            def log_message(self, *args: object) -> None:
+                pass
+
+        self.server = ThreadingHTTPServer(("127.0.0.1", self.port), Handler)
+        self.server.daemon_threads = True
+        threading.Thread(target=self.server.serve_forever, daemon=True).start()
+
+    def stop(self) -> None:
+        """Stop the server."""
+        self.server.shutdown()
+        self.server.server_close()
+
+    def respond(self, target: str) -> tuple[int, bytes]:
+        """
+        Build the status and body of the response to a request.
+
+        Args:
+            target (str): The path and query of the request.
+
+        Returns:
+            tuple[int, bytes]: The status code and body of the response.
+        """
+        with self.lock:
+            self.requests += 1
+            throttled = self.random.random() < self.throttle_rate
+            if throttled:
+                self.throttled += 1
+
+        if self.latency:
+            time.sleep(self.latency)
+        if throttled:
+            return 429, b"{}"
+
+        parts = urlsplit(target)
+        path = parts.path.removeprefix(API_PREFIX)
+        if self.fixtures:
+            fixture = os.path.join(self.fixtures, path)
+            if os.path.isfile(fixture):
+                with open(fixture, "rb") as fixture_file:
+                    return 200, fixture_file.read()
+
+        query = parse_qs(parts.query)
+        limit = int(query.get("limit", [DEFAULT_LIMIT])[0])
+        offset = int(query.get("offset", [0])[0])
+        segments = path.removesuffix(".json").split("/")
+
+        try:
+            season = int(segments[0])
+            if len(segments) == 1:
+                rows = schedule_rows(season)
+                return 200, paginate(season, None, None, rows, limit, offset)
+            round, endpoint = int(segments[1]), segments[2]
+            rows = round_rows(season, round, endpoint)
+        except (ValueError, IndexError, KeyError):
+            return 404, b"{}"
+
+        return 200, paginate(season, round, endpoint, rows, limit, offset)
+
+
+def schedule_rows(season: int) -> list[dict]:
+    """
+    Generate the schedule of a season.
+
+    Args:
+        season (int): The season.
+
+    Returns:
+        list[dict]: A race for every round, every fourth round has a sprint.
+    """
+    first_race = date(season, 3, 5)
+    races = []
+    for round in range(1, ROUNDS + 1):
+        race_day = first_race + timedelta(weeks=round - 1)
+        race = {
+            "season": str(season),
+            "round": str(round),
+            "raceName": f"Grand Prix {round}",
+            "date": race_day.isoformat(),
+            "time": "14:00:00Z",
+        }
+        sessions = ["FirstPractice", "SecondPractice", "ThirdPractice", "Qualifying"]
+        if round % 4 == 0:
+            sessions[2] = "Sprint"
+        for days_before, session in zip((2, 2, 1, 1), sessions):
+            race[session] = {
+                "date": (race_day - timedelta(days=days_before)).isoformat(),
+                "time": "12:00:00Z",
+            }
+        races.append(race)
+    return races
+
+
+def round_rows(season: int, round: int, endpoint: str) -> list[dict]:
+    """
+    Generate the rows of an endpoint for a round.
+
+    Lap times are paginated on their timings, so every timing is a row of its own.
+
+    Args:
+        season (int): The season.
+        round (int): The round.
+        endpoint (str): The endpoint, one of ROW_KEYS.
+
+    Returns:
+        list[dict]: The rows of the round.
+    """
+    drivers = [
+        {
+            "driverId": f"driver_{number}",
+            "permanentNumber": str(number),
+            "code": f"D{number:02d}",
+            "givenName": "Given",
+            "familyName": f"Family {number}",
+            "dateOfBirth": "1990-01-01",
+            "nationality": "Nowhere",
+        }
+        for number in range(1, DRIVERS + 1)
+    ]
+    constructor = {"constructorId": "team", "name": "Team", "nationality": "Nowhere"}
+
+    if endpoint == "results":
+        return [
+            {
+                "number": driver["permanentNumber"],
+                "position": str(position),
+                "positionText": str(position),
+                "points": str(max(0, 26 - position)),
+                "Driver": driver,
+                "Constructor": constructor,
+                "grid": str(position),
+                "laps": str(LAPS),
+                "status": "Finished",
+                "Time": {"millis": str(5_400_000 + position), "time": "1:30:00.000"},
+                "FastestLap": {
+                    "rank": str(position),
+                    "lap": str(LAPS - 1),
+                    "Time": {"time": "1:31.123"},
+                    "AverageSpeed": {"units": "kph", "speed": "210.000"},
+                },
+            }
+            for position, driver in enumerate(drivers, start=1)
+        ]
+    if endpoint == "qualifying":
+        return [
+            {
+                "number": driver["permanentNumber"],
+                "position": str(position),
+                "Driver": driver,
+                "Constructor": constructor,
+                "Q1": "1:30.000",
+                "Q2": "1:29.500",
+                "Q3": "1:29.000",
+            }
+            for position, driver in enumerate(drivers, start=1)
+        ]
+    if endpoint == "pitstops":
+        return [
+            {
+                "driverId": drivers[stop % DRIVERS]["driverId"],
+                "lap": str(10 + stop),
+                "stop": str(stop // DRIVERS + 1),
+                "time": "14:30:00",
+                "duration": "22.500",
+            }
+            for stop in range(PIT_STOPS)
+        ]
+    if endpoint == "laps":
+        return [
+            {
+                "number": str(lap),
+                "driverId": driver["driverId"],
+                "position": str(position),
+                "time": "1:31.123",
+            }
+            for lap in range(1, LAPS + 1)
+            for position, driver in enumerate(drivers, start=1)
+        ]
+    raise KeyError(endpoint)
+
+
+def paginate(
+    season: int,
+    round: int | None,
+    endpoint: str | None,
+    rows: list[dict],
+    limit: int,
+    offset: int,
+) -> bytes:
+    """
+    Build a paginated response from rows.
+
+    Args:
+        season (int): The season.
+        round (int | None): The round, None for a schedule.
+        endpoint (str | None): The endpoint, None for a schedule.
+        rows (list[dict]): Every row of the response.
+        limit (int): The number of rows in the page.
+        offset (int): The offset of the first row in the page.
+
+    Returns:
+        bytes: The encoded response.
+    """
+    end = offset + limit
+    page = rows[offset:end]
+    if endpoint is None:
+        races = page
+    elif not page:
+        races = []
+    else:
+        race = {"season": str(season), "round": str(round), "raceName": "Grand Prix"}
+        if endpoint == "laps":
+            laps = {}
+            for row in page:
+                timing = {key: value for key, value in row.items() if key != "number"}
+                laps.setdefault(row["number"], []).append(timing)
+            race["Laps"] = [
+                {"number": number, "Timings": timings}
+                for number, timings in laps.items()
+            ]
+        else:
+            race[ROW_KEYS[endpoint]] = page
+        races = [race]
+
+    response = {
+        "MRData": {
+            "limit": str(limit),
+            "offset": str(offset),
+            "total": str(len(rows)),
+            "RaceTable": {"season": str(season), "Races": races},
+        }
+    }
+    return json.dumps(response).encode("UTF-8")
+
+
+def record_fixtures(directory: str, seasons: list[int]) -> int:
+    """
+    Record responses from the Ergast API as fixtures.
+
+    The first page of the schedule and of every round endpoint is recorded for every
+    season. Fixtures are served as they were recorded, whatever page is asked for.
+
+    Args:
+        directory (str): The directory to write the fixtures to.
+        seasons (list[int]): The seasons to record.
+
+    Returns:
+        int: The number of fixtures recorded.
+    """
+    from src.api.ergast_service import MAX_PAGE_SIZE, ErgastService, page_url
+
+    recorded = 0
+    with ErgastService() as ergast_service:
+        for season in seasons:
+            paths = [f"{season}.json"]
+            paths += [
+                f"{season}/{schedule.Round}/{endpoint}.json"
+                for schedule in ergast_service.get_schedules(season)
+                for endpoint in ROW_KEYS
+            ]
+            for path in paths:
+                url = page_url(f"{ergast_service.base_url}/{path}", MAX_PAGE_SIZE, 0)
+                body, _ = ergast_service.get_raw(url)
+                fixture = os.path.join(directory, path)
+                os.makedirs(os.path.dirname(fixture), exist_ok=True)
+                with open(fixture, "wb") as fixture_file:
+                    fixture_file.write(body)
+                recorded += 1
+    return recorded
+
+
+def main() -> None:
+    """Run the server or record fixtures."""
+    parser = argparse.ArgumentParser(description="Run a local stand-in for Ergast.")
+    parser.add_argument("--port", type=int, default=8000, help="The port to use.")
+    parser.add_argument("--fixtures", help="The directory of recorded fixtures.")
+    parser.add_argument("--latency", type=float, default=0.0, help="Delay in seconds.")
+    parser.add_argument(
+        "--throttle-rate", type=float, default=0.0, help="Share of 429s."
+    )
+    parser.add_argument("--record", help="Record fixtures into this directory.")
+    parser.add_argument("--seasons", type=int, nargs="*", default=[], help="To record.")
+    options = parser.parse_args()
+
+    if options.record:
+        count = record_fixtures(options.record, options.seasons)
+        print(f"Recorded {count} fixtures into {options.record}")
+        return
+
+    fake = FakeErgast(
+        options.fixtures, options.latency, options.throttle_rate, options.port
+    )
+    fake.start()
+    print(f"Serving a fake Ergast API on {fake.url}, press Ctrl+C to stop")
+    try:
+        threading.Event().wait()
+    except KeyboardInterrupt:
+        fake.stop()
+
+
+if __name__ == "__main__":
+    main()
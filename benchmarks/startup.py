@@ -0,0 +1,100 @@
+"""
+This module contains the CLI cold start benchmark.
+
+It runs a Lyzer-ETL command in a fresh interpreter a number of times, reports the
+wall time and, using `python -X importtime`, the modules that are the most expensive
+to import. Pass --executable to time a PyInstaller build instead of the script.
+
+Usage:
+    python -m benchmarks.startup [--runs 10] [--top 15] [--executable dist/Lyzer-ETL] [command ...]
+
+Functions:
+    time_command: Time a number of runs of a command.
+    slowest_imports: Get the most expensive imports of a command.
+    main: Run the benchmark.
+"""
+
+# Standard Library Imports
+import argparse
+import statistics
+import subprocess
+import sys
+import time
+
+# Constants
+MAIN_SCRIPT = "main.py"
+
+
+def time_command(command: list[str], runs: int) -> list[float]:
+    """
+    Time a number of runs of a command.
+
+    Args:
+        command (list[str]): The command to run.
+        runs (int): The number of runs.
+
+    Returns:
+        list[float]: The wall time of every run in seconds.
+    """
+    timings = []
+    for _ in range(runs):
+        start = time.perf_counter()
+        subprocess.run(command, capture_output=True, check=True)
+        timings.append(time.perf_counter() - start)
+    return timings
+
+
+def slowest_imports(arguments: list[str], top: int) -> list[tuple[int, str]]:
+    """
+    Get the most expensive imports of a command.
+
+    Args:
+        arguments (list[str]): The arguments to pass to the CLI.
+        top (int): The number of imports to return.
+
+    Returns:
+        list[tuple[int, str]]: The cumulative import time in microseconds and the name
+            of the most expensive imports, most expensive first.
+    """
+    command = [sys.executable, "-X", "importtime", MAIN_SCRIPT, *arguments]
+    result = subprocess.run(command, capture_output=True, text=True, check=True)
+
+    imports = []
+    for line in result.stderr.splitlines():
+        if not line.startswith("import time:") or "cumulative" in line:
+            continue
+        _, cumulative, name = line.removeprefix("import time:").split("|")
+        imports.append((int(cumulative), name.strip()))
+
+    return sorted(imports, reverse=True)[:top]
+
+
+def main() -> None:
+    """Run the benchmark."""
+    parser = argparse.ArgumentParser(description="Benchmark the Lyzer-ETL cold start.")
+    parser.add_argument("--runs", type=int, default=10, help="The number of runs.")
+    parser.add_argument("--top", type=int, default=15, help="The imports to show.")
+    parser.add_argument("--executable", help="Time a built executable instead.")
+    parser.add_argument("arguments", nargs="*", default=["version"])
+    options = parser.parse_args()
+
+    if options.executable:
+        command = [options.executable, *options.arguments]
+    else:
+        command = [sys.executable, MAIN_SCRIPT, *options.arguments]
+
+    timings = time_command(command, options.runs)
+    print(f"Command: {' '.join(command)}")
+    print(f"Runs: {options.runs}")
+    print(f"Median: {statistics.median(timings) * 1000:.1f} ms")
+    print(f"Min: {min(timings) * 1000:.1f} ms")
+    print(f"Max: {max(timings) * 1000:.1f} ms")
+
+    if not options.executable:
+        print("\nSlowest imports (cumulative):")
+        for cumulative, name in slowest_imports(options.arguments, options.top):
+            print(f"{cumulative / 1000:>10.1f} ms  {name}")
+
+
+if __name__ == "__main__":
+    main()
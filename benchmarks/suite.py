@@ -0,0 +1,413 @@
+"""
+This module contains the Lyzer-ETL benchmark suite.
+
+It starts a FakeErgast server and measures the schedule fetch latency, validation
+throughput, schedule inserts, the throughput of every sink, the CLI cold start and
+end-to-end multi-season loads. MongoDB writes go to the server given with --mongo-uri,
+otherwise to mongomock when it is installed, otherwise they are skipped. The results are written as
+JSON, pass an earlier results file with --compare to see what changed.
+
+Usage:
+    python -m benchmarks.suite [--seasons 10] [--latency 0.01] [--throttle-rate 0.05]
+        [--mongo-uri URI] [--output results.json] [--compare earlier.json]
+
+Functions:
+    summarize: Summarize a list of timings.
+    bench_get_schedules: Measure the latency of fetching schedules.
+    bench_validation: Measure the validation throughput of every response model.
+    bench_insert_schedules: Measure the throughput of inserting schedules.
+    bench_sinks: Measure the throughput of loading race results into every sink.
+    bench_cold_start: Measure the CLI cold start.
+    bench_end_to_end: Measure loading several seasons end to end.
+    mongo_service_for: Get the Mongo service the benchmarks write with.
+    flatten: Flatten nested results into dotted metric names.
+    compare: Print the change of every metric against earlier results.
+    main: Run the benchmark suite.
+"""
+
+# Standard Library Imports
+import argparse
+import json
+import os
+import platform
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+from datetime import datetime
+
+# Local Imports
+from benchmarks.fake_ergast import (
+    ROUNDS,
+    FakeErgast,
+    round_rows,
+    paginate,
+    schedule_rows,
+)
+from benchmarks.startup import MAIN_SCRIPT, time_command
+from src.api.ergast_service import ROUND_ENDPOINTS, ErgastService, loads
+from src.database import client_pool
+from src.database.mongo_service import MongoService
+from src.models.results import ResultsResponse
+from src.models.schedules import ScheduleResponse
+from src.sinks.jsonl_sink import JsonlSink
+from src.sinks.sqlite_sink import SqliteSink
+
+# Constants
+RESULTS_DIRECTORY = os.path.join("benchmarks", "results")
+MONGOMOCK_URI = "mongomock://benchmarks"
+FIRST_SEASON = 2000
+
+
+def summarize(timings: list[float]) -> dict:
+    """
+    Summarize a list of timings.
+
+    Args:
+        timings (list[float]): The timings in seconds.
+
+    Returns:
+        dict: The mean, median, 95th percentile and maximum in milliseconds.
+    """
+    ordered = sorted(timings)
+    return {
+        "mean_ms": statistics.fmean(ordered) * 1000,
+        "p50_ms": statistics.median(ordered) * 1000,
+        "p95_ms": ordered[min(len(ordered) - 1, int(len(ordered) * 0.95))] * 1000,
+        "max_ms": ordered[-1] * 1000,
+    }
+
+
+def bench_get_schedules(ergast_service: ErgastService, seasons: list[int]) -> dict:
+    """
+    Measure the latency of fetching schedules.
+
+    Args:
+        ergast_service (ErgastService): The service to fetch with.
+        seasons (list[int]): The seasons to fetch.
+
+    Returns:
+        dict: The latency summary.
+    """
+    timings = []
+    for season in seasons:
+        start = time.perf_counter()
+        ergast_service.get_schedules(season)
+        timings.append(time.perf_counter() - start)
+    return summarize(timings)
+
+
+def bench_validation(repeats: int) -> dict:
+    """
+    Measure the validation throughput of every response model.
+
+    Args:
+        repeats (int): The number of times every page is validated.
+
+    Returns:
+        dict: The pages and rows validated per second, keyed by endpoint.
+    """
+    pages = {"schedule": (ScheduleResponse, schedule_rows(FIRST_SEASON), None)}
+    for endpoint, model in ROUND_ENDPOINTS.items():
+        pages[endpoint] = (model, round_rows(FIRST_SEASON, 1, endpoint), endpoint)
+
+    results = {}
+    for name, (model, rows, endpoint) in pages.items():
+        body = paginate(FIRST_SEASON, 1, endpoint, rows, len(rows), 0)
+        start = time.perf_counter()
+        for _ in range(repeats):
+            model.model_validate(loads(body))
+        elapsed = time.perf_counter() - start
+        results[name] = {
+            "pages_per_s": repeats / elapsed,
+            "rows_per_s": repeats * len(rows) / elapsed,
+        }
+    return results
+
+
+def bench_insert_schedules(
+    ergast_service: ErgastService, mongo_service: MongoService, seasons: list[int]
+) -> dict:
+    """
+    Measure the throughput of inserting schedules.
+
+    Args:
+        ergast_service (ErgastService): The service to fetch the schedules with.
+        mongo_service (MongoService): The service to insert with.
+        seasons (list[int]): The seasons to insert.
+
+    Returns:
+        dict: The documents inserted per second.
+    """
+    schedules = {season: ergast_service.get_schedules(season) for season in seasons}
+    documents = sum(len(season_schedules) for season_schedules in schedules.values())
+
+    start = time.perf_counter()
+    for season, season_schedules in schedules.items():
+        mongo_service.insert_schedules(season, season_schedules)
+    elapsed = time.perf_counter() - start
+    return {"documents": documents, "docs_per_s": documents / elapsed}
+
+
+def bench_sinks(
+    mongo_service: MongoService | None, seasons: list[int], directory: str
+) -> dict:
+    """
+    Measure the throughput of loading race results into every sink.
+
+    The results of every round are validated once up front, so only the writes are
+    timed. MongoDB is written last, as it adds an id to every document it inserts.
+
+    Args:
+        mongo_service (MongoService | None): The service to insert with, if any.
+        seasons (list[int]): The seasons to insert.
+        directory (str): The directory of the jsonl and sqlite sinks.
+
+    Returns:
+        dict: The documents inserted per second, keyed by sink.
+    """
+    documents = {}
+    for season in seasons:
+        documents[season] = []
+        for round in range(1, ROUNDS + 1):
+            rows = round_rows(season, round, "results")
+            body = paginate(season, round, "results", rows, len(rows), 0)
+            response = ResultsResponse.model_validate(loads(body))
+            for race in response.MRData.RaceTable.Races:
+                documents[season].extend(race.documents())
+    count = sum(len(season_documents) for season_documents in documents.values())
+
+    sinks = {
+        "jsonl": JsonlSink(os.path.join(directory, "jsonl")),
+        "sqlite": SqliteSink(os.path.join(directory, "lyzer.db")),
+    }
+    if mongo_service:
+        sinks["mongo"] = mongo_service
+
+    results = {}
+    for name, sink in sinks.items():
+        with sink:
+            start = time.perf_counter()
+            for season, season_documents in documents.items():
+                sink.insert_dataset("Results", season, season_documents)
+            elapsed = time.perf_counter() - start
+        results[name] = {"documents": count, "docs_per_s": count / elapsed}
+    return results
+
+
+def bench_cold_start(runs: int) -> dict:
+    """
+    Measure the CLI cold start.
+
+    Args:
+        runs (int): The number of runs.
+
+    Returns:
+        dict: The summary of the `version` and `--help` start times.
+    """
+    return {
+        "version": summarize(
+            time_command([sys.executable, MAIN_SCRIPT, "version"], runs)
+        ),
+        "help": summarize(time_command([sys.executable, MAIN_SCRIPT, "--help"], runs)),
+    }
+
+
+def bench_end_to_end(
+    fake: FakeErgast, mongo_service: MongoService, seasons: list[int], workers: int
+) -> dict:
+    """
+    Measure loading several seasons end to end.
+
+    Schedules are loaded with the threaded loader of `load schedule` and race results
+    with the asyncio pipeline of `load bulk`, both without a response cache.
+
+    Args:
+        fake (FakeErgast): The fake Ergast server.
+        mongo_service (MongoService): The service to write with.
+        seasons (list[int]): The seasons to load.
+        workers (int): The number of concurrent requests.
+
+    Returns:
+        dict: The wall time, requests sent and requests throttled of every load.
+    """
+    from rich.console import Console
+
+    from src.cli.load_cli import WriteMode, load_schedules
+    from src.pipeline.async_pipeline import AsyncPipeline, run_pipeline
+
+    status = Console(quiet=True).status("")
+    results = {}
+    runs = {
+        "schedules": lambda ergast_service: load_schedules(
+            ergast_service, mongo_service, seasons, workers, WriteMode.REPLACE, status
+        ),
+        "results_pipeline": lambda ergast_service: run_pipeline(
+            AsyncPipeline(ergast_service, mongo_service, workers),
+            seasons,
+            [("Results", "results")],
+        ),
+    }
+
+    for name, load in runs.items():
+        requests, throttled = fake.requests, fake.throttled
+        with ErgastService(
+            pool_size=workers,
+            rate=1000,
+            burst=workers,
+            backoff=0.01,
+            base_url=fake.url,
+        ) as ergast_service:
+            start = time.perf_counter()
+            load(ergast_service)
+            elapsed = time.perf_counter() - start
+        results[name] = {
+            "seconds": elapsed,
+            "requests": fake.requests - requests,
+            "throttled": fake.throttled - throttled,
+        }
+    return results
+
+
+def mongo_service_for(mongo_uri: str | None) -> MongoService | None:
+    """
+    Get the Mongo service the benchmarks write with.
+
+    Args:
+        mongo_uri (str | None): The connection string of a MongoDB server, if any.
+
+    Returns:
+        MongoService | None: A service for the server, or for mongomock when it is
+            installed, None otherwise.
+    """
+    if mongo_uri:
+        return MongoService(mongo_uri)
+
+    try:
+        import mongomock
+    except ImportError:
+        return None
+
+    # mongomock is registered as the shared client, it cannot handle raw BSON
+    client_pool.clients[MONGOMOCK_URI] = mongomock.MongoClient()
+    return MongoService(MONGOMOCK_URI, raw_bson=False)
+
+
+def flatten(results: dict, prefix: str = "") -> dict:
+    """
+    Flatten nested results into dotted metric names.
+
+    Args:
+        results (dict): The nested results.
+        prefix (str, optional): The prefix of the metric names. Defaults to "".
+
+    Returns:
+        dict: The numeric metrics, keyed by dotted name.
+    """
+    metrics = {}
+    for key, value in results.items():
+        name = f"{prefix}{key}"
+        if isinstance(value, dict):
+            metrics.update(flatten(value, f"{name}."))
+        elif isinstance(value, (int, float)):
+            metrics[name] = value
+    return metrics
+
+
+def compare(results: dict, earlier_path: str) -> None:
+    """
+    Print the change of every metric against earlier results.
+
+    Args:
+        results (dict): The results of this run.
+        earlier_path (str): The path of the earlier results file.
+    """
+    with open(earlier_path, "r", encoding="UTF-8") as earlier_file:
+        earlier = json.load(earlier_file)
+
+    current_metrics = flatten(results["results"])
+    earlier_metrics = flatten(earlier["results"])
+    print(f"\nCompared with {earlier.get('commit', '?')} ({earlier_path}):")
+    for name, value in current_metrics.items():
+        before = earlier_metrics.get(name)
+        if not before:
+            continue
+        change = (value - before) / before * 100
+        print(f"{name:<48} {before:>14.2f} -> {value:>14.2f} ({change:+.1f}%)")
+
+
+def main() -> None:
+    """Run the benchmark suite."""
+    parser = argparse.ArgumentParser(description="Run the Lyzer-ETL benchmark suite.")
+    parser.add_argument("--seasons", type=int, default=10, help="Seasons to load.")
+    parser.add_argument("--workers", type=int, default=8, help="Concurrent requests.")
+    parser.add_argument("--latency", type=float, default=0.01, help="Fake latency.")
+    parser.add_argument(
+        "--throttle-rate", type=float, default=0.05, help="Share of 429s."
+    )
+    parser.add_argument("--fixtures", help="The directory of recorded fixtures.")
+    parser.add_argument("--validation-repeats", type=int, default=50)
+    parser.add_argument("--cold-start-runs", type=int, default=5)
+    parser.add_argument("--mongo-uri", help="Write to this MongoDB server.")
+    parser.add_argument("--output", help="The results file to write.")
+    parser.add_argument("--compare", help="An earlier results file to compare with.")
+    options = parser.parse_args()
+
+    commit = subprocess.run(
+        ["git", "rev-parse", "--short", "HEAD"], capture_output=True, text=True
+    ).stdout.strip()
+    seasons = list(range(FIRST_SEASON, FIRST_SEASON + options.seasons))
+    mongo_service = mongo_service_for(options.mongo_uri)
+    results = {}
+
+    with FakeErgast(options.fixtures, options.latency, options.throttle_rate) as fake:
+        with ErgastService(
+            rate=1000, burst=1, backoff=0.01, base_url=fake.url
+        ) as ergast:
+            results["get_schedules"] = bench_get_schedules(ergast, seasons)
+            if mongo_service:
+                results["insert_schedules"] = bench_insert_schedules(
+                    ergast, mongo_service, seasons
+                )
+        results["validation"] = bench_validation(options.validation_repeats)
+        with tempfile.TemporaryDirectory() as directory:
+            results["sinks"] = bench_sinks(mongo_service, seasons, directory)
+        if mongo_service:
+            results["end_to_end"] = bench_end_to_end(
+                fake, mongo_service, seasons, options.workers
+            )
+    results["cold_start"] = bench_cold_start(options.cold_start_runs)
+
+    report = {
+        "commit": commit,
+        "timestamp": datetime.now().isoformat(),
+        "python": platform.python_version(),
+        "platform": platform.platform(),
+        "mongo": "server"
+        if options.mongo_uri
+        else "mongomock"
+        if mongo_service
+        else None,
+        "options": vars(options),
+        "results": results,
+    }
+    output = options.output or os.path.join(
+        RESULTS_DIRECTORY, f"{datetime.now():%Y%m%d-%H%M%S}-{commit or 'unknown'}.json"
+    )
+    os.makedirs(os.path.dirname(output) or ".", exist_ok=True)
+    with open(output, "w", encoding="UTF-8") as output_file:
+        json.dump(report, output_file, indent=4)
+
+    for name, value in flatten(results).items():
+        print(f"{name:<48} {value:>14.2f}")
+    if mongo_service is None:
+        print("\nWrite benchmarks skipped, pass --mongo-uri or install mongomock.")
+    print(f"\nResults written to {output}")
+
+    if options.compare:
+        compare(report, options.compare)
+
+
+if __name__ == "__main__":
+    main()
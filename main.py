@@ -1,15 +1,30 @@
 """This module contains the entry point for the Lyzer-ETL application."""
 
-# Local imports
-from src.cli.typer_cli import app
+# System imports
+import sys
 
 
 def main() -> None:
     """
     Entry point for the Lyzer-ETL application.
 
-    This will call the Typer CLI app.
+    This will call the Typer CLI app. The version command is answered before the
+    CLI is imported, so it starts without paying for Typer and Rich. Its output is
+    the same as the Typer version command.
     """
+    if sys.argv[1:] == ["version"]:
+        from src.helpers.utilities import read_version_file
+
+        print(f"Lyzer-ETL version {read_version_file()}")
+        return
+
+    from multiprocessing import freeze_support
+
+    # Lets the pipeline's worker processes start from the PyInstaller executable
+    freeze_support()
+
+    from src.cli.typer_cli import app
+
     app()
 
 
@@ -6,4 +6,6 @@ Modules:
         handling data to and from Github.
     - ergast_service: Contains the ErgastService class, which is responsible for
         handling data to and from Ergast.
+    - rate_limiter: Contains the TokenBucket class, which is responsible for keeping
+        requests within an API's rate limits.
 """
@@ -4,26 +4,338 @@ This module contains the ErgastService class.
 The ErgastService class is responsible for all interactions with the Ergast API.
 """
 
+import random
+import time
+from collections import deque
+from collections.abc import Iterator
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime, timezone
+from email.utils import parsedate_to_datetime
+from threading import Lock
+from typing import TypeVar
+from urllib.parse import urlencode
+
 import requests
+from pydantic import BaseModel
+from requests.adapters import HTTPAdapter
 
+from src.api.rate_limiter import TokenBucket
+from src.cache.response_cache import ResponseCache
+from src.metrics.recorder import MetricsRecorder
+from src.models.lap_times import LapResponse, RaceLaps
+from src.models.pit_stops import PitStopResponse, RacePitStops
+from src.models.qualifying import QualifyingResponse, RaceQualifying
+from src.models.results import RaceResults, ResultsResponse
 from src.models.schedules import ScheduleResponse, Schedule
 
+# orjson is optional, it decodes payloads faster than the standard library
+try:
+    from orjson import loads
+except ImportError:
+    from json import loads
+
+# Constants
+BASE_URL = "https://ergast.com/api/f1"
+HEADERS = {
+    "Accept": "application/json",
+    "Accept-Encoding": "gzip, deflate",
+}
+RETRY_STATUS_CODES = {429, 500, 502, 503, 504}
+MAX_PAGE_SIZE = 1000
+MAX_RETRY_AFTER = 120.0
+MAX_TIMINGS = 1000
+ROUND_ENDPOINTS = {
+    "results": ResultsResponse,
+    "qualifying": QualifyingResponse,
+    "pitstops": PitStopResponse,
+    "laps": LapResponse,
+}
+
+ResponseModel = TypeVar("ResponseModel", bound=BaseModel)
+
 
 class ErgastService:
     """
     This class is responsible for all interactions with the Ergast API.
 
+    The service owns a single connection-pooled session that is reused by every
+    request, so bulk loads only pay for the TCP and TLS handshakes once per connection.
+    It can be used as a context manager to close the session when done.
+    When given a cache, responses are served from and stored in the cache.
+
+    Requests are throttled by a token bucket so bulk loads stay within Ergast's rate
+    limits, and throttled or failed requests are retried with exponential backoff.
+
     Attributes:
         base_url (str): The base url for the Ergast API.
+        timeout (int): The timeout in seconds for every request.
+        session (Session): The pooled session used for every request.
+        cache (ResponseCache | None): The response cache, None if caching is disabled.
+        limiter (TokenBucket): The rate limiter every request goes through.
+        max_retries (int): The maximum number of retries for a request.
+        backoff (float): The base backoff in seconds between retries.
+        max_backoff (float): The maximum backoff in seconds between retries.
+        timings (deque[dict]): The url, status, attempts and duration of the last
+            MAX_TIMINGS requests, so a long-running service never grows it unbounded.
+        request_count (int): The number of requests made, retries included once.
+        page_workers (int): The maximum number of pages fetched at once.
 
     Methods:
+        create_session: Create the pooled session used for every request.
+        close: Close the session and all pooled connections.
+        request: Send a throttled request to the Ergast API, retrying on failure.
+        retry_delay: Get the number of seconds to wait before retrying a request.
+        get_raw: Get the raw body of a response from the Ergast API.
         get_data: Get data from the Ergast API.
+        get_model: Get a response from the Ergast API as a model.
+        validate: Decode and validate a raw response.
+        iter_pages: Get every page of a paginated endpoint from the Ergast API.
         get_schedules: Get schedules from the Ergast API.
+        iter_results: Get the race results of a season from the Ergast API.
+        iter_qualifying: Get the qualifying results of a season from the Ergast API.
+        iter_pit_stops: Get the pit stops of a season from the Ergast API.
+        iter_lap_times: Get the lap times of a season from the Ergast API.
+        iter_round: Get the races of a single round of an endpoint from the Ergast API.
     """
 
-    def __init__(self) -> None:
-        """Construct the ErgastService class."""
-        self.base_url = "https://ergast.com/api/f1"
+    def __init__(
+        self,
+        pool_size: int = 10,
+        keep_alive: bool = True,
+        gzip: bool = True,
+        timeout: int = 10,
+        cache: ResponseCache | None = None,
+        rate: float = 4.0,
+        burst: int = 4,
+        max_retries: int = 5,
+        backoff: float = 0.5,
+        max_backoff: float = 30.0,
+        page_workers: int = 4,
+        base_url: str = BASE_URL,
+        metrics: MetricsRecorder | None = None,
+    ) -> None:
+        """
+        Construct the ErgastService class.
+
+        Args:
+            pool_size (int, optional): The maximum number of pooled connections to
+                keep open to the Ergast API. Defaults to 10.
+            keep_alive (bool, optional): Keep connections open between requests.
+                Defaults to True.
+            gzip (bool, optional): Ask the Ergast API for compressed responses.
+                Defaults to True.
+            timeout (int, optional): The timeout in seconds for every request.
+                Defaults to 10.
+            cache (ResponseCache, optional): The response cache to use.
+                Defaults to None, which disables caching.
+            rate (float, optional): The sustained number of requests per second.
+                Defaults to 4.0.
+            burst (int, optional): The number of requests that can be sent at once.
+                Defaults to 4.
+            max_retries (int, optional): The maximum number of retries for a request.
+                Defaults to 5.
+            backoff (float, optional): The base backoff in seconds between retries,
+                doubled after every attempt. Defaults to 0.5.
+            max_backoff (float, optional): The maximum backoff in seconds between
+                retries. Defaults to 30.0.
+            page_workers (int, optional): The maximum number of pages fetched at once.
+                Defaults to 4.
+            base_url (str, optional): The base url of the Ergast API.
+                Defaults to BASE_URL.
+            metrics (MetricsRecorder, optional): The recorder of stage timings and
+                counters. Defaults to None, which records into a private recorder.
+        """
+        self.base_url = base_url
+        self.metrics = metrics or MetricsRecorder()
+        self.timeout = timeout
+        self.cache = cache
+        self.limiter = TokenBucket(rate, burst)
+        self.max_retries = max_retries
+        self.backoff = backoff
+        self.max_backoff = max_backoff
+        self.timings = deque(maxlen=MAX_TIMINGS)
+        self.request_count = 0
+        self.count_lock = Lock()
+        self.page_workers = page_workers
+        self.session = self.create_session(pool_size, keep_alive, gzip)
+
+    def __enter__(self) -> "ErgastService":
+        """Enter the context manager."""
+        return self
+
+    def __exit__(self, *args: object) -> None:
+        """Exit the context manager, closing the session."""
+        self.close()
+
+    def create_session(
+        self, pool_size: int, keep_alive: bool, gzip: bool
+    ) -> requests.Session:
+        """
+        Create the pooled session used for every request.
+
+        Args:
+            pool_size (int): The maximum number of pooled connections.
+            keep_alive (bool): Keep connections open between requests.
+            gzip (bool): Ask for compressed responses.
+
+        Returns:
+            Session: The pooled session.
+        """
+        session = requests.Session()
+        adapter = HTTPAdapter(pool_connections=1, pool_maxsize=pool_size)
+        session.mount("https://", adapter)
+        session.mount("http://", adapter)
+
+        session.headers.update(HEADERS)
+        if not gzip:
+            session.headers["Accept-Encoding"] = "identity"
+        session.headers["Connection"] = "keep-alive" if keep_alive else "close"
+
+        return session
+
+    def close(self) -> None:
+        """Close the session and all pooled connections, flushing the cache index."""
+        self.session.close()
+        if self.cache is not None:
+            self.cache.flush()
+
+    def request(self, url: str, headers: dict | None = None) -> requests.Response:
+        """
+        Send a throttled request to the Ergast API, retrying on failure.
+
+        Connection errors, timeouts and 429 or 5xx responses are retried with
+        exponential backoff and full jitter. A Retry-After header on the response
+        takes precedence over the computed backoff.
+
+        The time until the response headers arrive, which includes resolving and
+        connecting on a new connection, is recorded as http.wait and the time to read
+        the body as http.transfer. The size of the body on the wire, before it is
+        decompressed, is counted as http.bytes.
+
+        Args:
+            url (str): The url to request.
+            headers (dict, optional): Extra headers to send. Defaults to None.
+
+        Returns:
+            Response: The last response received.
+
+        Raises:
+            RequestException: If the request still fails to connect after every retry.
+        """
+        start = time.perf_counter()
+        attempt = 0
+
+        while True:
+            self.metrics.record("http.throttle_wait", self.limiter.acquire())
+            self.metrics.count("http.requests")
+            sent = time.perf_counter()
+            try:
+                response = self.session.get(url, headers=headers, timeout=self.timeout)
+            except (requests.ConnectionError, requests.Timeout):
+                self.metrics.count("http.errors")
+                if attempt >= self.max_retries:
+                    raise
+                response = None
+
+            if response is not None:
+                total = time.perf_counter() - sent
+                waited = response.elapsed.total_seconds()
+                self.metrics.record("http.wait", waited)
+                self.metrics.record("http.transfer", max(0.0, total - waited))
+                self.metrics.count("http.bytes", wire_size(response))
+                if response.status_code == 429:
+                    self.metrics.count("http.throttled")
+
+            if response is not None and (
+                response.status_code not in RETRY_STATUS_CODES
+                or attempt >= self.max_retries
+            ):
+                break
+
+            with self.metrics.stage("http.backoff"):
+                time.sleep(self.retry_delay(attempt, response))
+            self.metrics.count("http.retries")
+            attempt += 1
+
+        with self.count_lock:
+            self.request_count += 1
+        self.timings.append(
+            {
+                "url": url,
+                "status": response.status_code,
+                "attempts": attempt + 1,
+                "seconds": time.perf_counter() - start,
+            }
+        )
+        return response
+
+    def retry_delay(self, attempt: int, response: requests.Response | None) -> float:
+        """
+        Get the number of seconds to wait before retrying a request.
+
+        A Retry-After header is honoured up to MAX_RETRY_AFTER seconds, dates without
+        a zone are taken as UTC and a header that cannot be parsed falls back to the
+        exponential backoff, so a bad header never aborts the load.
+
+        Args:
+            attempt (int): The number of the attempt that failed, starting at 0.
+            response (Response | None): The failed response, None if it failed to connect.
+
+        Returns:
+            float: The delay in seconds.
+        """
+        retry_after = (
+            response.headers.get("Retry-After") if response is not None else None
+        )
+        delay = retry_after_seconds(retry_after) if retry_after else None
+        if delay is not None:
+            return min(MAX_RETRY_AFTER, max(0.0, delay))
+
+        return random.uniform(0, min(self.max_backoff, self.backoff * 2**attempt))
+
+    def get_raw(self, url: str) -> tuple[bytes, bool]:
+        """
+        Get the raw body of a response from the Ergast API.
+
+        A fresh cached response is returned without a request, a stale one is
+        revalidated with a conditional request and reused if it has not changed.
+
+        Args:
+            url (str): The url to get data from.
+
+        Returns:
+            tuple[bytes, bool]: The body of the response and whether it came from the cache.
+
+        Raises:
+            HTTPError: If the response status code is not ok.
+        """
+        if self.cache is None:
+            response = self.request(url)
+            response.raise_for_status()
+            return response.content, False
+
+        with self.metrics.stage("cache.lookup"):
+            entry = self.cache.lookup(url)
+        if entry and self.cache.is_fresh(entry):
+            self.metrics.count("cache.hits")
+            return entry["body"], True
+
+        headers = self.cache.revalidation_headers(entry)
+        response = self.request(url, headers)
+        if entry and response.status_code == 304:
+            self.metrics.count("cache.revalidated")
+            self.cache.refresh(url)
+            return entry["body"], True
+
+        self.metrics.count("cache.misses")
+        response.raise_for_status()
+        self.cache.store(
+            url,
+            response.content,
+            response.headers.get("ETag"),
+            response.headers.get("Last-Modified"),
+        )
+        return response.content, False
 
     def get_data(self, url: str) -> dict | list[dict]:
         """
@@ -38,9 +350,100 @@ class ErgastService:
         Raises:
             HTTPError: If the response status code is not ok.
         """
-        response = requests.get(url, timeout=10)
-        response.raise_for_status()
-        return response.json()
+        body, _ = self.get_raw(url)
+        return loads(body)
+
+    def get_model(self, url: str, model: type[ResponseModel]) -> ResponseModel:
+        """
+        Get a response from the Ergast API as a model.
+
+        The raw body is decoded with orjson when it is installed and validated with
+        `model_validate`, which measured faster than `model_validate_json` on Ergast
+        payloads.
+
+        Args:
+            url (str): The url to get data from.
+            model (type[ResponseModel]): The response model.
+
+        Returns:
+            ResponseModel: The validated response.
+
+        Raises:
+            HTTPError: If the response status code is not ok.
+            ValidationError: If the response does not match the model.
+        """
+        body, _ = self.get_raw(url)
+        return self.validate(body, model)
+
+    def validate(self, body: bytes, model: type[ResponseModel]) -> ResponseModel:
+        """
+        Decode and validate a raw response.
+
+        Args:
+            body (bytes): The raw response.
+            model (type[ResponseModel]): The response model.
+
+        Returns:
+            ResponseModel: The validated response.
+
+        Raises:
+            ValidationError: If the response does not match the model.
+        """
+        with self.metrics.stage("decode"):
+            data = loads(body)
+        with self.metrics.stage("validate"):
+            return model.model_validate(data)
+
+    def iter_pages(
+        self, url: str, model: type[ResponseModel], page_size: int = MAX_PAGE_SIZE
+    ) -> Iterator[ResponseModel]:
+        """
+        Get every page of a paginated endpoint from the Ergast API.
+
+        The first page is fetched to read the total number of results, the remaining
+        pages are then fetched concurrently. Pages are yielded in order as soon as they
+        are available, so callers can process a page before the download finishes.
+        At most `page_workers` pages are fetched ahead of the caller, which keeps memory
+        bounded however many pages the endpoint has.
+
+        Args:
+            url (str): The url of the endpoint, without limit or offset.
+            model (type[ResponseModel]): The response model of every page.
+            page_size (int, optional): The number of results per page.
+                Defaults to MAX_PAGE_SIZE, the largest page the API allows.
+
+        Yields:
+            ResponseModel: Every page, validated.
+
+        Raises:
+            HTTPError: If the response status code is not ok.
+        """
+        page_size = min(page_size, MAX_PAGE_SIZE)
+        first_page = self.get_model(page_url(url, page_size, 0), model)
+        yield first_page
+
+        total = first_page.MRData.Total or 0
+        offsets = range(page_size, total, page_size)
+        if not offsets:
+            return
+
+        workers = min(self.page_workers, len(offsets))
+        with ThreadPoolExecutor(max_workers=workers) as executor:
+            pending = deque()
+            try:
+                for offset in offsets:
+                    if len(pending) == workers:
+                        yield pending.popleft().result()
+                    pending.append(
+                        executor.submit(
+                            self.get_model, page_url(url, page_size, offset), model
+                        )
+                    )
+                while pending:
+                    yield pending.popleft().result()
+            finally:
+                for future in pending:
+                    future.cancel()
 
     def get_schedules(self, year: int) -> list[Schedule]:
         """
@@ -56,6 +459,159 @@ class ErgastService:
             HTTPError: If the response status code is not ok.
         """
         url = f"{self.base_url}/{year}.json"
-        data = self.get_data(url)
-        response = ScheduleResponse(**data)
-        return response.MRData.RaceTable.Races
+        schedules = []
+        for page in self.iter_pages(url, ScheduleResponse):
+            schedules.extend(page.MRData.RaceTable.Races)
+        return schedules
+
+    def iter_results(self, year: int) -> Iterator[RaceResults]:
+        """
+        Get the race results of a season from the Ergast API.
+
+        A race whose results span two pages is yielded once for every page.
+
+        Args:
+            year (int): The year to get race results for.
+
+        Yields:
+            RaceResults: The races with their results, page by page.
+
+        Raises:
+            HTTPError: If the response status code is not ok.
+        """
+        url = f"{self.base_url}/{year}/results.json"
+        for page in self.iter_pages(url, ResultsResponse):
+            yield from page.MRData.RaceTable.Races
+
+    def iter_qualifying(self, year: int) -> Iterator[RaceQualifying]:
+        """
+        Get the qualifying results of a season from the Ergast API.
+
+        A race whose qualifying results span two pages is yielded once for every page.
+
+        Args:
+            year (int): The year to get qualifying results for.
+
+        Yields:
+            RaceQualifying: The races with their qualifying results, page by page.
+
+        Raises:
+            HTTPError: If the response status code is not ok.
+        """
+        url = f"{self.base_url}/{year}/qualifying.json"
+        for page in self.iter_pages(url, QualifyingResponse):
+            yield from page.MRData.RaceTable.Races
+
+    def iter_pit_stops(self, year: int) -> Iterator[RacePitStops]:
+        """
+        Get the pit stops of a season from the Ergast API.
+
+        Pit stops are only available per race, so the schedule is fetched first
+        and the pit stops of every round are then fetched in turn.
+
+        Args:
+            year (int): The year to get pit stops for.
+
+        Yields:
+            RacePitStops: The races with their pit stops, page by page.
+
+        Raises:
+            HTTPError: If the response status code is not ok.
+        """
+        for schedule in self.get_schedules(year):
+            yield from self.iter_round(year, int(schedule.Round), "pitstops")
+
+    def iter_lap_times(self, year: int) -> Iterator[RaceLaps]:
+        """
+        Get the lap times of a season from the Ergast API.
+
+        Lap times are only available per race, so the schedule is fetched first
+        and the lap times of every round are then fetched in turn.
+
+        Args:
+            year (int): The year to get lap times for.
+
+        Yields:
+            RaceLaps: The races with their laps, page by page.
+
+        Raises:
+            HTTPError: If the response status code is not ok.
+        """
+        for schedule in self.get_schedules(year):
+            yield from self.iter_round(year, int(schedule.Round), "laps")
+
+    def iter_round(self, year: int, round: int, endpoint: str) -> Iterator[BaseModel]:
+        """
+        Get the races of a single round of an endpoint from the Ergast API.
+
+        Args:
+            year (int): The year of the round.
+            round (int): The round.
+            endpoint (str): The endpoint, one of ROUND_ENDPOINTS.
+
+        Yields:
+            BaseModel: The race of the round, once for every page.
+
+        Raises:
+            HTTPError: If the response status code is not ok.
+        """
+        url = f"{self.base_url}/{year}/{round}/{endpoint}.json"
+        for page in self.iter_pages(url, ROUND_ENDPOINTS[endpoint]):
+            yield from page.MRData.RaceTable.Races
+
+
+def retry_after_seconds(retry_after: str) -> float | None:
+    """
+    Parse a Retry-After header into the number of seconds to wait.
+
+    Args:
+        retry_after (str): The header, a number of seconds or an HTTP date.
+
+    Returns:
+        float | None: The seconds to wait, None if the header cannot be parsed.
+    """
+    try:
+        return float(retry_after)
+    except ValueError:
+        pass
+
+    try:
+        retry_at = parsedate_to_datetime(retry_after)
+    except (TypeError, ValueError, IndexError):
+        return None
+    if retry_at.tzinfo is None:
+        retry_at = retry_at.replace(tzinfo=timezone.utc)
+    return (retry_at - datetime.now(timezone.utc)).total_seconds()
+
+
+def wire_size(response: requests.Response) -> int:
+    """
+    Get the size of a response body as it was sent, before it was decompressed.
+
+    Args:
+        response (Response): The response, with its body already read.
+
+    Returns:
+        int: The number of body bytes read from the connection, the size of the
+            decoded body if the connection does not report it.
+    """
+    try:
+        return int(response.raw.tell())
+    except (AttributeError, TypeError, ValueError):
+        return len(response.content)
+
+
+def page_url(url: str, limit: int, offset: int) -> str:
+    """
+    Add the limit and offset of a page to a url.
+
+    Args:
+        url (str): The url of the endpoint.
+        limit (int): The number of results per page.
+        offset (int): The offset of the first result of the page.
+
+    Returns:
+        str: The url of the page.
+    """
+    separator = "&" if "?" in url else "?"
+    return f"{url}{separator}{urlencode({'limit': limit, 'offset': offset})}"
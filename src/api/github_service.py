@@ -5,22 +5,38 @@ The GithubService class is responsible for all interactions with the Github API.
 """
 
 # System imports
+import glob
+import hashlib
+import json
+import os
+import sys
 from datetime import datetime
 
 # Third-party imports
 import requests
 from rich import print as rich_print
-from wget import download
+from rich.progress import (
+    BarColumn,
+    DownloadColumn,
+    Progress,
+    TimeRemainingColumn,
+    TransferSpeedColumn,
+)
 
 # Local imports
-from src.config.configuration import HOME_DIRECTORY, write_config
-from src.error.exceptions import GithubRequestError
+from src.config.configuration import CONFIG_DIRECTORY, HOME_DIRECTORY, write_config
+from src.error.exceptions import ChecksumError, GithubRequestError
 
 # Constants
 HEADERS = {
     "Accept": "application/vnd.github.v3+json",
     "X-GitHub-Api-Version": "2022-11-28",
 }
+ASSET_NAME = "Lyzer-ETL"
+CHECKSUM_NAME = f"{ASSET_NAME}.sha256"
+RELEASES_CACHE_FILE = os.path.join(CONFIG_DIRECTORY, "releases.json")
+RELEASES_PER_PAGE = 10
+CHUNK_SIZE = 64 * 1024
 
 
 class GithubService:
@@ -32,13 +48,17 @@ class GithubService:
         github_url (str): The URL for the Github API.
         last_checked (str): The date and time the application last checked for an update.
         current_release (str): The current release of the application.
+        session (requests.Session): The session every request is sent with.
 
     Methods:
         update_app: Check for a new release on Github, and if one is available, download it.
         should_update: Determine if the app should check for a new release.
-        get_release_data: Get all the releases data from Github.
+        get_release_data: Get the most recent releases data from Github.
         process_release_data: Process the release data from Github to find the latest release.
         download_release: Download the given release from Github.
+        download_asset: Download an asset, resuming an earlier partial download.
+        verify_checksum: Verify a download against the checksum published with it.
+        install_release: Move a verified download over the executable.
     """
 
     def __init__(self, config: dict, current_release: str) -> None:
@@ -53,6 +73,7 @@ class GithubService:
         self.github_url = "https://api.github.com/repos/Evanlab02/Lyzer-ETL/releases"
         self.last_checked = config.get("lastChecked", "")
         self.current_release = current_release
+        self.session = requests.Session()
 
     def update_app(self, force: bool = False) -> None:
         """
@@ -101,7 +122,11 @@ class GithubService:
 
     def get_release_data(self) -> list[dict]:
         """
-        Get the latest release from Github.
+        Get the most recent releases from Github.
+
+        The releases are cached with their ETag and the request is made conditional on
+        it, so when nothing was released Github answers 304 Not Modified with no body,
+        which does not count against the rate limit.
 
         Returns:
             list[dict]: The JSON data from Github.
@@ -110,12 +135,37 @@ class GithubService:
             GithubRequestError: If the request to Github fails.
         """
         rich_print("Checking for updates...")
-        response = requests.get(self.github_url, headers=HEADERS, timeout=30)
-        if response.status_code == 200:
-            return response.json()
-        elif response.status_code != 200:
+        cached = {}
+        if os.path.exists(RELEASES_CACHE_FILE):
+            with open(RELEASES_CACHE_FILE, "r", encoding="UTF-8") as cache_file:
+                cached = json.load(cache_file)
+
+        headers = dict(HEADERS)
+        if cached.get("etag"):
+            headers["If-None-Match"] = cached["etag"]
+
+        response = self.session.get(
+            self.github_url,
+            headers=headers,
+            params={"per_page": RELEASES_PER_PAGE},
+            timeout=30,
+        )
+        if response.status_code == 304:
+            return cached["releases"]
+        if response.status_code != 200:
             raise GithubRequestError(response.status_code)
 
+        releases = response.json()
+        if response.headers.get("ETag"):
+            os.makedirs(CONFIG_DIRECTORY, exist_ok=True)
+            temporary_path = f"{RELEASES_CACHE_FILE}.tmp"
+            with open(temporary_path, "w", encoding="UTF-8") as cache_file:
+                json.dump(
+                    {"etag": response.headers["ETag"], "releases": releases}, cache_file
+                )
+            os.replace(temporary_path, RELEASES_CACHE_FILE)
+        return releases
+
     def process_release_data(self, release_data: list[dict]) -> dict | None:
         """
         Process the release data from Github.
@@ -162,8 +212,11 @@ class GithubService:
         """
         Download the latest release from Github.
 
-        This will download the latest release from Github and save it to the
-        user's home directory.
+        The executable is streamed next to where it will be installed, resuming an
+        interrupted download, verified against its published checksum and then moved
+        into place in a single step. The partial download is named after the release
+        tag, so only a download of the same release is ever resumed, and partial
+        downloads of other releases are deleted.
 
         Args:
             release (dict): The latest release data from Github.
@@ -175,22 +228,128 @@ class GithubService:
         )
 
         if confirm_update.casefold() == "y":
-            assets = release.get("assets", [])
-            asset_data = [
-                {
-                    "name": asset.get("name", ""),
-                    "url": asset.get("browser_download_url", ""),
-                }
-                for asset in assets
-            ]
-
-            download_asset_directory = f"{HOME_DIRECTORY}/Lyzer-ETL"
-
-            for asset in asset_data:
-                if asset["name"] == "Lyzer-ETL":
-                    download(asset["url"], out=download_asset_directory)
-                    break
-
-            rich_print(f"\nFind updated file at '{download_asset_directory}'.")
-            rich_print("Please overwrite your existing executable.")
+            assets = {
+                asset.get("name", ""): asset.get("browser_download_url", "")
+                for asset in release.get("assets", [])
+            }
+            if ASSET_NAME not in assets:
+                rich_print("[red]The release has no executable to download.[/red]")
+                return
+
+            # A frozen executable replaces itself, otherwise it goes in the home folder
+            if getattr(sys, "frozen", False):
+                target = sys.executable
+            else:
+                target = os.path.join(HOME_DIRECTORY, ASSET_NAME)
+            tag = release.get("tag_name", "").replace("/", "_")
+            partial_path = f"{target}.{tag}.part"
+            for stale_path in glob.glob(f"{glob.escape(target)}.*part"):
+                if stale_path != partial_path:
+                    os.remove(stale_path)
+
+            self.download_asset(assets[ASSET_NAME], partial_path)
+            self.verify_checksum(partial_path, assets.get(CHECKSUM_NAME))
+            self.install_release(partial_path, target)
+
+            if getattr(sys, "frozen", False):
+                rich_print(f"\nUpdated '{target}', restart to use the new release.")
+            else:
+                rich_print(f"\nFind updated file at '{target}'.")
+                rich_print("Please overwrite your existing executable.")
             rich_print("[green]Update Complete.[/green]")
+
+    def download_asset(self, url: str, path: str) -> None:
+        """
+        Download an asset, resuming an earlier partial download.
+
+        The asset is streamed to disk in chunks. When a partial download is already on
+        disk, only the remaining bytes are requested with a Range header, a server that
+        ignores it sends the whole asset again, which replaces the partial download.
+
+        Args:
+            url (str): The download URL of the asset.
+            path (str): The path of the partial download.
+
+        Raises:
+            GithubRequestError: If the download fails.
+        """
+        downloaded = os.path.getsize(path) if os.path.exists(path) else 0
+        headers = {"Accept": "application/octet-stream"}
+        if downloaded:
+            headers["Range"] = f"bytes={downloaded}-"
+
+        with self.session.get(
+            url, headers=headers, stream=True, timeout=30
+        ) as response:
+            if response.status_code == 416:
+                # The partial download is already complete
+                return
+            if response.status_code not in (200, 206):
+                raise GithubRequestError(response.status_code)
+
+            if response.status_code == 200:
+                downloaded = 0
+            total = int(response.headers.get("Content-Length", 0)) + downloaded
+
+            progress = Progress(
+                "[progress.description]{task.description}",
+                BarColumn(),
+                DownloadColumn(),
+                TransferSpeedColumn(),
+                TimeRemainingColumn(),
+            )
+            with progress, open(path, "ab" if downloaded else "wb") as asset_file:
+                task = progress.add_task(
+                    "Downloading", total=total or None, completed=downloaded
+                )
+                for chunk in response.iter_content(CHUNK_SIZE):
+                    asset_file.write(chunk)
+                    progress.advance(task, len(chunk))
+
+    def verify_checksum(self, path: str, checksum_url: str | None) -> None:
+        """
+        Verify a download against the checksum published with it.
+
+        Releases publish the SHA-256 of the executable as a sha256sum file, older
+        releases without one are not verified.
+
+        Args:
+            path (str): The path of the download.
+            checksum_url (str | None): The download URL of the checksum file, if any.
+
+        Raises:
+            GithubRequestError: If the checksum file cannot be downloaded.
+            ChecksumError: If the download does not match the checksum, the download
+                is deleted so the next update starts over.
+        """
+        if not checksum_url:
+            rich_print("[yellow]No checksum was published, skipping verification.")
+            return
+
+        response = self.session.get(checksum_url, timeout=30)
+        if response.status_code != 200:
+            raise GithubRequestError(response.status_code)
+        expected = response.text.split()[0].lower()
+
+        digest = hashlib.sha256()
+        with open(path, "rb") as asset_file:
+            while chunk := asset_file.read(CHUNK_SIZE):
+                digest.update(chunk)
+
+        if digest.hexdigest() != expected:
+            os.remove(path)
+            raise ChecksumError(expected, digest.hexdigest())
+
+    def install_release(self, path: str, target: str) -> None:
+        """
+        Move a verified download over the executable.
+
+        The download is made executable and renamed over the target, which is atomic,
+        so the executable is never missing or half written, even while it is running.
+
+        Args:
+            path (str): The path of the verified download.
+            target (str): The path of the executable.
+        """
+        os.chmod(path, 0o755)
+        os.replace(path, target)
@@ -0,0 +1,71 @@
+"""
+This module contains the TokenBucket class.
+
+The TokenBucket class is responsible for keeping requests to an API within its rate limits.
+"""
+
+# Standard Library Imports
+import time
+from threading import Lock
+
+
+class TokenBucket:
+    """
+    A thread-safe token bucket rate limiter.
+
+    The bucket holds up to `burst` tokens and is refilled at `rate` tokens per second.
+    Every request takes a token, waiting for the bucket to refill when it is empty,
+    so short bursts go out at once while the sustained rate never exceeds `rate`.
+
+    Attributes:
+        rate (float): The number of tokens added per second.
+        burst (int): The maximum number of tokens in the bucket.
+        tokens (float): The number of tokens currently in the bucket.
+
+    Methods:
+        acquire: Take a token from the bucket, waiting until one is available.
+    """
+
+    def __init__(self, rate: float, burst: int) -> None:
+        """
+        Construct the TokenBucket class.
+
+        Args:
+            rate (float): The number of tokens added per second.
+            burst (int): The maximum number of tokens in the bucket.
+
+        Raises:
+            ValueError: If the rate or burst is not positive.
+        """
+        if rate <= 0 or burst <= 0:
+            raise ValueError("Rate and burst must be positive.")
+
+        self.rate = rate
+        self.burst = burst
+        self.tokens = float(burst)
+        self.updated_at = time.monotonic()
+        self.lock = Lock()
+
+    def acquire(self) -> float:
+        """
+        Take a token from the bucket, waiting until one is available.
+
+        Returns:
+            float: The number of seconds spent waiting for the token.
+        """
+        waited = 0.0
+        while True:
+            with self.lock:
+                now = time.monotonic()
+                elapsed = now - self.updated_at
+                self.tokens = min(self.burst, self.tokens + elapsed * self.rate)
+                self.updated_at = now
+
+                if self.tokens >= 1:
+                    self.tokens -= 1
+                    return waited
+
+                wait = (1 - self.tokens) / self.rate
+
+            time.sleep(wait)
+            waited += wait
@@ -0,0 +1,6 @@
+"""
+Folder for caching related files.
+
+Modules:
+    response_cache: The on-disk cache for responses from the Ergast API.
+"""
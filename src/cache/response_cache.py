@@ -0,0 +1,335 @@
+"""
+This module contains the ResponseCache class.
+
+The ResponseCache class is responsible for storing responses from the Ergast API on disk,
+so that data that has not changed does not have to be downloaded again.
+"""
+
+# Standard Library Imports
+import hashlib
+import json
+import os
+import re
+import shutil
+import time
+from datetime import datetime
+from threading import Lock
+
+# Local Imports
+from src.config.configuration import CONFIG_DIRECTORY
+
+# Constants
+CACHE_DIRECTORY = os.path.join(CONFIG_DIRECTORY, "cache")
+INDEX_FILE = "index.json"
+SEASON_PATTERN = re.compile(r"/api/f1/(\d{4})(?:/|\.json)")
+FLUSH_INTERVAL = 30.0
+
+
+class ResponseCache:
+    """
+    This class is responsible for storing responses from the Ergast API on disk.
+
+    Every url gets a time to live based on the season it belongs to. Past seasons never
+    change so they never expire, anything else expires after a short time and is then
+    revalidated with the ETag and Last-Modified headers it was stored with.
+    When the cache grows past its maximum size the least recently used entries are evicted.
+
+    Hits, stores and revalidations only change the index in memory, it is written at
+    most once per FLUSH_INTERVAL and when the cache is flushed, so a load does not
+    rewrite the index on every request. The total size of the cache is kept as entries
+    come and go, so eviction only sorts the index when the cache is actually full.
+    Bodies are written next to their final path and moved into place, so a crash never
+    leaves a truncated body behind.
+
+    Attributes:
+        directory (str): The directory the cache is stored in.
+        max_size (int): The maximum size of the cache in bytes.
+        current_season_ttl (int): The time to live in seconds for current or unknown seasons.
+        index (dict): The metadata of every cached response, keyed by cache key.
+        dirty (bool): Whether the index has changes that are not on disk yet.
+        flushed_at (float): The monotonic time the index was last written at.
+        total_size (int): The size in bytes of every cached response.
+
+    Methods:
+        read_index: Read the cache index from disk.
+        write_index: Write the cache index to disk.
+        flush: Write the cache index to disk if it has unwritten changes.
+        flush_if_due: Write unwritten index changes once FLUSH_INTERVAL has passed.
+        ttl_for: Get the time to live for the given url.
+        lookup: Look up the cached response for the given url.
+        is_fresh: Determine if a cached response can be used without revalidation.
+        revalidation_headers: Get the conditional request headers for a cached response.
+        store: Store a response in the cache.
+        refresh: Mark a cached response as revalidated.
+        evict: Remove the least recently used responses until the cache fits.
+        clear: Remove every cached response.
+    """
+
+    def __init__(
+        self,
+        directory: str = CACHE_DIRECTORY,
+        max_size: int = 256 * 1024 * 1024,
+        current_season_ttl: int = 60 * 60,
+    ) -> None:
+        """
+        Construct the ResponseCache class.
+
+        Args:
+            directory (str, optional): The directory the cache is stored in.
+                Defaults to CACHE_DIRECTORY.
+            max_size (int, optional): The maximum size of the cache in bytes.
+                Defaults to 256 MiB.
+            current_season_ttl (int, optional): The time to live in seconds for current
+                or unknown seasons. Defaults to one hour.
+        """
+        self.directory = directory
+        self.max_size = max_size
+        self.current_season_ttl = current_season_ttl
+        self.lock = Lock()
+        self.index = self.read_index()
+        self.dirty = False
+        self.flushed_at = time.monotonic()
+        self.total_size = sum(entry["size"] for entry in self.index.values())
+
+    def read_index(self) -> dict:
+        """
+        Read the cache index from disk.
+
+        Returns:
+            dict: The cache index, empty if there is no index yet or it is unreadable.
+        """
+        try:
+            with open(self.index_path, "r", encoding="UTF-8") as index_file:
+                return json.load(index_file)
+        except (FileNotFoundError, json.JSONDecodeError):
+            return {}
+
+    def write_index(self) -> None:
+        """Write the cache index to disk, replacing the old index atomically."""
+        os.makedirs(self.directory, exist_ok=True)
+        temporary_path = f"{self.index_path}.tmp"
+        with open(temporary_path, "w", encoding="UTF-8") as index_file:
+            json.dump(self.index, index_file)
+        os.replace(temporary_path, self.index_path)
+        self.dirty = False
+        self.flushed_at = time.monotonic()
+
+    def flush(self) -> None:
+        """Write the cache index to disk if it has unwritten changes."""
+        with self.lock:
+            if self.dirty:
+                self.write_index()
+
+    def flush_if_due(self) -> None:
+        """
+        Write unwritten index changes once FLUSH_INTERVAL has passed since the last write.
+
+        This must run while holding the lock.
+        """
+        if self.dirty and time.monotonic() - self.flushed_at >= FLUSH_INTERVAL:
+            self.write_index()
+
+    @property
+    def index_path(self) -> str:
+        """Get the path of the cache index."""
+        return os.path.join(self.directory, INDEX_FILE)
+
+    def body_path(self, key: str) -> str:
+        """
+        Get the path of a cached response body.
+
+        Args:
+            key (str): The cache key of the response.
+
+        Returns:
+            str: The path of the response body.
+        """
+        return os.path.join(self.directory, f"{key}.json")
+
+    @staticmethod
+    def key_for(url: str) -> str:
+        """
+        Get the cache key for the given url.
+
+        Args:
+            url (str): The url of the response.
+
+        Returns:
+            str: The cache key.
+        """
+        return hashlib.sha256(url.encode("UTF-8")).hexdigest()
+
+    def ttl_for(self, url: str) -> int | None:
+        """
+        Get the time to live for the given url.
+
+        Args:
+            url (str): The url of the response.
+
+        Returns:
+            int | None: The time to live in seconds, None if the response never expires.
+        """
+        match = SEASON_PATTERN.search(url)
+        if match and int(match.group(1)) < datetime.now().year:
+            return None
+        return self.current_season_ttl
+
+    def lookup(self, url: str) -> dict | None:
+        """
+        Look up the cached response for the given url.
+
+        Args:
+            url (str): The url of the response.
+
+        Returns:
+            dict | None: The metadata of the cached response with its body under "body",
+                None if the url is not cached.
+        """
+        key = self.key_for(url)
+        with self.lock:
+            entry = self.index.get(key)
+            if entry is None:
+                return None
+
+            try:
+                with open(self.body_path(key), "rb") as body_file:
+                    body = body_file.read()
+            except FileNotFoundError:
+                self.total_size -= self.index.pop(key)["size"]
+                self.dirty = True
+                return None
+
+            entry["lastAccessed"] = datetime.now().timestamp()
+            self.dirty = True
+            self.flush_if_due()
+            return {**entry, "body": body}
+
+    def is_fresh(self, entry: dict) -> bool:
+        """
+        Determine if a cached response can be used without revalidation.
+
+        Args:
+            entry (dict): The cached response.
+
+        Returns:
+            bool: True if the cached response has not expired.
+        """
+        expires_at = entry.get("expiresAt")
+        return expires_at is None or datetime.now().timestamp() < expires_at
+
+    def revalidation_headers(self, entry: dict | None) -> dict:
+        """
+        Get the conditional request headers for a cached response.
+
+        Args:
+            entry (dict | None): The cached response, if any.
+
+        Returns:
+            dict: The If-None-Match and If-Modified-Since headers that apply.
+        """
+        headers = {}
+        if entry is None:
+            return headers
+
+        if entry.get("etag"):
+            headers["If-None-Match"] = entry["etag"]
+        if entry.get("lastModified"):
+            headers["If-Modified-Since"] = entry["lastModified"]
+        return headers
+
+    def store(
+        self,
+        url: str,
+        body: bytes,
+        etag: str | None = None,
+        last_modified: str | None = None,
+    ) -> None:
+        """
+        Store a response in the cache, evicting old responses if the cache is full.
+
+        Args:
+            url (str): The url of the response.
+            body (bytes): The body of the response.
+            etag (str, optional): The ETag header of the response. Defaults to None.
+            last_modified (str, optional): The Last-Modified header of the response.
+                Defaults to None.
+        """
+        key = self.key_for(url)
+        now = datetime.now().timestamp()
+        ttl = self.ttl_for(url)
+
+        with self.lock:
+            os.makedirs(self.directory, exist_ok=True)
+            body_path = self.body_path(key)
+            temporary_path = f"{body_path}.tmp"
+            with open(temporary_path, "wb") as body_file:
+                body_file.write(body)
+            os.replace(temporary_path, body_path)
+
+            if key in self.index:
+                self.total_size -= self.index[key]["size"]
+            self.total_size += len(body)
+            self.index[key] = {
+                "url": url,
+                "etag": etag,
+                "lastModified": last_modified,
+                "storedAt": now,
+                "expiresAt": None if ttl is None else now + ttl,
+                "lastAccessed": now,
+                "size": len(body),
+            }
+            if self.total_size > self.max_size:
+                self.evict()
+            self.dirty = True
+            self.flush_if_due()
+
+    def refresh(self, url: str) -> None:
+        """
+        Mark a cached response as revalidated, restarting its time to live.
+
+        Args:
+            url (str): The url of the response.
+        """
+        key = self.key_for(url)
+        now = datetime.now().timestamp()
+        ttl = self.ttl_for(url)
+
+        with self.lock:
+            entry = self.index.get(key)
+            if entry is None:
+                return
+
+            entry["expiresAt"] = None if ttl is None else now + ttl
+            entry["lastAccessed"] = now
+            self.dirty = True
+            self.flush_if_due()
+
+    def evict(self) -> None:
+        """
+        Remove the least recently used responses until the cache fits its maximum size.
+
+        This must run while holding the lock.
+        """
+        by_last_access = sorted(
+            self.index.items(), key=lambda item: item[1]["lastAccessed"]
+        )
+
+        for key, entry in by_last_access:
+            if self.total_size <= self.max_size:
+                break
+
+            del self.index[key]
+            self.total_size -= entry["size"]
+            self.dirty = True
+            try:
+                os.remove(self.body_path(key))
+            except FileNotFoundError:
+                pass
+
+    def clear(self) -> None:
+        """Remove every cached response."""
+        with self.lock:
+            shutil.rmtree(self.directory, ignore_errors=True)
+            self.index = {}
+            self.dirty = False
+            self.total_size = 0
@@ -6,4 +6,10 @@ We use Typer to create the CLI and this is where manage all our commands etc.
 Modules:
     typer_cli: The main CLI module.
     load_cli: The load command module.
+    cache_cli: The cache command module.
+    sync_cli: The sync command module.
+    export_cli: The export command module.
+    import_cli: The import-dump command module.
+    serve_cli: The serve command module.
+    api_cli: The api command module.
 """
@@ -0,0 +1,60 @@
+"""
+This module contains the api command line interface.
+
+The api command is responsible for serving the loaded schedules over a local HTTP read
+API, so other services stop querying the database for them.
+"""
+
+from typing_extensions import Annotated
+
+from typer import Option
+
+from src.cli.load_cli import console
+
+HostOption = Annotated[str, Option("--host", help="The host to listen on.")]
+ApiPortOption = Annotated[
+    int, Option("--port", min=0, max=65535, help="The port to listen on.")
+]
+MaxAgeOption = Annotated[
+    int,
+    Option(
+        "--max-age",
+        min=1,
+        help="Seconds before the schedules are read from the database again.",
+    ),
+]
+
+
+def api(
+    host: HostOption = "127.0.0.1",
+    port: ApiPortOption = 8000,
+    max_age: MaxAgeOption = 300,
+):
+    """
+    Serve the loaded schedules over a local HTTP read API until stopped.
+
+    The schedules of every loaded season are read from the database once and indexed
+    in memory, then read again after max-age seconds to pick up new loads. Calendars
+    are served from /schedules/<season>, the next and previous session from
+    /sessions/next and /sessions/previous, and every response has an ETag.
+
+    Args:
+        host (str): The host to listen on.
+        port (int): The port to listen on.
+        max_age (int): The seconds before the schedules are read again.
+    """
+    from src.config.configuration import setup_app
+    from src.database.mongo_service import MongoService
+    from src.server.schedule_api import ScheduleApi, ScheduleCache, load_schedules
+
+    setup_app()
+    mongo_service = MongoService()
+    cache = ScheduleCache(lambda: load_schedules(mongo_service), max_age)
+    schedule_api = ScheduleApi(cache, host, port)
+
+    console.print(f"Serving schedules on [bold]http://{host}:{port}[/bold]")
+    try:
+        schedule_api.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    console.print("[bold]Stopped.")
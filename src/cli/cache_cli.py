@@ -0,0 +1,23 @@
+"""
+This module contains the cache_app command line interface.
+
+The cache_app command line interface is responsible for managing the response cache.
+"""
+
+from rich import print as rich_print
+from typer import Typer
+
+from src.cache.response_cache import ResponseCache
+
+cache_app = Typer(pretty_exceptions_show_locals=False)
+
+
+@cache_app.command()
+def clear():
+    """
+    Clear the response cache.
+
+    This will remove every cached response, so the next load downloads everything again.
+    """
+    ResponseCache().clear()
+    rich_print("[green]Cache cleared.[/green]")
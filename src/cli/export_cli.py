@@ -0,0 +1,196 @@
+"""
+This module contains the export command line interface.
+
+The export command is responsible for writing loaded datasets to Parquet files, so they
+can be read into dataframes without querying MongoDB document by document.
+"""
+
+from collections.abc import Iterable
+from enum import Enum
+from typing import TYPE_CHECKING, Optional
+from typing_extensions import Annotated
+
+from typer import Option, prompt
+
+from src.cli.load_cli import (
+    ROUND_DATASETS,
+    Dataset,
+    FromOption,
+    NoCacheOption,
+    ToOption,
+    YearOption,
+    YearsOption,
+    console,
+    handle_error,
+)
+
+if TYPE_CHECKING:
+    from src.api.ergast_service import ErgastService
+    from src.database.mongo_service import MongoService
+
+# Constants
+ERGAST_FETCHES = {
+    Dataset.RESULTS: "iter_results",
+    Dataset.QUALIFYING: "iter_qualifying",
+    Dataset.PIT_STOPS: "iter_pit_stops",
+    Dataset.LAP_TIMES: "iter_lap_times",
+}
+
+
+class ExportSource(str, Enum):
+    """
+    The places datasets can be exported from.
+
+    Attributes:
+        MONGO: The database, as loaded by the load commands.
+        ERGAST: Ergast, through the response cache.
+    """
+
+    MONGO = "mongo"
+    ERGAST = "ergast"
+
+
+def export(
+    year: YearOption = None,
+    from_year: FromOption = None,
+    to_year: ToOption = None,
+    years: YearsOption = None,
+    datasets: Annotated[
+        Optional[list[Dataset]],
+        Option(
+            "--dataset", help="A dataset to export, can be repeated. Defaults to all."
+        ),
+    ] = None,
+    source: Annotated[
+        ExportSource, Option(help="Export from the database, or straight from ergast.")
+    ] = ExportSource.MONGO,
+    output: Annotated[
+        str, Option(help="The directory to write the Parquet files to.")
+    ] = "export",
+    chunk_size: Annotated[
+        int, Option(min=1, help="The number of rows written at once.")
+    ] = 10000,
+    no_cache: NoCacheOption = False,
+):
+    """
+    Export datasets to Parquet files, partitioned by season.
+
+    Every season of a dataset is written to <output>/<Dataset>/Season=<season>, so
+    readers filtering on the season, such as pyarrow.dataset or pandas.read_parquet
+    with filters, only read the seasons they ask for. Rows are streamed from the
+    source and written a chunk at a time. Exporting needs pyarrow to be installed.
+
+    Args:
+        year (int, optional): A single year to export.
+        from_year (int, optional): The first year of a range to export.
+        to_year (int, optional): The last year of a range to export.
+        years (list[int], optional): A list of years to export.
+        datasets (list[Dataset], optional): The datasets to export.
+        source (ExportSource): Export from the database or from ergast.
+        output (str): The directory to write the Parquet files to.
+        chunk_size (int): The number of rows written at once.
+        no_cache (bool): Bypass the response cache, when exporting from ergast.
+    """
+    from src.api.ergast_service import ErgastService
+    from src.cache.response_cache import ResponseCache
+    from src.config.configuration import setup_app
+    from src.database.mongo_service import MongoService
+    from src.export.parquet_exporter import ParquetExporter
+    from src.helpers.utilities import resolve_years
+
+    if year is None and from_year is None and to_year is None and not years:
+        year = prompt("Year", type=int)
+
+    if source == ExportSource.MONGO:
+        setup_app()
+    status = console.status("[bold green]Exporting...")
+    status.start()
+    try:
+        seasons = resolve_years(year, from_year, to_year, years)
+        exporter = ParquetExporter(output, chunk_size)
+        mongo_service = MongoService()
+        cache = None if no_cache else ResponseCache()
+        with ErgastService(cache=cache) as ergast_service:
+            for dataset in datasets or list(Dataset):
+                name = dataset_name(dataset)
+                for season in seasons:
+                    status.update(f"[bold green]Exporting {name} for {season}...")
+                    if source == ExportSource.MONGO:
+                        documents = mongo_documents(
+                            mongo_service, dataset, season, chunk_size
+                        )
+                    else:
+                        documents = ergast_documents(ergast_service, dataset, season)
+                    rows = exporter.export_season(name, season, documents)
+                    console.print(f"[bold]{name} {season}:[/bold] {rows} rows exported")
+        status.stop()
+        console.print(f"Exported to {output}")
+    except Exception as error:
+        handle_error(error, status)
+
+
+def dataset_name(dataset: Dataset) -> str:
+    """
+    Get the name a dataset is stored and exported under.
+
+    Args:
+        dataset (Dataset): The dataset.
+
+    Returns:
+        str: The name of the dataset's database, for example "Results".
+    """
+    if dataset == Dataset.SCHEDULE:
+        return "Schedules"
+    return ROUND_DATASETS[dataset][0]
+
+
+def mongo_documents(
+    mongo_service: "MongoService", dataset: Dataset, season: int, batch_size: int
+) -> Iterable[dict]:
+    """
+    Stream the documents of a season of a dataset from the database.
+
+    Schedules are stored as ergast returns them and are converted to the typed layout.
+
+    Args:
+        mongo_service (MongoService): The service to read with.
+        dataset (Dataset): The dataset.
+        season (int): The season.
+        batch_size (int): The number of documents per round trip.
+
+    Returns:
+        Iterable[dict]: The documents of the season.
+    """
+    from src.models.schedules import Schedule
+
+    documents = mongo_service.iter_season(dataset_name(dataset), season, batch_size)
+    if dataset == Dataset.SCHEDULE:
+        return (
+            Schedule.model_validate(document).typed_document(season)
+            for document in documents
+        )
+    return documents
+
+
+def ergast_documents(
+    ergast_service: "ErgastService", dataset: Dataset, season: int
+) -> Iterable[dict]:
+    """
+    Stream the documents of a season of a dataset from ergast.
+
+    Args:
+        ergast_service (ErgastService): The service to fetch with.
+        dataset (Dataset): The dataset.
+        season (int): The season.
+
+    Returns:
+        Iterable[dict]: The documents of the season, as they would be loaded.
+    """
+    if dataset == Dataset.SCHEDULE:
+        return (
+            schedule.typed_document(season)
+            for schedule in ergast_service.get_schedules(season)
+        )
+
+    races = getattr(ergast_service, ERGAST_FETCHES[dataset])(season)
+    return (document for race in races for document in race.documents())
@@ -0,0 +1,169 @@
+"""
+This module contains the import-dump command line interface.
+
+The import-dump command is responsible for backfilling the database from a local Ergast
+CSV dump archive, without sending a single request to ergast.
+"""
+
+from concurrent.futures import Future, ThreadPoolExecutor
+from typing import TYPE_CHECKING, Optional
+from typing_extensions import Annotated
+
+from rich.status import Status
+from typer import Argument, Option
+
+from src.cli.load_cli import (
+    ROUND_DATASETS,
+    Dataset,
+    FromOption,
+    MetricsFileOption,
+    MetricsOption,
+    SinkOption,
+    SinkPathOption,
+    SinkType,
+    ToOption,
+    YearOption,
+    YearsOption,
+    console,
+    create_sink,
+    handle_error,
+    report_metrics,
+    setup_sink,
+)
+
+if TYPE_CHECKING:
+    from src.dump.ergast_dump import ErgastDump
+    from src.sinks.sink import Sink
+
+
+def import_dump(
+    path: Annotated[str, Argument(help="The path of the Ergast CSV dump archive.")],
+    year: YearOption = None,
+    from_year: FromOption = None,
+    to_year: ToOption = None,
+    years: YearsOption = None,
+    datasets: Annotated[
+        Optional[list[Dataset]],
+        Option(
+            "--dataset", help="A dataset to import, can be repeated. Defaults to all."
+        ),
+    ] = None,
+    metrics: MetricsOption = False,
+    metrics_file: MetricsFileOption = None,
+    sink_type: SinkOption = SinkType.MONGO,
+    sink_path: SinkPathOption = None,
+):
+    """
+    Load a local Ergast CSV dump archive into the database.
+
+    The archive is read without being extracted and every table is streamed a race at
+    a time into the same models the API responses are validated into, so the documents
+    are the ones the load commands write. Schedules are upserted, every round of the
+    other datasets is replaced while the next one is read. Every season in the archive
+    is imported unless seasons are given.
+
+    Args:
+        path (str): The path of the Ergast CSV dump archive.
+        year (int, optional): A single year to import.
+        from_year (int, optional): The first year of a range to import.
+        to_year (int, optional): The last year of a range to import.
+        years (list[int], optional): A list of years to import.
+        datasets (list[Dataset], optional): The datasets to import.
+        metrics (bool): Print how long every stage of the import took.
+        metrics_file (str, optional): The file to write the metrics to.
+        sink_type (SinkType): Where to write the data.
+        sink_path (str, optional): The path of the jsonl or sqlite sink.
+    """
+    from src.dump.ergast_dump import ErgastDump
+    from src.helpers.utilities import resolve_years
+    from src.metrics.recorder import MetricsRecorder
+
+    setup_sink(sink_type)
+    status = console.status("[bold green]Importing...")
+    status.start()
+    try:
+        seasons = None
+        if year is not None or from_year is not None or to_year is not None or years:
+            seasons = set(resolve_years(year, from_year, to_year, years))
+
+        recorder = MetricsRecorder()
+        with recorder.stage("total"), create_sink(
+            sink_type, sink_path, recorder
+        ) as sink, ErgastDump(path) as dump:
+            for dataset in datasets or list(Dataset):
+                status.update(f"[bold green]Importing {dataset.value}...")
+                if dataset == Dataset.SCHEDULE:
+                    count = import_schedules(dump, sink, seasons)
+                else:
+                    count = import_rounds(dump, sink, dataset, seasons, status)
+                console.print(
+                    f"[bold]{dataset.value}:[/bold] {count} documents imported"
+                )
+        status.stop()
+        report_metrics(recorder, metrics, metrics_file)
+    except Exception as error:
+        handle_error(error, status)
+
+
+def import_schedules(dump: "ErgastDump", sink: "Sink", seasons: set[int] | None) -> int:
+    """
+    Upsert the schedules of every season in a dump.
+
+    Args:
+        dump (ErgastDump): The dump to read.
+        sink (Sink): The sink to write to.
+        seasons (set[int] | None): The seasons to import, None for all of them.
+
+    Returns:
+        int: The number of schedules imported.
+    """
+    count = 0
+    for season, schedules in sorted(dump.schedules().items()):
+        if seasons is None or season in seasons:
+            sink.upsert_schedules(season, schedules)
+            count += len(schedules)
+    return count
+
+
+def import_rounds(
+    dump: "ErgastDump",
+    sink: "Sink",
+    dataset: Dataset,
+    seasons: set[int] | None,
+    status: Status,
+) -> int:
+    """
+    Replace every round of a dataset in a dump.
+
+    A single writer replaces a round while the next one is read from the archive, so
+    reading and writing overlap without holding more than two rounds in memory. The
+    sink is flushed before the count is returned, so every round counted is written.
+
+    Args:
+        dump (ErgastDump): The dump to read.
+        sink (Sink): The sink to write to.
+        dataset (Dataset): The dataset to import, one of ROUND_DATASETS.
+        seasons (set[int] | None): The seasons to import, None for all of them.
+        status (Status): The status to report progress on.
+
+    Returns:
+        int: The number of documents imported.
+    """
+    database, endpoint = ROUND_DATASETS[dataset]
+    count = 0
+    write: Future | None = None
+
+    with ThreadPoolExecutor(max_workers=1) as writer:
+        for season, round, race in dump.iter_rounds(endpoint, seasons):
+            documents = race.documents()
+            if write is not None:
+                count += write.result()
+            write = writer.submit(
+                sink.replace_round, database, season, round, documents
+            )
+            status.update(f"[bold green]Importing {dataset.value} {season}/{round}...")
+        if write is not None:
+            count += write.result()
+
+    sink.flush()
+    return count
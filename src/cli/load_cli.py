@@ -5,75 +5,825 @@ The load_app command line interface is responsible for loading data into the dat
 """
 
 
-from threading import Thread
+from collections.abc import Callable
+from concurrent.futures import Future, ThreadPoolExecutor, as_completed
+from enum import Enum
+from functools import partial
+from typing import TYPE_CHECKING, Optional
 from typing_extensions import Annotated
 
-from requests import HTTPError
 from rich.console import Console
-from typer import Typer, Option
+from rich.status import Status
+from typer import Typer, Option, prompt
 
-from src.api.ergast_service import ErgastService
-from src.database.mongo_service import MongoService
-from src.helpers.utilities import validate_year, generate_schedules_table
+if TYPE_CHECKING:
+    from src.api.ergast_service import ErgastService
+    from src.metrics.recorder import MetricsRecorder
+    from src.models.schedules import Schedule
+    from src.sinks.sink import Sink
 
 load_app = Typer(pretty_exceptions_show_locals=False)
 console = Console()
-status = console.status("[bold green]Loading...")
+error_console = Console(stderr=True)
 
-ergast_service = ErgastService()
-mongo_service = MongoService()
+YearOption = Annotated[Optional[int], Option(help="A single year to load.")]
+FromOption = Annotated[
+    Optional[int], Option("--from", help="The first year of a range to load.")
+]
+ToOption = Annotated[
+    Optional[int], Option("--to", help="The last year of a range to load.")
+]
+YearsOption = Annotated[
+    Optional[list[int]], Option("--years", help="A year to load, can be repeated.")
+]
+NoCacheOption = Annotated[
+    bool, Option("--no-cache", help="Always download from ergast, bypassing the cache.")
+]
+BatchSizeOption = Annotated[
+    int, Option(min=1, help="The number of documents to insert at once.")
+]
+MetricsOption = Annotated[
+    bool, Option("--metrics", help="Print how long every stage of the load took.")
+]
+MetricsFileOption = Annotated[
+    Optional[str],
+    Option(
+        "--metrics-file",
+        help="Write the metrics to a JSON file, or a Prometheus textfile if it ends in .prom.",
+    ),
+]
+
+
+class WriteMode(str, Enum):
+    """
+    The ways data can be written to the database.
+
+    Attributes:
+        UPSERT: Only write documents that changed.
+        REPLACE: Replace every document.
+    """
+
+    UPSERT = "upsert"
+    REPLACE = "replace"
+
+
+class Dataset(str, Enum):
+    """
+    The datasets that can be loaded.
+
+    Attributes:
+        SCHEDULE: The schedules, loaded a season at a time.
+        RESULTS: The race results.
+        QUALIFYING: The qualifying results.
+        PIT_STOPS: The pit stops.
+        LAP_TIMES: The lap times.
+    """
+
+    SCHEDULE = "schedule"
+    RESULTS = "results"
+    QUALIFYING = "qualifying"
+    PIT_STOPS = "pit-stops"
+    LAP_TIMES = "lap-times"
+
+
+# Constants
+ROUND_DATASETS = {
+    Dataset.RESULTS: ("Results", "results"),
+    Dataset.QUALIFYING: ("Qualifying", "qualifying"),
+    Dataset.PIT_STOPS: ("PitStops", "pitstops"),
+    Dataset.LAP_TIMES: ("LapTimes", "laps"),
+}
+
+
+class StorageLayout(str, Enum):
+    """
+    The ways schedules can be laid out in the database.
+
+    Attributes:
+        SEASON: A collection per season, with the fields as ergast returns them.
+        UNIFIED: A single collection with numeric rounds and UTC session datetimes.
+    """
+
+    SEASON = "season"
+    UNIFIED = "unified"
+
+
+class SinkType(str, Enum):
+    """
+    The destinations data can be loaded into.
+
+    Attributes:
+        MONGO: The configured MongoDB database.
+        JSONL: A JSON Lines file per season of every dataset.
+        SQLITE: An embedded SQLite database.
+    """
+
+    MONGO = "mongo"
+    JSONL = "jsonl"
+    SQLITE = "sqlite"
+
+
+class OutputFormat(str, Enum):
+    """
+    The ways a load can print what it wrote.
+
+    Attributes:
+        TABLE: Rendered tables and summaries.
+        JSON: A JSON array of the rows written, streamed to standard output.
+        JSONL: A JSON document per line for every row written.
+        QUIET: Nothing but errors.
+    """
+
+    TABLE = "table"
+    JSON = "json"
+    JSONL = "jsonl"
+    QUIET = "quiet"
+
+
+SinkOption = Annotated[SinkType, Option("--sink", help="Where to write the data.")]
+SinkPathOption = Annotated[
+    Optional[str],
+    Option(
+        "--sink-path",
+        help="The directory of the jsonl sink or the database file of the sqlite sink.",
+    ),
+]
+OutputOption = Annotated[
+    OutputFormat,
+    Option(
+        "--output",
+        help="Print a table, stream the rows as JSON or JSON Lines, or print nothing.",
+    ),
+]
 
 
 @load_app.command()
-def schedule(year: Annotated[int, Option(prompt=True)]):
+def schedule(
+    year: YearOption = None,
+    from_year: FromOption = None,
+    to_year: ToOption = None,
+    years: YearsOption = None,
+    workers: Annotated[
+        int, Option(min=1, help="The number of seasons to fetch from ergast at once.")
+    ] = 4,
+    no_cache: NoCacheOption = False,
+    mode: Annotated[
+        WriteMode, Option(help="Only write changed schedules, or replace them all.")
+    ] = WriteMode.UPSERT,
+    layout: Annotated[
+        StorageLayout,
+        Option(
+            help="A collection per season, or one typed collection for all seasons."
+        ),
+    ] = StorageLayout.SEASON,
+    metrics: MetricsOption = False,
+    metrics_file: MetricsFileOption = None,
+    sink_type: SinkOption = SinkType.MONGO,
+    sink_path: SinkPathOption = None,
+    output: OutputOption = OutputFormat.TABLE,
+    max_rows: Annotated[
+        int, Option("--max-rows", min=0, help="The most rows a table shows, 0 for all.")
+    ] = 30,
+):
     """
     Load schedules into the database.
 
+    Seasons are fetched from ergast concurrently, each season is handed to the
+    database writer as soon as it arrives, so writes overlap with the remaining fetches.
+    The tables are only built for the table output, json and jsonl print the schedules
+    of every season as soon as they are written, while progress and summaries go to
+    standard error.
+
+    Args:
+        year (int, optional): A single year to load schedules for.
+        from_year (int, optional): The first year of a range to load schedules for.
+        to_year (int, optional): The last year of a range to load schedules for.
+        years (list[int], optional): A list of years to load schedules for.
+        workers (int): The number of seasons to fetch from ergast at once.
+        no_cache (bool): Bypass the response cache.
+        mode (WriteMode): Upsert only the changed schedules or replace them all.
+        layout (StorageLayout): The layout to store the schedules in.
+        metrics (bool): Print how long every stage of the load took.
+        metrics_file (str, optional): The file to write the metrics to.
+        sink_type (SinkType): Where to write the data.
+        sink_path (str, optional): The path of the jsonl or sqlite sink.
+        output (OutputFormat): How to print the schedules that were loaded.
+        max_rows (int): The most schedules a table shows, 0 for all.
+    """
+    from src.api.ergast_service import ErgastService
+    from src.cache.response_cache import ResponseCache
+    from src.database.mongo_service import schedule_document
+    from src.helpers.output import OutputWriter
+    from src.helpers.utilities import resolve_years, generate_schedules_table
+    from src.metrics.recorder import MetricsRecorder
+
+    if year is None and from_year is None and to_year is None and not years:
+        year = prompt("Year", type=int)
+
+    setup_sink(sink_type)
+    target = output_console(output)
+    status = target.status("[bold green]Loading...")
+    status.start()
+    try:
+        seasons = resolve_years(year, from_year, to_year, years)
+        if layout == StorageLayout.UNIFIED and sink_type != SinkType.MONGO:
+            raise ValueError("The unified layout is only available in MongoDB")
+
+        status.update(f"[bold green]Loading {len(seasons)} season(s) from ergast...")
+        cache = None if no_cache else ResponseCache()
+        recorder = MetricsRecorder()
+        with recorder.stage("total"), create_sink(
+            sink_type, sink_path, recorder
+        ) as sink, ErgastService(
+            pool_size=workers, cache=cache, metrics=recorder
+        ) as ergast_service, OutputWriter(
+            output.value
+        ) as writer:
+
+            def print_season(season: int, season_schedules: list["Schedule"]) -> None:
+                for schedule in season_schedules:
+                    writer.write(schedule_document(season, schedule))
+                writer.flush()
+
+            schedules, summaries = load_schedules(
+                ergast_service,
+                sink,
+                seasons,
+                workers,
+                mode,
+                status,
+                layout,
+                print_season if writer.enabled else None,
+            )
+        status.stop()
+        if output == OutputFormat.TABLE:
+            for season in seasons:
+                table = generate_schedules_table(
+                    schedules[season], f"Schedules {season}", max_rows or None
+                )
+                console.print(table)
+        if output != OutputFormat.QUIET:
+            for season, summary in summaries.items():
+                target.print(
+                    f"[bold]{season}:[/bold] {summary['inserted']} inserted, "
+                    f"{summary['updated']} updated, {summary['deleted']} deleted, "
+                    f"{summary['unchanged']} unchanged"
+                )
+        report_metrics(recorder, metrics, metrics_file, target)
+    except Exception as error:
+        handle_error(error, status, target)
+
+
+def load_schedules(
+    ergast_service: "ErgastService",
+    sink: "Sink",
+    seasons: list[int],
+    workers: int,
+    mode: WriteMode,
+    status: Status,
+    layout: StorageLayout = StorageLayout.SEASON,
+    written: Callable[[int, list["Schedule"]], None] | None = None,
+) -> tuple[dict, dict]:
+    """
+    Fetch and insert the schedules for the given seasons.
+
+    Fetching runs on a bounded pool of workers, while a single writer inserts
+    every season into the database as soon as its fetch completes.
+    Once a season is written, the writer hands it to the written callback.
+
+    Args:
+        ergast_service (ErgastService): The service to fetch the schedules with.
+        sink (Sink): The sink to write the schedules to, MongoService for the unified
+            layout.
+        seasons (list[int]): The seasons to load.
+        workers (int): The maximum number of concurrent fetches.
+        mode (WriteMode): Upsert only the changed schedules or replace them all.
+        status (Status): The status to report progress on.
+        layout (StorageLayout, optional): The layout to store the schedules in.
+            Defaults to StorageLayout.SEASON.
+        written (Callable, optional): Called with the season and schedules of every
+            season once it is written, on the writer thread. Defaults to None.
+
+    Returns:
+        tuple[dict, dict]: The schedules that were loaded and, when upserting or using
+            the unified layout, the write summaries, both keyed by season.
+    """
+    schedules = {}
+    writes: dict[Future, int] = {}
+    if layout == StorageLayout.UNIFIED:
+        write = partial(sink.upsert_unified_schedules, force=mode == WriteMode.REPLACE)
+    elif mode == WriteMode.UPSERT:
+        write = sink.upsert_schedules
+    else:
+        write = sink.insert_schedules
+
+    def write_season(season: int, season_schedules: list["Schedule"]) -> dict | None:
+        summary = write(season, season_schedules)
+        if written is not None:
+            written(season, season_schedules)
+        return summary
+
+    with ThreadPoolExecutor(max_workers=1) as writer:
+        with ThreadPoolExecutor(max_workers=min(workers, len(seasons))) as fetchers:
+            fetches = {
+                fetchers.submit(ergast_service.get_schedules, season): season
+                for season in seasons
+            }
+            try:
+                for fetch in as_completed(fetches):
+                    season = fetches[fetch]
+                    schedules[season] = fetch.result()
+                    writes[
+                        writer.submit(write_season, season, schedules[season])
+                    ] = season
+                    status.update(
+                        f"[bold green]Fetched {len(schedules)}/{len(seasons)} season(s), "
+                        "inserting into database..."
+                    )
+            except Exception:
+                fetchers.shutdown(cancel_futures=True)
+                raise
+
+        results = {season: future.result() for future, season in writes.items()}
+
+    summaries = {
+        season: results[season] for season in sorted(results) if results[season]
+    }
+    return schedules, summaries
+
+
+@load_app.command()
+def results(
+    year: YearOption = None,
+    from_year: FromOption = None,
+    to_year: ToOption = None,
+    years: YearsOption = None,
+    no_cache: NoCacheOption = False,
+    batch_size: BatchSizeOption = 1000,
+    metrics: MetricsOption = False,
+    metrics_file: MetricsFileOption = None,
+    sink_type: SinkOption = SinkType.MONGO,
+    sink_path: SinkPathOption = None,
+    output: OutputOption = OutputFormat.TABLE,
+):
+    """
+    Load race results into the database.
+
+    Args:
+        year (int, optional): A single year to load race results for.
+        from_year (int, optional): The first year of a range to load race results for.
+        to_year (int, optional): The last year of a range to load race results for.
+        years (list[int], optional): A list of years to load race results for.
+        no_cache (bool): Bypass the response cache.
+        batch_size (int): The number of race results to insert at once.
+        metrics (bool): Print how long every stage of the load took.
+        metrics_file (str, optional): The file to write the metrics to.
+        sink_type (SinkType): Where to write the data.
+        sink_path (str, optional): The path of the jsonl or sqlite sink.
+        output (OutputFormat): How to print the documents that were loaded.
+    """
+    seasons = (year, from_year, to_year, years)
+    load_dataset(
+        "Results",
+        "iter_results",
+        seasons,
+        no_cache,
+        batch_size,
+        metrics=metrics,
+        metrics_file=metrics_file,
+        sink_type=sink_type,
+        sink_path=sink_path,
+        output=output,
+    )
+
+
+@load_app.command()
+def qualifying(
+    year: YearOption = None,
+    from_year: FromOption = None,
+    to_year: ToOption = None,
+    years: YearsOption = None,
+    no_cache: NoCacheOption = False,
+    batch_size: BatchSizeOption = 1000,
+    metrics: MetricsOption = False,
+    metrics_file: MetricsFileOption = None,
+    sink_type: SinkOption = SinkType.MONGO,
+    sink_path: SinkPathOption = None,
+    output: OutputOption = OutputFormat.TABLE,
+):
+    """
+    Load qualifying results into the database.
+
+    Args:
+        year (int, optional): A single year to load qualifying results for.
+        from_year (int, optional): The first year of a range to load qualifying results for.
+        to_year (int, optional): The last year of a range to load qualifying results for.
+        years (list[int], optional): A list of years to load qualifying results for.
+        no_cache (bool): Bypass the response cache.
+        batch_size (int): The number of qualifying results to insert at once.
+        metrics (bool): Print how long every stage of the load took.
+        metrics_file (str, optional): The file to write the metrics to.
+        sink_type (SinkType): Where to write the data.
+        sink_path (str, optional): The path of the jsonl or sqlite sink.
+        output (OutputFormat): How to print the documents that were loaded.
+    """
+    seasons = (year, from_year, to_year, years)
+    load_dataset(
+        "Qualifying",
+        "iter_qualifying",
+        seasons,
+        no_cache,
+        batch_size,
+        metrics=metrics,
+        metrics_file=metrics_file,
+        sink_type=sink_type,
+        sink_path=sink_path,
+        output=output,
+    )
+
+
+@load_app.command()
+def pit_stops(
+    year: YearOption = None,
+    from_year: FromOption = None,
+    to_year: ToOption = None,
+    years: YearsOption = None,
+    no_cache: NoCacheOption = False,
+    batch_size: BatchSizeOption = 1000,
+    metrics: MetricsOption = False,
+    metrics_file: MetricsFileOption = None,
+    sink_type: SinkOption = SinkType.MONGO,
+    sink_path: SinkPathOption = None,
+    output: OutputOption = OutputFormat.TABLE,
+):
+    """
+    Load pit stops into the database.
+
+    Args:
+        year (int, optional): A single year to load pit stops for.
+        from_year (int, optional): The first year of a range to load pit stops for.
+        to_year (int, optional): The last year of a range to load pit stops for.
+        years (list[int], optional): A list of years to load pit stops for.
+        no_cache (bool): Bypass the response cache.
+        batch_size (int): The number of pit stops to insert at once.
+        metrics (bool): Print how long every stage of the load took.
+        metrics_file (str, optional): The file to write the metrics to.
+        sink_type (SinkType): Where to write the data.
+        sink_path (str, optional): The path of the jsonl or sqlite sink.
+        output (OutputFormat): How to print the documents that were loaded.
+    """
+    seasons = (year, from_year, to_year, years)
+    load_dataset(
+        "PitStops",
+        "iter_pit_stops",
+        seasons,
+        no_cache,
+        batch_size,
+        metrics=metrics,
+        metrics_file=metrics_file,
+        sink_type=sink_type,
+        sink_path=sink_path,
+        output=output,
+    )
+
+
+@load_app.command()
+def lap_times(
+    year: YearOption = None,
+    from_year: FromOption = None,
+    to_year: ToOption = None,
+    years: YearsOption = None,
+    no_cache: NoCacheOption = False,
+    batch_size: BatchSizeOption = 1000,
+    metrics: MetricsOption = False,
+    metrics_file: MetricsFileOption = None,
+    sink_type: SinkOption = SinkType.MONGO,
+    sink_path: SinkPathOption = None,
+    output: OutputOption = OutputFormat.TABLE,
+):
+    """
+    Load lap times into the database.
+
+    Args:
+        year (int, optional): A single year to load lap times for.
+        from_year (int, optional): The first year of a range to load lap times for.
+        to_year (int, optional): The last year of a range to load lap times for.
+        years (list[int], optional): A list of years to load lap times for.
+        no_cache (bool): Bypass the response cache.
+        batch_size (int): The number of lap times to insert at once.
+        metrics (bool): Print how long every stage of the load took.
+        metrics_file (str, optional): The file to write the metrics to.
+        sink_type (SinkType): Where to write the data.
+        sink_path (str, optional): The path of the jsonl or sqlite sink.
+        output (OutputFormat): How to print the documents that were loaded.
+    """
+    seasons = (year, from_year, to_year, years)
+    load_dataset(
+        "LapTimes",
+        "iter_lap_times",
+        seasons,
+        no_cache,
+        batch_size,
+        metrics=metrics,
+        metrics_file=metrics_file,
+        sink_type=sink_type,
+        sink_path=sink_path,
+        output=output,
+    )
+
+
+def load_dataset(
+    dataset: str,
+    fetch: str,
+    seasons: tuple,
+    no_cache: bool,
+    batch_size: int,
+    metrics: bool = False,
+    metrics_file: str | None = None,
+    sink_type: SinkType = SinkType.MONGO,
+    sink_path: str | None = None,
+    output: OutputFormat = OutputFormat.TABLE,
+) -> None:
+    """
+    Stream a dataset from ergast into the database, one season at a time.
+
+    Every page is validated and flattened into documents as it arrives and the
+    documents are inserted in batches, so a season is never held in memory at once.
+    With json or jsonl output the documents of every batch are printed as soon as the
+    sink wrote the batch, a failed batch prints none of its documents.
+
+    Args:
+        dataset (str): The name of the dataset, which is also its database name.
+        fetch (str): The name of the ErgastService method that yields the dataset's races.
+        seasons (tuple): The year, from, to and years options given by the user.
+        no_cache (bool): Bypass the response cache.
+        batch_size (int): The number of documents to insert at once.
+        metrics (bool, optional): Print how long every stage of the load took.
+            Defaults to False.
+        metrics_file (str, optional): The file to write the metrics to.
+            Defaults to None.
+        sink_type (SinkType, optional): Where to write the data.
+            Defaults to SinkType.MONGO.
+        sink_path (str, optional): The path of the jsonl or sqlite sink.
+            Defaults to None.
+        output (OutputFormat, optional): How to print the documents that were loaded.
+            Defaults to OutputFormat.TABLE.
+    """
+    from src.api.ergast_service import ErgastService
+    from src.cache.response_cache import ResponseCache
+    from src.helpers.output import OutputWriter
+    from src.helpers.utilities import resolve_years
+    from src.metrics.recorder import MetricsRecorder
+
+    year, from_year, to_year, years = seasons
+    if year is None and from_year is None and to_year is None and not years:
+        year = prompt("Year", type=int)
+
+    setup_sink(sink_type)
+    target = output_console(output)
+    status = target.status("[bold green]Loading...")
+    status.start()
+    try:
+        recorder = MetricsRecorder()
+        cache = None if no_cache else ResponseCache()
+        with recorder.stage("total"), create_sink(
+            sink_type, sink_path, recorder
+        ) as sink, ErgastService(
+            cache=cache, metrics=recorder
+        ) as ergast_service, OutputWriter(
+            output.value
+        ) as writer:
+            for season in resolve_years(year, from_year, to_year, years):
+                status.update(f"[bold green]Loading {dataset} for {season}...")
+                races = getattr(ergast_service, fetch)(season)
+                documents = writer.hold(
+                    document for race in races for document in race.documents()
+                )
+                count = sink.insert_dataset(
+                    dataset, season, documents, batch_size, writer.release
+                )
+                writer.release()
+                if output != OutputFormat.QUIET:
+                    target.print(f"[bold]{season}:[/bold] {count} documents loaded")
+        status.stop()
+        report_metrics(recorder, metrics, metrics_file, target)
+    except Exception as error:
+        handle_error(error, status, target)
+
+
+@load_app.command()
+def bulk(
+    year: YearOption = None,
+    from_year: FromOption = None,
+    to_year: ToOption = None,
+    years: YearsOption = None,
+    datasets: Annotated[
+        Optional[list[Dataset]],
+        Option(
+            "--dataset", help="A dataset to load, can be repeated. Defaults to all."
+        ),
+    ] = None,
+    concurrency: Annotated[
+        int, Option(min=1, help="The maximum number of requests to ergast in flight.")
+    ] = 16,
+    rate: Annotated[
+        float, Option(min=0.1, help="The sustained number of requests per second.")
+    ] = 4.0,
+    burst: Annotated[
+        int,
+        Option(min=1, max=8, help="The number of requests that can be sent at once."),
+    ] = 4,
+    processes: Annotated[
+        int,
+        Option(min=0, help="The number of processes validating pages, 0 for threads."),
+    ] = 0,
+    no_cache: NoCacheOption = False,
+    metrics: MetricsOption = False,
+    metrics_file: MetricsFileOption = None,
+    sink_type: SinkOption = SinkType.MONGO,
+    sink_path: SinkPathOption = None,
+):
+    """
+    Load several datasets for several seasons at once.
+
+    Every round of every dataset goes through an asyncio pipeline of fetch, validate
+    and write stages connected by bounded queues, so many requests are kept in flight
+    while writes and validation keep up.
+
     Args:
-        year (int): The year to load schedules for.
+        year (int, optional): A single year to load.
+        from_year (int, optional): The first year of a range to load.
+        to_year (int, optional): The last year of a range to load.
+        years (list[int], optional): A list of years to load.
+        datasets (list[Dataset], optional): The datasets to load.
+        concurrency (int): The maximum number of requests to ergast in flight.
+        rate (float): The sustained number of requests per second.
+        burst (int): The number of requests that can be sent at once, independent of
+            the concurrency so a cold start never fires every request together.
+        processes (int): The number of processes validating pages, 0 for threads.
+        no_cache (bool): Bypass the response cache.
+        metrics (bool): Print how long every stage of the load took.
+        metrics_file (str, optional): The file to write the metrics to.
+        sink_type (SinkType): Where to write the data.
+        sink_path (str, optional): The path of the jsonl or sqlite sink.
     """
+    from src.api.ergast_service import ErgastService
+    from src.cache.response_cache import ResponseCache
+    from src.helpers.utilities import resolve_years
+    from src.metrics.recorder import MetricsRecorder
+    from src.pipeline.async_pipeline import AsyncPipeline, run_pipeline
+
+    if year is None and from_year is None and to_year is None and not years:
+        year = prompt("Year", type=int)
+
+    datasets = datasets or list(Dataset)
+    setup_sink(sink_type)
+    status = console.status("[bold green]Loading...")
     status.start()
     try:
-        validate_year(year, allow_future=True)
-        status.update("[bold green]Loading schedules from ergast...")
-        schedules = ergast_service.get_schedules(year)
-        status.update("[bold green]Inserting schedules into database...")
-        thread = run_thread(mongo_service.insert_schedules, (year, schedules))
-        table = generate_schedules_table(schedules)
-        console.print(table)
-        thread.join()
+        seasons = resolve_years(year, from_year, to_year, years)
+        cache = None if no_cache else ResponseCache()
+        recorder = MetricsRecorder()
+        with recorder.stage("total"), create_sink(
+            sink_type, sink_path, recorder, concurrency
+        ) as sink, ErgastService(
+            pool_size=concurrency,
+            cache=cache,
+            rate=rate,
+            burst=burst,
+            metrics=recorder,
+        ) as ergast_service:
+            pipeline = AsyncPipeline(
+                ergast_service,
+                sink,
+                concurrency,
+                processes=processes,
+                progress=lambda message: status.update(f"[bold green]{message}..."),
+            )
+            summary = run_pipeline(
+                pipeline,
+                seasons,
+                [
+                    ROUND_DATASETS[dataset]
+                    for dataset in datasets
+                    if dataset in ROUND_DATASETS
+                ],
+                Dataset.SCHEDULE in datasets,
+            )
         status.stop()
+        for database, season_counts in summary.items():
+            for season, count in sorted(season_counts.items()):
+                console.print(
+                    f"[bold]{database} {season}:[/bold] {count} documents loaded"
+                )
+        report_metrics(recorder, metrics, metrics_file)
     except Exception as error:
-        handle_error(error)
+        handle_error(error, status)
+
+
+def setup_sink(sink_type: SinkType) -> None:
+    """
+    Resolve the configuration a sink needs, before any status or thread starts.
+
+    On a fresh install MongoDB asks for its connection string, which has to happen
+    in the main thread, not under a live status or in a writer thread.
+
+    Args:
+        sink_type (SinkType): The kind of sink.
+    """
+    from src.config.configuration import setup_app
+
+    if sink_type == SinkType.MONGO:
+        setup_app()
+
+
+def create_sink(
+    sink_type: SinkType,
+    sink_path: str | None,
+    metrics: "MetricsRecorder",
+    max_pool_size: int | None = None,
+) -> "Sink":
+    """
+    Create the sink a load writes to.
 
+    Args:
+        sink_type (SinkType): The kind of sink.
+        sink_path (str | None): The directory of the jsonl sink or the database file of
+            the sqlite sink, None for their default.
+        metrics (MetricsRecorder): The recorder of stage timings and counters.
+        max_pool_size (int, optional): The maximum number of MongoDB connections.
+            Defaults to None, which uses the client pool's default.
 
-def run_thread(func, args: tuple) -> Thread:
+    Returns:
+        Sink: The sink.
     """
-    Run a thread.
+    if sink_type == SinkType.JSONL:
+        from src.sinks.jsonl_sink import JsonlSink
+
+        return JsonlSink(sink_path, metrics)
+    if sink_type == SinkType.SQLITE:
+        from src.sinks.sqlite_sink import SqliteSink
+
+        return SqliteSink(sink_path, metrics)
+
+    from src.database.mongo_service import MongoService
+
+    if max_pool_size is None:
+        return MongoService(metrics=metrics)
+    return MongoService(max_pool_size=max_pool_size, metrics=metrics)
+
+
+def output_console(output: OutputFormat) -> Console:
+    """
+    Get the console a load prints its progress and summaries on.
 
     Args:
-        func (function): The function to run.
-        args (tuple): The arguments to pass to the function.
+        output (OutputFormat): How the load prints what it wrote.
 
     Returns:
-        Thread: The thread.
+        Console: Standard output for tables, otherwise standard error, so standard
+            output only carries the rows.
+    """
+    return console if output == OutputFormat.TABLE else error_console
+
+
+def report_metrics(
+    recorder: "MetricsRecorder",
+    show: bool,
+    metrics_file: str | None,
+    target: Console = console,
+) -> None:
     """
-    thread = Thread(target=func, args=args)
-    thread.start()
-    return thread
+    Print and export the metrics of a load.
 
+    Args:
+        recorder (MetricsRecorder): The metrics of the load.
+        show (bool): Print the summary table.
+        metrics_file (str | None): The file to write the metrics to, if any.
+        target (Console, optional): The console to print on. Defaults to console.
+    """
+    if show:
+        target.print(recorder.summary_table())
+    if metrics_file:
+        recorder.export(metrics_file)
+        target.print(f"Metrics written to {metrics_file}")
 
-def handle_error(error: Exception):
+
+def handle_error(error: Exception, status: Status, target: Console = console):
     """
     Handle an error.
 
     Args:
         error (Exception): The error to handle.
+        status (Status): The status to stop.
+        target (Console, optional): The console to print on. Defaults to console.
     """
+    from requests import HTTPError
+
     status.stop()
     if isinstance(error, ValueError):
-        console.print(f"[bold red]Value error: {error}")
+        target.print(f"[bold red]Value error: {error}")
     elif isinstance(error, HTTPError):
-        console.print(f"[bold red]HTTP error: {error}")
+        target.print(f"[bold red]HTTP error: {error}")
     else:
-        console.print(f"[bold red]Unexpected error: {error}")
+        target.print(f"[bold red]Unexpected error: {error}")
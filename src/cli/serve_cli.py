@@ -0,0 +1,179 @@
+"""
+This module contains the serve command line interface.
+
+The serve command is responsible for keeping the database up to date as a long-running
+process, syncing on a schedule driven by the race weekends in the loaded schedules.
+"""
+
+from datetime import datetime, timedelta, timezone
+from typing import TYPE_CHECKING, Optional
+from typing_extensions import Annotated
+
+from typer import Option
+
+from src.cli.api_cli import HostOption
+from src.cli.load_cli import (
+    Dataset,
+    NoCacheOption,
+    console,
+    handle_error,
+)
+
+if TYPE_CHECKING:
+    from src.database.mongo_service import MongoService
+    from src.models.schedules import Schedule
+
+
+def serve(
+    datasets: Annotated[
+        Optional[list[Dataset]],
+        Option(
+            "--dataset", help="A dataset to sync, can be repeated. Defaults to all."
+        ),
+    ] = None,
+    poll_interval: Annotated[
+        int,
+        Option(
+            "--poll-interval",
+            min=1,
+            help="Minutes between syncs while waiting for a session's data.",
+        ),
+    ] = 15,
+    poll_window: Annotated[
+        int,
+        Option(
+            "--poll-window",
+            min=1,
+            help="Hours after a session ends to keep polling for its data.",
+        ),
+    ] = 6,
+    idle_interval: Annotated[
+        int,
+        Option(
+            "--idle-interval",
+            min=1,
+            help="Hours between syncs when no session ended recently.",
+        ),
+    ] = 24,
+    api_port: Annotated[
+        Optional[int],
+        Option(
+            "--api-port",
+            min=0,
+            max=65535,
+            help="Also serve the schedule read API on this port.",
+        ),
+    ] = None,
+    api_host: HostOption = "127.0.0.1",
+    no_cache: NoCacheOption = False,
+):
+    """
+    Keep the database up to date with ergast until stopped.
+
+    Every sync is the sync command, run with the same ergast session and database
+    client, so only the first one pays for connecting. After every sync the loaded
+    schedules of the current season decide when the next one runs: every poll interval
+    for a while after a session ends, when ergast publishes its data, and otherwise
+    once per idle interval or when the next session ends, whichever comes first.
+
+    With an API port, the schedule read API of the api command is served alongside,
+    and its cache is dropped whenever a sync loads schedules.
+
+    Args:
+        datasets (list[Dataset], optional): The datasets to sync.
+        poll_interval (int): The minutes between syncs after a session ends.
+        poll_window (int): The hours after a session ends to keep polling.
+        idle_interval (int): The hours between syncs when no session ended.
+        api_port (int, optional): The port to serve the schedule read API on.
+        api_host (str): The host to serve the schedule read API on.
+        no_cache (bool): Bypass the response cache.
+    """
+    import signal
+    from threading import Event
+
+    from src.api.ergast_service import ErgastService
+    from src.cache.response_cache import ResponseCache
+    from src.cli.sync_cli import sync_datasets
+    from src.config.configuration import setup_app
+    from src.database.mongo_service import MongoService
+    from src.server.schedule_api import ScheduleApi, ScheduleCache, load_schedules
+    from src.sync.scheduler import SyncScheduler
+    from src.sync.watermarks import WatermarkStore
+
+    scheduler = SyncScheduler(
+        timedelta(minutes=poll_interval),
+        timedelta(hours=poll_window),
+        timedelta(hours=idle_interval),
+    )
+    setup_app()
+    store = WatermarkStore()
+    mongo_service = MongoService()
+    # The current season is revalidated on every poll instead of served from the cache
+    cache = None if no_cache else ResponseCache(current_season_ttl=poll_interval * 60)
+
+    schedule_api = None
+    if api_port is not None:
+        # Loads only happen here, so the cache never has to expire on its own
+        schedule_cache = ScheduleCache(
+            lambda: load_schedules(mongo_service), float("inf")
+        )
+        schedule_api = ScheduleApi(schedule_cache, api_host, api_port)
+        schedule_api.start()
+        console.print(f"Serving schedules on [bold]{schedule_api.url}[/bold]")
+
+    stopped = Event()
+    signal.signal(signal.SIGTERM, lambda *args: stopped.set())
+
+    try:
+        with ErgastService(cache=cache) as ergast_service:
+            while not stopped.is_set():
+                now = datetime.now(timezone.utc)
+                status = console.status("[bold green]Syncing...")
+                status.start()
+                try:
+                    summaries = sync_datasets(
+                        ergast_service,
+                        mongo_service,
+                        store,
+                        datasets,
+                        None,
+                        now,
+                        status,
+                    )
+                    status.stop()
+                    loaded = summaries.get(Dataset.SCHEDULE, {}).get("loaded")
+                    if schedule_api is not None and loaded:
+                        schedule_api.cache.invalidate()
+                    scheduler.update(loaded_schedules(mongo_service, now.year))
+                    next_run = scheduler.next_run(datetime.now(timezone.utc))
+                except Exception as error:
+                    handle_error(error, status)
+                    next_run = now + scheduler.poll_interval
+
+                console.print(f"Next sync at {next_run:%Y-%m-%d %H:%M} UTC")
+                stopped.wait((next_run - datetime.now(timezone.utc)).total_seconds())
+    except KeyboardInterrupt:
+        pass
+    finally:
+        if schedule_api is not None:
+            schedule_api.stop()
+    console.print("[bold]Stopped.")
+
+
+def loaded_schedules(mongo_service: "MongoService", year: int) -> list["Schedule"]:
+    """
+    Read the schedules of a season from the database.
+
+    Args:
+        mongo_service (MongoService): The service to read the schedules with.
+        year (int): The year of the season.
+
+    Returns:
+        list[Schedule]: The schedules, empty if the season was never loaded.
+    """
+    from src.models.schedules import Schedule
+
+    return [
+        Schedule.model_validate(document)
+        for document in mongo_service.iter_season("Schedules", year)
+    ]
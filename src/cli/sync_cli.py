@@ -0,0 +1,283 @@
+"""
+This module contains the sync command line interface.
+
+The sync command is responsible for incrementally bringing the database up to date,
+fetching only the seasons and rounds that are newer than what was loaded before.
+"""
+
+from collections.abc import Iterator
+from datetime import datetime, timezone
+from typing import TYPE_CHECKING, Optional
+from typing_extensions import Annotated
+
+from rich.status import Status
+from typer import Option
+
+from src.cli.load_cli import (
+    ROUND_DATASETS,
+    Dataset,
+    NoCacheOption,
+    console,
+    handle_error,
+)
+
+if TYPE_CHECKING:
+    from src.api.ergast_service import ErgastService
+    from src.database.mongo_service import MongoService
+    from src.sync.watermarks import WatermarkStore
+
+
+def sync(
+    datasets: Annotated[
+        Optional[list[Dataset]],
+        Option(
+            "--dataset", help="A dataset to sync, can be repeated. Defaults to all."
+        ),
+    ] = None,
+    from_year: Annotated[
+        Optional[int],
+        Option(
+            "--from",
+            help="Sync from this season, even if it was synced before. "
+            "Defaults to the watermark, or the current season on the first sync.",
+        ),
+    ] = None,
+    no_cache: NoCacheOption = False,
+):
+    """
+    Bring the database up to date with ergast.
+
+    Every dataset keeps a watermark in ~/.lyzer of the last season and round it loaded,
+    only newer seasons and rounds are fetched, and the current season's schedule is
+    always checked. Seasons and rounds whose content did not change are not written.
+
+    Args:
+        datasets (list[Dataset], optional): The datasets to sync.
+        from_year (int, optional): The season to sync from, ignoring the watermark.
+        no_cache (bool): Bypass the response cache.
+    """
+    from src.api.ergast_service import ErgastService
+    from src.cache.response_cache import ResponseCache
+    from src.config.configuration import setup_app
+    from src.database.mongo_service import MongoService
+    from src.helpers.utilities import validate_year
+    from src.sync.watermarks import WatermarkStore
+
+    setup_app()
+    status = console.status("[bold green]Syncing...")
+    status.start()
+    try:
+        if from_year is not None:
+            validate_year(from_year, allow_future=True)
+
+        now = datetime.now(timezone.utc)
+        store = WatermarkStore()
+        mongo_service = MongoService()
+        cache = None if no_cache else ResponseCache()
+        with ErgastService(cache=cache) as ergast_service:
+            sync_datasets(
+                ergast_service, mongo_service, store, datasets, from_year, now, status
+            )
+            requests = ergast_service.request_count
+        status.stop()
+        console.print(f"[bold]{requests}[/bold] request(s) sent to ergast")
+    except Exception as error:
+        handle_error(error, status)
+
+
+def sync_datasets(
+    ergast_service: "ErgastService",
+    mongo_service: "MongoService",
+    store: "WatermarkStore",
+    datasets: list[Dataset] | None,
+    from_year: int | None,
+    now: datetime,
+    status: Status,
+) -> dict[Dataset, dict]:
+    """
+    Sync every dataset and print where its watermark got to.
+
+    Args:
+        ergast_service (ErgastService): The service to fetch the data with.
+        mongo_service (MongoService): The service to write the data with.
+        store (WatermarkStore): The watermarks to read and advance.
+        datasets (list[Dataset] | None): The datasets to sync, None for all of them.
+        from_year (int | None): The season to sync from, ignoring the watermark.
+        now (datetime): The current time in UTC.
+        status (Status): The status to report progress on.
+
+    Returns:
+        dict[Dataset, dict]: The number of seasons or rounds loaded and left unchanged
+            for every dataset.
+    """
+    summaries = {}
+    for dataset in datasets or list(Dataset):
+        status.update(f"[bold green]Syncing {dataset.value}...")
+        if dataset == Dataset.SCHEDULE:
+            summary = sync_schedules(
+                ergast_service, mongo_service, store, from_year, now
+            )
+        else:
+            summary = sync_rounds(
+                ergast_service, mongo_service, store, dataset, from_year, now
+            )
+        position = store.position(dataset.value)
+        watermark = "/".join(map(str, position)) if position else "none"
+        empty = f"{summary['empty']} without data, " if summary.get("empty") else ""
+        console.print(
+            f"[bold]{dataset.value}:[/bold] {summary['loaded']} loaded, "
+            f"{summary['unchanged']} unchanged, {empty}watermark {watermark}"
+        )
+        summaries[dataset] = summary
+    return summaries
+
+
+def sync_schedules(
+    ergast_service: "ErgastService",
+    mongo_service: "MongoService",
+    store: "WatermarkStore",
+    from_year: int | None,
+    now: datetime,
+) -> dict:
+    """
+    Sync the schedules of every season after the watermark and the current season.
+
+    Args:
+        ergast_service (ErgastService): The service to fetch the schedules with.
+        mongo_service (MongoService): The service to write the schedules with.
+        store (WatermarkStore): The watermarks to read and advance.
+        from_year (int | None): The season to sync from, ignoring the watermark.
+        now (datetime): The current time in UTC.
+
+    Returns:
+        dict: The number of seasons loaded and left unchanged.
+    """
+    from src.database.mongo_service import hash_document
+
+    dataset = Dataset.SCHEDULE.value
+    position = store.position(dataset)
+    if from_year is not None:
+        start = from_year
+    else:
+        start = position[0] + 1 if position else now.year
+
+    summary = {"loaded": 0, "unchanged": 0}
+    for season in sorted(set(range(start, now.year + 1)) | {now.year}):
+        schedules = ergast_service.get_schedules(season)
+        if not schedules:
+            continue
+
+        key = str(season)
+        content_hash = hash_document(
+            {"Schedules": [schedule.model_dump() for schedule in schedules]}
+        )
+        if store.content_hash(dataset, key) == content_hash:
+            summary["unchanged"] += 1
+        else:
+            mongo_service.upsert_schedules(season, schedules)
+            summary["loaded"] += 1
+        store.advance(dataset, season, key=key, content_hash=content_hash)
+
+    return summary
+
+
+def sync_rounds(
+    ergast_service: "ErgastService",
+    mongo_service: "MongoService",
+    store: "WatermarkStore",
+    dataset: Dataset,
+    from_year: int | None,
+    now: datetime,
+) -> dict:
+    """
+    Sync every raced round of a dataset after the watermark or in the current season.
+
+    Rounds are synced in order. The sync stops at the first round of the current
+    season after the watermark that ergast has no data for yet, so the watermark never
+    skips a round that is still to be published. Rounds of past seasons without data,
+    which were raced before ergast covered the dataset, are skipped and the watermark
+    moves past them, and so are re-checked rounds of the current season.
+
+    Args:
+        ergast_service (ErgastService): The service to fetch the rounds with.
+        mongo_service (MongoService): The service to write the rounds with.
+        store (WatermarkStore): The watermarks to read and advance.
+        dataset (Dataset): The dataset to sync, one of ROUND_DATASETS.
+        from_year (int | None): The season to sync from, ignoring the watermark.
+        now (datetime): The current time in UTC.
+
+    Returns:
+        dict: The number of rounds loaded, left unchanged and skipped without data.
+    """
+    from src.database.mongo_service import hash_document
+
+    database, endpoint = ROUND_DATASETS[dataset]
+    position = None if from_year is not None else store.position(dataset.value)
+    if from_year is not None:
+        start = from_year
+    else:
+        start = position[0] if position else now.year
+
+    summary = {"loaded": 0, "unchanged": 0, "empty": 0}
+    for season, round in pending_rounds(ergast_service, start, position, now):
+        documents = [
+            document
+            for race in ergast_service.iter_round(season, round, endpoint)
+            for document in race.documents()
+        ]
+        if not documents:
+            is_new = position is None or (season, round) > position
+            if season == now.year and is_new:
+                break
+            summary["empty"] += 1
+            store.advance(dataset.value, season, round)
+            continue
+
+        key = f"{season}/{round}"
+        content_hash = hash_document({"Documents": documents})
+        if store.content_hash(dataset.value, key) == content_hash:
+            summary["unchanged"] += 1
+        else:
+            mongo_service.replace_round(database, season, round, documents)
+            # The watermark must never pass a round that is not durable yet
+            mongo_service.flush()
+            summary["loaded"] += 1
+        store.advance(dataset.value, season, round, key, content_hash)
+
+    return summary
+
+
+def pending_rounds(
+    ergast_service: "ErgastService",
+    start: int,
+    position: tuple[int, int] | None,
+    now: datetime,
+) -> Iterator[tuple[int, int]]:
+    """
+    Get the rounds after the watermark that have been raced, in order.
+
+    Every raced round of the current season is included, even before the watermark,
+    so corrections ergast publishes after a round was synced are picked up by
+    comparing the content hash of the round.
+
+    Args:
+        ergast_service (ErgastService): The service to fetch the schedules with.
+        start (int): The first season.
+        position (tuple[int, int] | None): The last season and round loaded, if any.
+        now (datetime): The current time in UTC.
+
+    Yields:
+        tuple[int, int]: The season and round.
+    """
+    for season in range(start, now.year + 1):
+        for schedule in ergast_service.get_schedules(season):
+            round = int(schedule.Round)
+            if (
+                position is not None
+                and season < now.year
+                and (season, round) <= position
+            ):
+                continue
+            if schedule.starts_at() > now:
+                return
+            yield season, round
@@ -4,6 +4,14 @@ This module contains the typer CLI app and logic for the Lyzer-ETL application.
 Commands:
     update: Update the application.
     version: Print the current version of the application.
+    config: Rewrite the Mongo connection string.
+    load: Load data into the database.
+    cache: Manage the response cache.
+    sync: Bring the database up to date with ergast.
+    export: Export datasets to Parquet files, partitioned by season.
+    import-dump: Load a local Ergast CSV dump archive into the database.
+    serve: Keep the database up to date with ergast until stopped.
+    api: Serve the loaded schedules over a local HTTP read API until stopped.
 """
 
 # Third Party Imports
@@ -11,17 +19,30 @@ import typer
 from rich import print as rich_print
 
 # Local Imports
-from src.api.github_service import GithubService
+from src.cli.api_cli import api
+from src.cli.cache_cli import cache_app
+from src.cli.export_cli import export
+from src.cli.import_cli import import_dump
 from src.cli.load_cli import load_app
-from src.config.configuration import read_config, get_connection_string, write_config
+from src.cli.serve_cli import serve
+from src.cli.sync_cli import sync
+from src.config.configuration import (
+    get_connection_string,
+    read_config,
+    setup_app,
+    write_config,
+)
 from src.helpers.utilities import read_version_file
 
 app = typer.Typer(pretty_exceptions_show_locals=False)
-app_version = read_version_file()
-config = read_config()
-github_service = GithubService(config, app_version)
 
 app.add_typer(load_app, name="load")
+app.add_typer(cache_app, name="cache")
+app.command()(sync)
+app.command()(export)
+app.command(name="import-dump")(import_dump)
+app.command()(serve)
+app.command()(api)
 
 
 @app.command()
@@ -33,6 +54,10 @@ def update() -> None:
     If the last check was more than 24 hours ago, it will check for a new update.
     If there is a new update, it will download the new version in the home directory.
     """
+    from src.api.github_service import GithubService
+
+    setup_app()
+    github_service = GithubService(read_config(), read_version_file())
     github_service.update_app(True)
 
 
@@ -54,6 +79,7 @@ def config() -> None:
 
     If they select yes, they will be able to rewrite their URI.
     """
+    setup_app()
     config = read_config()
     connection_uri = config["mongoUri"]
     rich_print(
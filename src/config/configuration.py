@@ -6,6 +6,8 @@ Functions:
     create_config: Create the config to be used by the whole application.
     read_config: Read the config file.
     write_config: Write the config file.
+    get_connection_string: Get the mongo connection string from user.
+    get_mongo_uri: Get the configured mongo connection string.
 """
 
 # Standard Library Imports
@@ -14,9 +16,6 @@ import os
 from datetime import datetime
 from rich import print as rich_print
 
-# Local Imports
-from src.database.mongo_service import MongoService
-
 # Constants
 HOME_DIRECTORY = os.path.expanduser("~")
 CONFIG_DIRECTORY = os.path.join(HOME_DIRECTORY, ".lyzer")
@@ -85,11 +84,13 @@ def get_connection_string(config: dict | list = {}) -> dict | list:
     Returns:
         dict | list: Updated config or new config populated with Mongo URI
     """
+    from src.database.mongo_service import MongoService
+
     valid = False
 
     while not valid:
         connection_uri = input("\nEnter your mongo connection string: ")
-        valid = MongoService().test_connection(connection_uri)
+        valid = MongoService(connection_uri).test_connection()
 
     if len(config.keys()) == 0:
         config.update({"mongoUri": connection_uri})
@@ -97,3 +98,17 @@ def get_connection_string(config: dict | list = {}) -> dict | list:
         config["mongoUri"] = connection_uri
 
     return config
+
+
+def get_mongo_uri() -> str:
+    """
+    Get the configured mongo connection string.
+
+    This sets up the application first, so the user is asked for a connection
+    string if there is no config file yet.
+
+    Returns:
+        str: The mongo connection string.
+    """
+    setup_app()
+    return read_config()["mongoUri"]
@@ -3,4 +3,5 @@ Folder for database related files.
 
 Modules:
     mongo_service: The MongoDB file for interacting with the MongoDB database.
+    client_pool: The process-wide pool of MongoDB clients.
 """
@@ -0,0 +1,84 @@
+"""
+This module contains the process-wide pool of MongoDB clients.
+
+Every MongoClient starts its own monitor threads and connection pool, so the application
+creates at most one client per connection string and shares it between all services.
+Clients are only created when first used and are closed when the process exits.
+
+Functions:
+    get_client: Get the shared client for a connection string.
+    close_client: Close and forget the shared client for a connection string.
+    close_clients: Close every shared client.
+"""
+
+# Standard Library Imports
+import atexit
+from threading import Lock
+
+# Third Party Imports
+from pymongo import MongoClient
+
+# Constants
+DEFAULT_MAX_POOL_SIZE = 10
+DEFAULT_TIMEOUT_MS = 10000
+
+clients: dict[str, MongoClient] = {}
+clients_lock = Lock()
+
+
+def get_client(
+    connection_string: str,
+    max_pool_size: int = DEFAULT_MAX_POOL_SIZE,
+    timeout_ms: int = DEFAULT_TIMEOUT_MS,
+) -> MongoClient:
+    """
+    Get the shared client for a connection string, creating it on first use.
+
+    The pool size and timeouts only apply when the client is created.
+
+    Args:
+        connection_string (str): The MongoDB connection string.
+        max_pool_size (int, optional): The maximum number of connections in the client's
+            pool. Defaults to DEFAULT_MAX_POOL_SIZE.
+        timeout_ms (int, optional): The connect and server selection timeout in
+            milliseconds. Defaults to DEFAULT_TIMEOUT_MS.
+
+    Returns:
+        MongoClient: The shared client.
+    """
+    with clients_lock:
+        client = clients.get(connection_string)
+        if client is None:
+            client = MongoClient(
+                connection_string,
+                maxPoolSize=max_pool_size,
+                connectTimeoutMS=timeout_ms,
+                serverSelectionTimeoutMS=timeout_ms,
+            )
+            clients[connection_string] = client
+        return client
+
+
+def close_client(connection_string: str) -> None:
+    """
+    Close and forget the shared client for a connection string.
+
+    Args:
+        connection_string (str): The MongoDB connection string.
+    """
+    with clients_lock:
+        client = clients.pop(connection_string, None)
+    if client is not None:
+        client.close()
+
+
+def close_clients() -> None:
+    """Close every shared client."""
+    with clients_lock:
+        open_clients = list(clients.values())
+        clients.clear()
+    for client in open_clients:
+        client.close()
+
+
+atexit.register(close_clients)
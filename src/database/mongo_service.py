@@ -4,58 +4,174 @@ This module contains the MongoService class.
 The MongoService class is responsible for all interactions with the MongoDB database.
 """
 
-from os import environ
+import hashlib
+import json
+from collections.abc import Callable, Iterable, Iterator, Mapping
+from datetime import datetime
+from threading import Lock
+from uuid import uuid4
 
-from pymongo import MongoClient
+from bson import decode, encode
+from bson.raw_bson import RawBSONDocument
+from pymongo import ASCENDING, DeleteMany, IndexModel, MongoClient, ReplaceOne
+from pymongo.collection import Collection
 from rich import print as rich_print
 from rich.console import Console
 
+from src.config.configuration import get_mongo_uri
+from src.database.client_pool import (
+    DEFAULT_MAX_POOL_SIZE,
+    DEFAULT_TIMEOUT_MS,
+    close_client,
+    get_client,
+)
+from src.helpers.utilities import batched
+from src.metrics.recorder import MetricsRecorder
 from src.models.schedules import Schedule
+from src.sinks.sink import DEFAULT_BATCH_SIZE, Sink
 
+# Constants
+SCHEDULE_INDEXES = [IndexModel([("Round", ASCENDING)], name="round", unique=True)]
+UNIFIED_DATABASE = "Lyzer"
+UNIFIED_SCHEDULES = "Schedules"
+UNIFIED_SCHEDULE_INDEXES = [
+    IndexModel(
+        [("Season", ASCENDING), ("Round", ASCENDING)], name="season_round", unique=True
+    ),
+    IndexModel([("Race", ASCENDING)], name="race"),
+]
+DATASET_INDEXES = {
+    "Results": [
+        IndexModel(
+            [("Round", ASCENDING), ("Driver.DriverId", ASCENDING)], name="round_driver"
+        )
+    ],
+    "Qualifying": [
+        IndexModel(
+            [("Round", ASCENDING), ("Driver.DriverId", ASCENDING)], name="round_driver"
+        )
+    ],
+    "PitStops": [
+        IndexModel(
+            [("Round", ASCENDING), ("DriverId", ASCENDING), ("Stop", ASCENDING)],
+            name="round_driver_stop",
+        )
+    ],
+    "LapTimes": [
+        IndexModel(
+            [("Round", ASCENDING), ("DriverId", ASCENDING), ("Lap", ASCENDING)],
+            name="round_driver_lap",
+        )
+    ],
+}
+# Shared drives of the 1950s give a driver several results in one race
+DATASET_KEYS = {
+    "Results": ("Driver.DriverId", "Position"),
+    "Qualifying": ("Driver.DriverId",),
+    "PitStops": ("DriverId", "Stop"),
+    "LapTimes": ("DriverId", "Lap"),
+}
 
-class MongoService:
+ensured_indexes: set[tuple] = set()
+ensured_indexes_lock = Lock()
+
+
+class MongoService(Sink):
     """
     This class is responsible for all interactions with the MongoDB database.
 
+    The MongoDB client is shared with every other service using the same connection
+    string and is only created the first time it is used. It is the default sink of the
+    load commands.
+
     Attributes:
-        client (MongoClient): The MongoDB client.
-        db (Database): The MongoDB database.
-        collection (Collection): The MongoDB collection.
+        connection_string (str | None): The MongoDB connection string.
+        max_pool_size (int): The maximum number of connections in the client's pool.
+        timeout_ms (int): The connect and server selection timeout in milliseconds.
+        raw_bson (bool): Encode streamed documents to BSON a batch at a time.
+        metrics (MetricsRecorder): The recorder of stage timings and counters.
+        client (MongoClient): The shared MongoDB client.
 
     Methods:
         test_connection: Test the validity of the connection string given by the user.
+        replace_collection: Replace a collection with a stream of documents.
+        insert_schedules: Replace all schedules for a year in the database.
+        upsert_schedules: Write only the schedules that changed for a year to the database.
+        insert_dataset: Replace a season of a dataset in the database.
+        replace_round: Replace a single round of a dataset in the database.
+        timed_batches: Split documents into batches, timing how long each takes to encode.
+        ensure_indexes: Create the indexes of a collection once per process.
+        upsert_documents: Write only the documents that changed within a scope.
+        upsert_unified_schedules: Write the schedules for a year to the unified layout.
+        find_schedules: Find schedules across seasons by the start of their race.
+        iter_season: Stream the documents of a season of a dataset.
+        seasons: Get the loaded seasons of a dataset.
     """
 
-    def __init__(self) -> None:
+    def __init__(
+        self,
+        connection_string: str | None = None,
+        max_pool_size: int = DEFAULT_MAX_POOL_SIZE,
+        timeout_ms: int = DEFAULT_TIMEOUT_MS,
+        raw_bson: bool = True,
+        metrics: MetricsRecorder | None = None,
+    ) -> None:
         """
         Construct the MongoService class.
 
-        This will create the MongoDB client, database, and collection.
+        This does not connect to the database, the client is created on first use.
+
+        Args:
+            connection_string (str, optional): The MongoDB connection string.
+                Defaults to None, which uses the configured connection string.
+            max_pool_size (int, optional): The maximum number of connections in the
+                client's pool. Defaults to DEFAULT_MAX_POOL_SIZE.
+            timeout_ms (int, optional): The connect and server selection timeout in
+                milliseconds. Defaults to DEFAULT_TIMEOUT_MS.
+            raw_bson (bool, optional): Encode streamed documents to BSON a batch at a
+                time. Defaults to True.
+            metrics (MetricsRecorder, optional): The recorder of stage timings and
+                counters. Defaults to None, which records into a private recorder.
         """
-        connection_string = environ["mongoUri"]
+        self.connection_string = connection_string
+        self.max_pool_size = max_pool_size
+        self.timeout_ms = timeout_ms
+        self.raw_bson = raw_bson
+        super().__init__(metrics)
         self.console = Console()
-        self.client = MongoClient(connection_string)
 
-    def test_connection(self, connection_uri: str) -> bool:
+    @property
+    def client(self) -> MongoClient:
+        """Get the shared MongoDB client, creating it on first use."""
+        if self.connection_string is None:
+            self.connection_string = get_mongo_uri()
+        return get_client(self.connection_string, self.max_pool_size, self.timeout_ms)
+
+    def test_connection(self, connection_uri: str | None = None) -> bool:
         """
         Tests validity of connection uri given by user.
 
+        A client that fails the test is closed, so it is not reused.
+
         Args:
-            connection_string (str): Mongo uri given by user.
+            connection_uri (str, optional): Mongo uri given by user.
+                Defaults to None, which tests the service's own connection string.
 
         Returns:
             bool: True if valid connection string.
         """
+        connection_uri = connection_uri or self.connection_string or get_mongo_uri()
         status = self.console.status("[bold green]Testing connection...")
         status.start()
         try:
-            client = MongoClient(connection_uri)
+            client = get_client(connection_uri, self.max_pool_size, self.timeout_ms)
             client.admin.command("ping")
             status.stop()
             rich_print("\n[green]Ping successful.[/green]")
             rich_print("[green]Connection string entered is valid.[/green]")
         except Exception as error:
             status.stop()
+            close_client(connection_uri)
             rich_print("\n[red]Ping unsuccessful.[/red]")
             rich_print("[red]Connection string entered might be invalid.[/red]")
             rich_print("[red]Please see error below.[/red]")
@@ -65,10 +181,66 @@ class MongoService:
 
         return True
 
+    def replace_collection(
+        self,
+        database_name: str,
+        collection_name: str,
+        documents: Iterable[dict],
+        indexes: list[IndexModel],
+        batch_size: int = DEFAULT_BATCH_SIZE,
+        written: Callable[[int], None] | None = None,
+    ) -> int:
+        """
+        Replace a collection with a stream of documents.
+
+        The documents are written in batches to a staging collection with its indexes
+        already built, which is then renamed over the existing collection, so readers
+        never see an empty or partial collection. Only one batch is held at a time.
+
+        With raw BSON enabled every batch is encoded as soon as it is complete and its
+        dicts are released, so the batch is sent as compact BSON bytes. pymongo sends
+        raw documents as they are, without encoding them again or adding an _id,
+        the server assigns the _id instead.
+
+        Args:
+            database_name (str): The name of the database.
+            collection_name (str): The name of the collection to replace.
+            documents (Iterable[dict]): The documents to write.
+            indexes (list[IndexModel]): The indexes of the collection.
+            batch_size (int, optional): The number of documents per insert.
+                Defaults to DEFAULT_BATCH_SIZE.
+            written (Callable, optional): Called with the number of documents of every
+                batch once it is inserted into the staging collection. Defaults to None.
+
+        Returns:
+            int: The number of documents written.
+        """
+        database = self.client[database_name]
+        staging = database.create_collection(f"{collection_name}.staging.{uuid4().hex}")
+        count = 0
+
+        try:
+            staging.create_indexes(indexes)
+            for batch in self.timed_batches(documents, batch_size):
+                with self.metrics.stage("write"):
+                    staging.insert_many(batch, ordered=False)
+                count += len(batch)
+                if written:
+                    written(len(batch))
+            with self.metrics.stage("write.swap"):
+                staging.rename(collection_name, dropTarget=True)
+        except BaseException:
+            staging.drop()
+            raise
+
+        return count
+
     def insert_schedules(self, year: int, schedules: list[Schedule]):
         """
         Insert schedules into the database.
 
+        This replaces every schedule for the year through a staging collection.
+
         Args:
             year (int): The year to insert schedules for.
             schedules (list[Schedule]): The schedules to insert.
@@ -76,8 +248,432 @@ class MongoService:
         Returns:
             None
         """
-        database = self.client["Schedules"]
-        collection = database[str(year)]
-        collection.drop()
-        schedules = [schedule.model_dump() for schedule in schedules]
-        collection.insert_many(schedules)
+        documents = (schedule_document(year, schedule) for schedule in schedules)
+        self.replace_collection("Schedules", str(year), documents, SCHEDULE_INDEXES)
+
+    def upsert_schedules(self, year: int, schedules: list[Schedule]) -> dict:
+        """
+        Write only the schedules that changed for a year to the database.
+
+        Schedules are keyed on their season and round, the season being the collection.
+        Every document stores a hash of its content, schedules whose hash has not changed
+        are skipped and rounds that are no longer in the schedule are deleted.
+        The remaining writes are sent as a single unordered bulk write.
+
+        Args:
+            year (int): The year to upsert schedules for.
+            schedules (list[Schedule]): The schedules to upsert.
+
+        Returns:
+            dict: The number of inserted, updated, deleted and unchanged schedules.
+        """
+        collection = self.client["Schedules"][str(year)]
+        self.ensure_indexes(collection, SCHEDULE_INDEXES)
+        with self.metrics.stage("dump"):
+            documents = [schedule_document(year, schedule) for schedule in schedules]
+        return self.upsert_documents(collection, documents, "Round")
+
+    def insert_dataset(
+        self,
+        dataset: str,
+        year: int,
+        documents: Iterable[dict],
+        batch_size: int = DEFAULT_BATCH_SIZE,
+        written: Callable[[int], None] | None = None,
+    ) -> int:
+        """
+        Replace a season of a dataset in the database.
+
+        Every dataset has its own database with a collection per season, the season is
+        replaced through a staging collection while the documents are streamed in.
+
+        Args:
+            dataset (str): The name of the dataset, one of DATASET_INDEXES.
+            year (int): The year of the season.
+            documents (Iterable[dict]): The documents of the season.
+            batch_size (int, optional): The number of documents per insert.
+                Defaults to DEFAULT_BATCH_SIZE.
+            written (Callable, optional): Called with the number of documents of every
+                batch once it is written. Defaults to None.
+
+        Returns:
+            int: The number of documents written.
+        """
+        return self.replace_collection(
+            dataset, str(year), documents, DATASET_INDEXES[dataset], batch_size, written
+        )
+
+    def replace_round(
+        self,
+        dataset: str,
+        year: int,
+        round: int,
+        documents: list[dict],
+        batch_size: int = DEFAULT_BATCH_SIZE,
+    ) -> int:
+        """
+        Replace a single round of a dataset in the database.
+
+        Raw BSON documents, which the bulk pipeline hands over when it validates on a
+        process pool, are decoded first, so they are keyed and hashed exactly like the
+        documents validated on threads.
+
+        The round is upserted in place, keyed on the fields of DATASET_KEYS within the
+        round, so readers never see it empty or half written. Documents whose content
+        did not change are skipped and documents no longer in the round are deleted,
+        the other rounds of the season are left as they are.
+
+        Args:
+            dataset (str): The name of the dataset, one of DATASET_INDEXES.
+            year (int): The year of the season.
+            round (int): The round.
+            documents (list[dict]): The documents of the round.
+            batch_size (int, optional): Unused, the writes are sent as a single bulk
+                write which the driver splits as needed. Defaults to DEFAULT_BATCH_SIZE.
+
+        Returns:
+            int: The number of documents in the round.
+        """
+        collection = self.client[dataset][str(year)]
+        self.ensure_indexes(collection, DATASET_INDEXES[dataset])
+        with self.metrics.stage("dump"):
+            documents = [plain_document(document) for document in documents]
+            for document in documents:
+                document["ContentHash"] = hash_document(document)
+        self.upsert_documents(
+            collection, documents, DATASET_KEYS[dataset], {"Round": str(round)}
+        )
+        return len(documents)
+
+    def timed_batches(self, documents: Iterable, batch_size: int) -> Iterator[list]:
+        """
+        Split documents into batches, timing how long every batch takes to encode.
+
+        Every batch is materialized before it is timed, so producing the documents,
+        which may fetch and validate them, is left out. With raw BSON enabled the batch
+        is then encoded, which is recorded as the dump stage.
+
+        Args:
+            documents (Iterable): The documents to split.
+            batch_size (int): The number of documents per batch.
+
+        Yields:
+            list: The next batch.
+        """
+        for batch in batched(documents, batch_size):
+            if self.raw_bson:
+                with self.metrics.stage("dump"):
+                    batch = [encode_document(document) for document in batch]
+            yield batch
+
+    def ensure_indexes(self, collection: Collection, indexes: list[IndexModel]) -> None:
+        """
+        Create the indexes of a collection once per process.
+
+        Creating an index that already exists is a no-op on the server, this only saves
+        the round trip when the same collection is written to again.
+
+        Args:
+            collection (Collection): The collection to index.
+            indexes (list[IndexModel]): The indexes of the collection.
+        """
+        key = (
+            self.connection_string,
+            collection.full_name,
+            tuple(index.document["name"] for index in indexes),
+        )
+        with ensured_indexes_lock:
+            if key in ensured_indexes:
+                return
+
+        collection.create_indexes(indexes)
+        with ensured_indexes_lock:
+            ensured_indexes.add(key)
+
+    def upsert_documents(
+        self,
+        collection: Collection,
+        documents: list[dict],
+        key: str | tuple[str, ...],
+        scope: dict | None = None,
+        force: bool = False,
+    ) -> dict:
+        """
+        Write only the documents that changed within a scope.
+
+        Every document stores a hash of its content, documents whose hash has not changed
+        are skipped and documents in the scope that are no longer given are deleted.
+        The remaining writes are sent as a single unordered bulk write.
+
+        Args:
+            collection (Collection): The collection to write to.
+            documents (list[dict]): Every document in the scope, with a ContentHash.
+            key (str | tuple[str, ...]): The field, or fields, that identify a document
+                within the scope. Nested fields are given in dot notation.
+            scope (dict, optional): The filter selecting the documents that are replaced.
+                Defaults to None, which is the whole collection.
+            force (bool, optional): Replace every document, even if it did not change.
+                Defaults to False.
+
+        Returns:
+            dict: The number of inserted, updated, deleted and unchanged documents.
+        """
+        scope = scope or {}
+        fields = (key,) if isinstance(key, str) else key
+        with self.metrics.stage("read.hashes"):
+            existing = {
+                key_values(document, fields): (
+                    document["_id"],
+                    document.get("ContentHash"),
+                )
+                for document in collection.find(
+                    scope, {"_id": 1, "ContentHash": 1, **dict.fromkeys(fields, 1)}
+                )
+            }
+
+        operations = []
+        unchanged = 0
+        keys = set()
+
+        for document in documents:
+            values = key_values(document, fields)
+            keys.add(values)
+
+            if (
+                not force
+                and values in existing
+                and existing[values][1] == document["ContentHash"]
+            ):
+                unchanged += 1
+                continue
+
+            operations.append(
+                ReplaceOne(
+                    {**scope, **dict(zip(fields, values))}, document, upsert=True
+                )
+            )
+
+        removed_ids = [existing[values][0] for values in set(existing) - keys]
+        if removed_ids:
+            operations.append(DeleteMany({"_id": {"$in": removed_ids}}))
+
+        summary = {"inserted": 0, "updated": 0, "deleted": 0, "unchanged": unchanged}
+        if operations:
+            with self.metrics.stage("write"):
+                result = collection.bulk_write(operations, ordered=False)
+            summary["inserted"] = result.upserted_count
+            summary["updated"] = result.modified_count
+            summary["deleted"] = result.deleted_count
+
+        return summary
+
+    def upsert_unified_schedules(
+        self, year: int, schedules: list[Schedule], force: bool = False
+    ) -> dict:
+        """
+        Write the schedules for a year to the unified layout.
+
+        The unified layout keeps every season in one collection, with numeric seasons
+        and rounds and a UTC datetime for every session, indexed on the season and round
+        and on the start of the race.
+
+        Args:
+            year (int): The year to write schedules for.
+            schedules (list[Schedule]): The schedules of the year.
+            force (bool, optional): Replace every schedule, even if it did not change.
+                Defaults to False.
+
+        Returns:
+            dict: The number of inserted, updated, deleted and unchanged schedules.
+        """
+        collection = self.client[UNIFIED_DATABASE][UNIFIED_SCHEDULES]
+        self.ensure_indexes(collection, UNIFIED_SCHEDULE_INDEXES)
+        with self.metrics.stage("dump"):
+            documents = [
+                unified_schedule_document(year, schedule) for schedule in schedules
+            ]
+        return self.upsert_documents(
+            collection, documents, "Round", {"Season": year}, force
+        )
+
+    def find_schedules(
+        self, start: datetime | None = None, end: datetime | None = None
+    ) -> list[dict]:
+        """
+        Find schedules across seasons by the start of their race.
+
+        This is a single lookup on the race index of the unified layout.
+
+        Args:
+            start (datetime, optional): The earliest start of the race. Defaults to None.
+            end (datetime, optional): The latest start of the race. Defaults to None.
+
+        Returns:
+            list[dict]: The matching schedules, ordered by the start of their race.
+        """
+        race = {}
+        if start is not None:
+            race["$gte"] = start
+        if end is not None:
+            race["$lte"] = end
+
+        collection = self.client[UNIFIED_DATABASE][UNIFIED_SCHEDULES]
+        query = {"Race": race} if race else {}
+        return list(
+            collection.find(query, {"_id": 0, "ContentHash": 0}).sort("Race", ASCENDING)
+        )
+
+    def iter_season(
+        self, database: str, year: int, batch_size: int = DEFAULT_BATCH_SIZE
+    ) -> Iterator[dict]:
+        """
+        Stream the documents of a season of a dataset.
+
+        Args:
+            database (str): The name of the database, "Schedules" or one of
+                DATASET_INDEXES.
+            year (int): The year of the season.
+            batch_size (int, optional): The number of documents per round trip.
+                Defaults to DEFAULT_BATCH_SIZE.
+
+        Yields:
+            dict: The next document, without its id and content hash.
+        """
+        collection = self.client[database][str(year)]
+        yield from collection.find(
+            {}, {"_id": 0, "ContentHash": 0}, batch_size=batch_size
+        )
+
+    def seasons(self, database: str) -> list[int]:
+        """
+        Get the loaded seasons of a dataset.
+
+        Args:
+            database (str): The name of the database, "Schedules" or one of
+                DATASET_INDEXES.
+
+        Returns:
+            list[int]: The seasons with a collection, in order.
+        """
+        return sorted(
+            int(name)
+            for name in self.client[database].list_collection_names()
+            if name.isdigit()
+        )
+
+
+def encode_document(document: dict | RawBSONDocument) -> RawBSONDocument:
+    """
+    Encode a document to BSON.
+
+    Args:
+        document (dict | RawBSONDocument): The document to encode, documents that are
+            already encoded are returned as they are.
+
+    Returns:
+        RawBSONDocument: The encoded document, which pymongo sends without encoding again.
+    """
+    if isinstance(document, RawBSONDocument):
+        return document
+    return RawBSONDocument(encode(document))
+
+
+def schedule_document(year: int, schedule: Schedule) -> dict:
+    """
+    Build the database document for a schedule.
+
+    Args:
+        year (int): The year of the schedule.
+        schedule (Schedule): The schedule.
+
+    Returns:
+        dict: The schedule with its season and content hash.
+    """
+    document = schedule.model_dump()
+    document["Season"] = str(year)
+    document["ContentHash"] = hash_document(document)
+    return document
+
+
+def unified_schedule_document(year: int, schedule: Schedule) -> dict:
+    """
+    Build the unified layout document for a schedule.
+
+    Args:
+        year (int): The year of the schedule.
+        schedule (Schedule): The schedule.
+
+    Returns:
+        dict: The typed schedule with its content hash.
+    """
+    document = schedule.typed_document(year)
+    document["ContentHash"] = hash_document(document)
+    return document
+
+
+def key_values(document: Mapping, fields: tuple[str, ...]) -> tuple:
+    """
+    Get the values of the fields that identify a document.
+
+    Args:
+        document (Mapping): The document, a dict or a raw BSON document.
+        fields (tuple[str, ...]): The fields, nested fields in dot notation.
+
+    Returns:
+        tuple: The value of every field, None for fields the document does not have.
+    """
+    values = []
+    for field in fields:
+        value = document
+        for part in field.split("."):
+            value = value.get(part) if isinstance(value, Mapping) else None
+        values.append(value)
+    return tuple(values)
+
+
+def plain_document(document: Mapping) -> dict:
+    """
+    Convert a document to plain dicts and lists.
+
+    Args:
+        document (Mapping): The document, raw BSON documents are decoded, nested ones
+            included.
+
+    Returns:
+        dict: A copy of the document, safe to change.
+    """
+    if isinstance(document, RawBSONDocument):
+        return decode(document.raw)
+    return {key: plain_value(value) for key, value in document.items()}
+
+
+def plain_value(value: object) -> object:
+    """
+    Convert a value of a document to plain dicts and lists.
+
+    Args:
+        value (object): The value.
+
+    Returns:
+        object: The value, with every mapping in it converted by plain_document.
+    """
+    if isinstance(value, Mapping):
+        return plain_document(value)
+    if isinstance(value, list):
+        return [plain_value(item) for item in value]
+    return value
+
+
+def hash_document(document: Mapping) -> str:
+    """
+    Hash the content of a document.
+
+    Args:
+        document (Mapping): The document to hash, a raw BSON document hashes the same
+            as the dict it decodes to.
+
+    Returns:
+        str: The SHA-256 hex digest of the document, independent of key order.
+    """
+    content = json.dumps(plain_document(document), sort_keys=True, default=str)
+    return hashlib.sha256(content.encode("UTF-8")).hexdigest()
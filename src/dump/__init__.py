@@ -0,0 +1,6 @@
+"""
+Folder for the database dump related files.
+
+Modules:
+    ergast_dump: The reader of the CSV dump archives Ergast publishes.
+"""
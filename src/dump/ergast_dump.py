@@ -0,0 +1,387 @@
+"""
+This module contains the ErgastDump class.
+
+The ErgastDump class is responsible for reading the CSV dump archives Ergast publishes,
+streaming their tables straight out of the archive into the same models the Ergast API
+responses are validated into.
+
+Functions:
+    optional: Drop the empty values of a mapping.
+    with_zone: Mark a time of day as UTC, the way the Ergast API gives it.
+"""
+
+# Standard Library Imports
+import csv
+import io
+import os
+import zipfile
+from collections.abc import Iterator
+from functools import cached_property
+from itertools import groupby
+
+# Third Party Imports
+from pydantic import BaseModel
+
+# Local Imports
+from src.models.lap_times import RaceLaps
+from src.models.pit_stops import RacePitStops
+from src.models.qualifying import RaceQualifying
+from src.models.results import RaceResults
+from src.models.schedules import Schedule
+
+# Constants
+NULL = "\\N"
+SESSION_COLUMNS = {
+    "FirstPractice": "fp1",
+    "SecondPractice": "fp2",
+    "ThirdPractice": "fp3",
+    "Qualifying": "quali",
+    "Sprint": "sprint",
+}
+DUMP_TABLES = {
+    "results": ("results", "Results", RaceResults),
+    "qualifying": ("qualifying", "QualifyingResults", RaceQualifying),
+    "pitstops": ("pit_stops", "PitStops", RacePitStops),
+    "laps": ("lap_times", "Laps", RaceLaps),
+}
+
+
+class ErgastDump:
+    """
+    This class is responsible for reading an Ergast CSV dump archive.
+
+    Tables are read straight out of the zip archive a row at a time, nothing is
+    extracted to disk. The small tables, races, drivers, constructors and statuses,
+    are kept in memory to resolve the ids of the large ones, which are streamed a
+    race at a time. The large tables are grouped by race, as Ergast publishes them.
+
+    Attributes:
+        path (str): The path of the archive.
+        archive (ZipFile): The open archive.
+        members (dict): The archive member of every table, keyed by file name.
+        races (dict): The season, round and name of every race, keyed by race id.
+        drivers (dict): The driver of every driver id, as the API gives it.
+        constructors (dict): The constructor of every constructor id, as the API gives it.
+        statuses (dict): The finishing status of every status id.
+
+    Methods:
+        close: Close the archive.
+        rows: Stream the rows of a table.
+        schedules: Read the schedules of every season.
+        check_grouped: Check that the rows of every race of a table are together.
+        iter_rounds: Stream the races of a dataset a round at a time.
+        race_items: Convert the rows of a race into the items of an API response.
+    """
+
+    def __init__(self, path: str) -> None:
+        """
+        Construct the ErgastDump class.
+
+        Args:
+            path (str): The path of the archive.
+
+        Raises:
+            ValueError: If the file is not a zip archive.
+        """
+        if not zipfile.is_zipfile(path):
+            raise ValueError(f"{path} is not a zip archive of Ergast CSV files.")
+
+        self.path = path
+        self.archive = zipfile.ZipFile(path)
+        self.members = {
+            os.path.basename(name): name
+            for name in self.archive.namelist()
+            if name.endswith(".csv")
+        }
+
+    def __enter__(self) -> "ErgastDump":
+        """Enter the context manager."""
+        return self
+
+    def __exit__(self, *args: object) -> None:
+        """Exit the context manager, closing the archive."""
+        self.close()
+
+    def close(self) -> None:
+        """Close the archive."""
+        self.archive.close()
+
+    def rows(self, table: str) -> Iterator[dict]:
+        """
+        Stream the rows of a table.
+
+        Args:
+            table (str): The name of the table, for example "lap_times".
+
+        Yields:
+            dict: The next row, with empty and null values as None.
+
+        Raises:
+            ValueError: If the archive has no file for the table.
+        """
+        member = self.members.get(f"{table}.csv")
+        if member is None:
+            raise ValueError(f"{self.path} has no {table}.csv.")
+
+        with self.archive.open(member) as raw_file:
+            text_file = io.TextIOWrapper(raw_file, encoding="UTF-8", newline="")
+            for row in csv.DictReader(text_file):
+                yield {
+                    column: None if value in (NULL, "") else value
+                    for column, value in row.items()
+                }
+
+    @cached_property
+    def races(self) -> dict:
+        """Get the season, round and name of every race, keyed by race id."""
+        return {
+            row["raceId"]: (int(row["year"]), int(row["round"]), row["name"])
+            for row in self.rows("races")
+        }
+
+    @cached_property
+    def drivers(self) -> dict:
+        """Get the driver of every driver id, as the API gives it."""
+        return {
+            row["driverId"]: optional(
+                {
+                    "driverId": row["driverRef"],
+                    "permanentNumber": row["number"],
+                    "code": row["code"],
+                    "givenName": row["forename"],
+                    "familyName": row["surname"],
+                    "dateOfBirth": row["dob"],
+                    "nationality": row["nationality"],
+                }
+            )
+            for row in self.rows("drivers")
+        }
+
+    @cached_property
+    def constructors(self) -> dict:
+        """Get the constructor of every constructor id, as the API gives it."""
+        return {
+            row["constructorId"]: optional(
+                {
+                    "constructorId": row["constructorRef"],
+                    "name": row["name"],
+                    "nationality": row["nationality"],
+                }
+            )
+            for row in self.rows("constructors")
+        }
+
+    @cached_property
+    def statuses(self) -> dict:
+        """Get the finishing status of every status id."""
+        return {row["statusId"]: row["status"] for row in self.rows("status")}
+
+    def schedules(self) -> dict[int, list[Schedule]]:
+        """
+        Read the schedules of every season.
+
+        Returns:
+            dict[int, list[Schedule]]: The schedules of every season, ordered by round.
+        """
+        schedules = {}
+        for row in self.rows("races"):
+            schedule = {
+                "season": row["year"],
+                "round": row["round"],
+                "raceName": row["name"],
+                "date": row["date"],
+                "time": with_zone(row["time"]),
+            }
+            for name, prefix in SESSION_COLUMNS.items():
+                # Older dumps have no session columns at all
+                if row.get(f"{prefix}_date"):
+                    schedule[name] = optional(
+                        {
+                            "date": row[f"{prefix}_date"],
+                            "time": with_zone(row.get(f"{prefix}_time")),
+                        }
+                    )
+            schedules.setdefault(int(row["year"]), []).append(
+                Schedule.model_validate(optional(schedule))
+            )
+
+        for season_schedules in schedules.values():
+            season_schedules.sort(key=lambda schedule: int(schedule.Round))
+        return schedules
+
+    def check_grouped(self, table: str) -> None:
+        """
+        Check that the rows of every race of a table are together.
+
+        Only the race id of every row is read, so the table can be checked in full
+        before any of its races are written.
+
+        Args:
+            table (str): The name of the table, for example "lap_times".
+
+        Raises:
+            ValueError: If the rows of a race are not next to each other.
+        """
+        seen = set()
+        for race_id, _ in groupby(row["raceId"] for row in self.rows(table)):
+            if race_id in seen:
+                raise ValueError(
+                    f"The rows of race {race_id} in {table}.csv are split."
+                )
+            seen.add(race_id)
+
+    def iter_rounds(
+        self, endpoint: str, seasons: set[int] | None = None
+    ) -> Iterator[tuple[int, int, BaseModel]]:
+        """
+        Stream the races of a dataset a round at a time.
+
+        The table is checked with check_grouped before the first race is yielded, so a
+        dump with split races fails before anything is written.
+
+        Args:
+            endpoint (str): The Ergast endpoint of the dataset, one of DUMP_TABLES.
+            seasons (set[int], optional): The seasons to read. Defaults to None,
+                which reads every season.
+
+        Yields:
+            tuple[int, int, BaseModel]: The season, round and validated race, the same
+                model the endpoint's API responses hold.
+
+        Raises:
+            ValueError: If the rows of a race are not next to each other.
+        """
+        table, items, model = DUMP_TABLES[endpoint]
+        self.check_grouped(table)
+        for race_id, race_rows in groupby(self.rows(table), lambda row: row["raceId"]):
+            season, round, name = self.races[race_id]
+            if seasons is not None and season not in seasons:
+                continue
+
+            race = {
+                "season": str(season),
+                "round": str(round),
+                "raceName": name,
+                items: self.race_items(endpoint, race_rows),
+            }
+            yield season, round, model.model_validate(race)
+
+    def race_items(self, endpoint: str, race_rows: Iterator[dict]) -> list[dict]:
+        """
+        Convert the rows of a race into the items of an API response.
+
+        Args:
+            endpoint (str): The Ergast endpoint of the dataset, one of DUMP_TABLES.
+            race_rows (Iterator[dict]): The rows of the race.
+
+        Returns:
+            list[dict]: The results, qualifying results, pit stops or laps of the race,
+                keyed by the API's field names.
+        """
+        if endpoint == "laps":
+            laps = {}
+            for row in race_rows:
+                laps.setdefault(int(row["lap"]), []).append(
+                    optional(
+                        {
+                            "driverId": self.drivers[row["driverId"]]["driverId"],
+                            "position": row["position"],
+                            "time": row["time"],
+                        }
+                    )
+                )
+            return [
+                {"number": str(lap), "Timings": timings}
+                for lap, timings in sorted(laps.items())
+            ]
+
+        if endpoint == "pitstops":
+            return [
+                optional(
+                    {
+                        "driverId": self.drivers[row["driverId"]]["driverId"],
+                        "lap": row["lap"],
+                        "stop": row["stop"],
+                        "time": row["time"],
+                        "duration": row["duration"],
+                    }
+                )
+                for row in race_rows
+            ]
+
+        items = []
+        for row in race_rows:
+            item = {
+                "number": row["number"],
+                "Driver": self.drivers[row["driverId"]],
+                "Constructor": self.constructors[row["constructorId"]],
+            }
+            if endpoint == "qualifying":
+                item.update(
+                    {
+                        "position": row["position"],
+                        "Q1": row["q1"],
+                        "Q2": row["q2"],
+                        "Q3": row["q3"],
+                    }
+                )
+            else:
+                item.update(
+                    {
+                        # The API's position is the classified order of every car
+                        "position": row["positionOrder"],
+                        "positionText": row["positionText"],
+                        "points": row["points"],
+                        "grid": row["grid"],
+                        "laps": row["laps"],
+                        "status": self.statuses.get(row["statusId"]),
+                    }
+                )
+                if row["time"]:
+                    item["Time"] = optional(
+                        {"millis": row["milliseconds"], "time": row["time"]}
+                    )
+                if row["fastestLap"]:
+                    item["FastestLap"] = optional(
+                        {
+                            "rank": row["rank"],
+                            "lap": row["fastestLap"],
+                            "Time": optional({"time": row["fastestLapTime"]}) or None,
+                            "AverageSpeed": {
+                                "units": "kph",
+                                "speed": row["fastestLapSpeed"],
+                            }
+                            if row["fastestLapSpeed"]
+                            else None,
+                        }
+                    )
+            items.append(optional(item))
+        return items
+
+
+def optional(mapping: dict) -> dict:
+    """
+    Drop the empty values of a mapping.
+
+    The Ergast API leaves out the fields it has no value for, so the models default them.
+
+    Args:
+        mapping (dict): The mapping.
+
+    Returns:
+        dict: The mapping without its None values.
+    """
+    return {key: value for key, value in mapping.items() if value is not None}
+
+
+def with_zone(time: str | None) -> str | None:
+    """
+    Mark a time of day as UTC, the way the Ergast API gives it.
+
+    Args:
+        time (str | None): The time of day, for example "15:00:00".
+
+    Returns:
+        str | None: The time with a trailing Z, for example "15:00:00Z".
+    """
+    return f"{time}Z" if time else None
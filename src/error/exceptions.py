@@ -3,6 +3,7 @@ Contains all custom exceptions for the project.
 
 Classes:
     GithubRequestError: Raised when a request to the Github API fails.
+    ChecksumError: Raised when a download does not match its published checksum.
 """
 
 
@@ -18,3 +19,21 @@ class GithubRequestError(Exception):
         """Construct the GithubRequestError class."""
         self.status_code = status_code
         super().__init__(*args)
+
+
+class ChecksumError(Exception):
+    """
+    Raised when a download does not match its published checksum.
+
+    Attributes:
+        expected (str): The published checksum.
+        actual (str): The checksum of the download.
+    """
+
+    def __init__(self, expected: str, actual: str, *args: object) -> None:
+        """Construct the ChecksumError class."""
+        self.expected = expected
+        self.actual = actual
+        super().__init__(
+            f"Checksum mismatch, expected {expected} but got {actual}.", *args
+        )
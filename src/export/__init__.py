@@ -0,0 +1,6 @@
+"""
+Folder for the columnar export related files.
+
+Modules:
+    parquet_exporter: The writer of datasets to season partitioned Parquet files.
+"""
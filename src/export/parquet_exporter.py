@@ -0,0 +1,290 @@
+"""
+This module contains the ParquetExporter class.
+
+The ParquetExporter class is responsible for writing datasets to Parquet files with
+typed columns, partitioned by season, so analytics can read them without MongoDB.
+
+Functions:
+    arrow_type: Get the Arrow type of a pydantic field annotation.
+    arrow_fields: Get the Arrow fields of a pydantic model.
+    dataset_schema: Get the Arrow schema of a dataset.
+    cast_numbers: Convert the numeric strings of a document to numbers.
+"""
+
+# Standard Library Imports
+import os
+import types
+from collections.abc import Iterable
+from datetime import datetime
+from typing import Union, get_args, get_origin
+
+# Third Party Imports
+from pydantic import BaseModel
+
+# Local Imports
+from src.helpers.utilities import batched
+from src.models.lap_times import Timing
+from src.models.pit_stops import PitStop
+from src.models.qualifying import QualifyingResult
+from src.models.results import Result
+from src.models.schedules import SESSIONS
+
+# pyarrow is optional, it is only needed to export
+try:
+    import pyarrow
+    import pyarrow.parquet
+except ImportError:
+    pyarrow = None
+
+# Constants
+DEFAULT_CHUNK_SIZE = 10000
+PARTITION_COLUMN = "Season"
+ROW_MODELS = {
+    "Results": Result,
+    "Qualifying": QualifyingResult,
+    "PitStops": PitStop,
+    "LapTimes": Timing,
+}
+# Ergast sends every number as a string, these fields are exported as numbers
+NUMERIC_FIELDS = {
+    "Number": int,
+    "PermanentNumber": int,
+    "Position": int,
+    "Points": float,
+    "Grid": int,
+    "Laps": int,
+    "Lap": int,
+    "Stop": int,
+    "Rank": int,
+    "Millis": int,
+    "Speed": float,
+}
+
+
+class ParquetExporter:
+    """
+    This class is responsible for writing datasets to Parquet files.
+
+    Every season of a dataset is written to its own file in a hive style partition,
+    <output>/<dataset>/Season=<season>/part-0.parquet, so readers filtering on the
+    season only open the files they need. Documents are written in row groups of
+    chunk_size rows, only one of which is held in memory at a time.
+
+    Attributes:
+        output (str): The directory to export to.
+        chunk_size (int): The number of rows in every row group.
+        compression (str): The compression codec of the files.
+
+    Methods:
+        season_path: Get the path of the file of a season of a dataset.
+        export_season: Write a season of a dataset to its file.
+    """
+
+    def __init__(
+        self,
+        output: str,
+        chunk_size: int = DEFAULT_CHUNK_SIZE,
+        compression: str = "zstd",
+    ) -> None:
+        """
+        Construct the ParquetExporter class.
+
+        Args:
+            output (str): The directory to export to.
+            chunk_size (int, optional): The number of rows in every row group.
+                Defaults to DEFAULT_CHUNK_SIZE.
+            compression (str, optional): The compression codec of the files.
+                Defaults to "zstd".
+
+        Raises:
+            ImportError: If pyarrow is not installed.
+        """
+        if pyarrow is None:
+            raise ImportError("Exporting needs pyarrow, install it with pip.")
+
+        self.output = output
+        self.chunk_size = chunk_size
+        self.compression = compression
+
+    def season_path(self, dataset: str, season: int) -> str:
+        """
+        Get the path of the file of a season of a dataset.
+
+        Args:
+            dataset (str): The name of the dataset, for example "Results".
+            season (int): The season.
+
+        Returns:
+            str: The path of the file.
+        """
+        return os.path.join(
+            self.output, dataset, f"{PARTITION_COLUMN}={season}", "part-0.parquet"
+        )
+
+    def export_season(self, dataset: str, season: int, documents: Iterable) -> int:
+        """
+        Write a season of a dataset to its file.
+
+        The file is written next to its final path and moved into place once complete,
+        so readers never see a partial season. A season without documents is not
+        written and any earlier export of it is left as it was.
+
+        Args:
+            dataset (str): The name of the dataset, for example "Results".
+            season (int): The season.
+            documents (Iterable): The documents of the season, as loaded into MongoDB.
+
+        Returns:
+            int: The number of rows written.
+        """
+        schema = dataset_schema(dataset)
+        path = self.season_path(dataset, season)
+        temporary_path = f"{path}.tmp"
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+
+        rows = 0
+        writer = None
+        try:
+            for batch in batched(documents, self.chunk_size):
+                if writer is None:
+                    writer = pyarrow.parquet.ParquetWriter(
+                        temporary_path, schema, compression=self.compression
+                    )
+                # The season is in the partition path
+                records = [cast_numbers(document) for document in batch]
+                writer.write_batch(
+                    pyarrow.RecordBatch.from_pylist(records, schema=schema)
+                )
+                rows += len(records)
+        except BaseException:
+            if writer is not None:
+                writer.close()
+                os.remove(temporary_path)
+            raise
+
+        if writer is not None:
+            writer.close()
+            os.replace(temporary_path, path)
+        return rows
+
+
+def arrow_type(annotation: type) -> "pyarrow.DataType":
+    """
+    Get the Arrow type of a pydantic field annotation.
+
+    Args:
+        annotation (type): The annotation, optional fields are unwrapped, lists and
+            models become Arrow lists and structs.
+
+    Returns:
+        pyarrow.DataType: The Arrow type.
+
+    Raises:
+        TypeError: If the annotation has no Arrow type.
+    """
+    origin = get_origin(annotation)
+    if origin in (Union, types.UnionType):
+        (argument,) = set(get_args(annotation)) - {types.NoneType}
+        return arrow_type(argument)
+    if origin is list:
+        return pyarrow.list_(arrow_type(get_args(annotation)[0]))
+    if isinstance(annotation, type) and issubclass(annotation, BaseModel):
+        return pyarrow.struct(arrow_fields(annotation))
+
+    arrow_types = {
+        str: pyarrow.string(),
+        int: pyarrow.int64(),
+        float: pyarrow.float64(),
+        bool: pyarrow.bool_(),
+        datetime: pyarrow.timestamp("ms", tz="UTC"),
+    }
+    if annotation not in arrow_types:
+        raise TypeError(f"No Arrow type for {annotation}")
+    return arrow_types[annotation]
+
+
+def arrow_fields(model: type[BaseModel]) -> list["pyarrow.Field"]:
+    """
+    Get the Arrow fields of a pydantic model.
+
+    Args:
+        model (type[BaseModel]): The model.
+
+    Returns:
+        list[pyarrow.Field]: A field for every model field, named as it is dumped.
+            The fields of NUMERIC_FIELDS are numbers and nullable, so a value that is
+            not a number is exported as null.
+    """
+    fields = []
+    for name, field in model.model_fields.items():
+        if name in NUMERIC_FIELDS and arrow_type(field.annotation) == pyarrow.string():
+            fields.append(pyarrow.field(name, arrow_type(NUMERIC_FIELDS[name])))
+        else:
+            fields.append(
+                pyarrow.field(
+                    name, arrow_type(field.annotation), not field.is_required()
+                )
+            )
+    return fields
+
+
+def dataset_schema(dataset: str) -> "pyarrow.Schema":
+    """
+    Get the Arrow schema of a dataset.
+
+    Schedules have the typed layout of Schedule.typed_document, with a UTC timestamp
+    for the race and every session. The other datasets have the fields of their row
+    model after the round and race name, and lap times the lap number too. The season
+    is left out, it is the partition column.
+
+    Args:
+        dataset (str): The name of the dataset, for example "Results".
+
+    Returns:
+        pyarrow.Schema: The schema.
+    """
+    race = [
+        pyarrow.field("Round", pyarrow.int16(), False),
+        pyarrow.field("RaceName", pyarrow.string(), False),
+    ]
+    if dataset == "Schedules":
+        timestamp = pyarrow.timestamp("ms", tz="UTC")
+        return pyarrow.schema(
+            race
+            + [pyarrow.field("Race", timestamp, False)]
+            + [pyarrow.field(session, timestamp) for session in SESSIONS]
+        )
+
+    if dataset == "LapTimes":
+        race.append(pyarrow.field("Lap", pyarrow.int16(), False))
+    return pyarrow.schema(race + arrow_fields(ROW_MODELS[dataset]))
+
+
+def cast_numbers(document: dict) -> dict:
+    """
+    Convert the numeric strings of a document to numbers.
+
+    The round and the fields of NUMERIC_FIELDS are converted, in nested documents and
+    lists too. Values that are not numbers become None.
+
+    Args:
+        document (dict): The document, as loaded into MongoDB.
+
+    Returns:
+        dict: A copy of the document with numbers.
+    """
+    converted = {}
+    for name, value in document.items():
+        if isinstance(value, dict):
+            value = cast_numbers(value)
+        elif isinstance(value, list):
+            value = [
+                cast_numbers(item) if isinstance(item, dict) else item for item in value
+            ]
+        elif isinstance(value, str) and (name == "Round" or name in NUMERIC_FIELDS):
+            try:
+                value = NUMERIC_FIELDS.get(name, int)(value)
+            except ValueError:
+                value = None
+        converted[name] = value
+    return converted
@@ -3,4 +3,5 @@ Folder for helper files.
 
 Modules:
     utilities: The utilities file which contains helper or utility functions.
+    output: The printer of loaded rows as JSON or JSON Lines.
 """
@@ -0,0 +1,130 @@
+"""
+This module contains the OutputWriter class.
+
+The OutputWriter class is responsible for printing what a load wrote as JSON or JSON
+Lines, as each write succeeds, so nothing is rendered or held in memory for the whole
+load and nothing is printed that was not written.
+"""
+
+# Standard Library Imports
+import json
+import sys
+from collections import deque
+from collections.abc import Iterable, Iterator
+from typing import TextIO
+
+
+class OutputWriter:
+    """
+    This class is responsible for printing rows as JSON or JSON Lines.
+
+    JSON Lines prints a row per line. JSON prints a single array, opened before the
+    first row and closed when the writer is closed, so it can still be streamed. Any
+    other format prints nothing. It can be used as a context manager to close it when
+    done.
+
+    Rows that are still being written can be held while a sink consumes them and only
+    released once the batch they were written in succeeded, so a failed batch prints
+    none of its rows and only the rows of the batch being written are held.
+
+    Attributes:
+        output_format (str): The format, "json" or "jsonl", anything else prints nothing.
+        stream (TextIO): The stream to print to.
+        rows (int): The number of rows printed.
+        held (deque[dict]): The rows held until they are released, oldest first.
+
+    Methods:
+        write: Print a row.
+        flush: Flush the printed rows to the stream.
+        hold: Hold every row of an iterable as it is consumed.
+        release: Print the oldest held rows.
+        close: Finish the output.
+    """
+
+    def __init__(self, output_format: str, stream: TextIO | None = None) -> None:
+        """
+        Construct the OutputWriter class.
+
+        Args:
+            output_format (str): The format, "json" or "jsonl".
+            stream (TextIO, optional): The stream to print to.
+                Defaults to None, which prints to standard output.
+        """
+        self.output_format = output_format
+        self.stream = stream or sys.stdout
+        self.rows = 0
+        self.held = deque()
+
+    def __enter__(self) -> "OutputWriter":
+        """Enter the context manager."""
+        return self
+
+    def __exit__(self, *args: object) -> None:
+        """Exit the context manager, finishing the output."""
+        self.close()
+
+    @property
+    def enabled(self) -> bool:
+        """Determine if the writer prints anything."""
+        return self.output_format in ("json", "jsonl")
+
+    def write(self, row: dict) -> None:
+        """
+        Print a row.
+
+        Args:
+            row (dict): The row, values JSON cannot encode are printed as strings.
+        """
+        if not self.enabled:
+            return
+
+        line = json.dumps(row, separators=(",", ":"), default=str)
+        if self.output_format == "json":
+            line = ("[" if self.rows == 0 else ",") + line
+        self.stream.write(line + "\n")
+        self.rows += 1
+
+    def flush(self) -> None:
+        """Flush the printed rows to the stream."""
+        self.stream.flush()
+
+    def hold(self, rows: Iterable[dict]) -> Iterator[dict]:
+        """
+        Hold every row of an iterable as it is consumed.
+
+        Args:
+            rows (Iterable[dict]): The rows.
+
+        Yields:
+            dict: The next row, after it is held.
+        """
+        if not self.enabled:
+            yield from rows
+            return
+
+        for row in rows:
+            self.held.append(row)
+            yield row
+
+    def release(self, count: int | None = None) -> None:
+        """
+        Print the oldest held rows, once the write they were held for succeeded.
+
+        Rows are held in the order a sink consumes them, so after a sink wrote a batch
+        the oldest held rows are the rows of that batch.
+
+        Args:
+            count (int, optional): The number of rows to print.
+                Defaults to None, which prints every held row.
+        """
+        if count is None:
+            count = len(self.held)
+        for _ in range(min(count, len(self.held))):
+            self.write(self.held.popleft())
+        self.flush()
+
+    def close(self) -> None:
+        """Finish the output, closing the JSON array."""
+        if self.output_format == "json":
+            self.stream.write("]\n" if self.rows else "[]\n")
+        self.stream.flush()
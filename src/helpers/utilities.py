@@ -3,17 +3,24 @@ This module contains all utility functions for the Lyzer-ETL application.
 
 Functions:
     read_version_file: Read the version file.
-    update_now: Update the application.
+    validate_year: Validate a year.
+    resolve_years: Resolve the years to load from the given options.
+    batched: Split an iterable into lists of a fixed size.
+    generate_schedules_table: Generate a schedules table.
 """
 
 import os
 import sys
 
+from collections.abc import Iterable, Iterator
 from datetime import datetime
+from itertools import islice
+from typing import TYPE_CHECKING
 
-from rich.table import Table
+if TYPE_CHECKING:
+    from rich.table import Table
 
-from src.models.schedules import Schedule
+    from src.models.schedules import Schedule
 
 
 def read_version_file():
@@ -60,16 +67,87 @@ def validate_year(year: int, allow_future: bool = False):
         raise ValueError(f"Year must be between {min_year} and {max_year}.")
 
 
-def generate_schedules_table(schedules: list[Schedule]) -> Table:
+def resolve_years(
+    year: int | None = None,
+    from_year: int | None = None,
+    to_year: int | None = None,
+    years: list[int] | None = None,
+) -> list[int]:
+    """
+    Resolve the years to load from the given options.
+
+    A single year, an inclusive range and an explicit list can be combined,
+    the result will contain every year once, in ascending order.
+
+    Args:
+        year (int, optional): A single year. Defaults to None.
+        from_year (int, optional): The first year of a range. Defaults to None.
+        to_year (int, optional): The last year of a range. Defaults to None.
+        years (list[int], optional): An explicit list of years. Defaults to None.
+
+    Returns:
+        list[int]: The validated years, sorted in ascending order.
+
+    Raises:
+        ValueError: If only one end of the range is given, the range is reversed
+            or any of the years is invalid.
+    """
+    resolved = set(years or [])
+
+    if year is not None:
+        resolved.add(year)
+
+    if (from_year is None) != (to_year is None):
+        raise ValueError("Both --from and --to are required when loading a range.")
+
+    if from_year is not None and to_year is not None:
+        if from_year > to_year:
+            raise ValueError(
+                f"--from ({from_year}) must not be after --to ({to_year})."
+            )
+        resolved.update(range(from_year, to_year + 1))
+
+    for resolved_year in resolved:
+        validate_year(resolved_year, allow_future=True)
+
+    return sorted(resolved)
+
+
+def batched(iterable: Iterable, size: int) -> Iterator[list]:
+    """
+    Split an iterable into lists of a fixed size.
+
+    The iterable is consumed lazily, so only one batch is held in memory at a time.
+
+    Args:
+        iterable (Iterable): The iterable to split.
+        size (int): The size of every batch, the last batch may be smaller.
+
+    Yields:
+        list: The next batch.
+    """
+    iterator = iter(iterable)
+    while batch := list(islice(iterator, size)):
+        yield batch
+
+
+def generate_schedules_table(
+    schedules: list["Schedule"], title: str = "Schedules", max_rows: int | None = None
+) -> "Table":
     """
     Generate a schedules table.
 
     Args:
         schedules (list[Schedule]): List of schedules.
+        title (str, optional): The title of the table. Defaults to "Schedules".
+        max_rows (int, optional): The most schedules to show, the rest are counted in
+            the caption. Defaults to None, which shows every schedule.
 
     Returns:
         Table: A schedules table.
     """
+    from rich.table import Table
+
     headers = [
         "Round",
         "Race",
@@ -81,7 +159,17 @@ def generate_schedules_table(schedules: list[Schedule]) -> Table:
         "Sprint time",
     ]
 
-    table = Table(title="Schedules", show_header=True, header_style="bold magenta")
+    hidden = 0
+    if max_rows is not None and len(schedules) > max_rows:
+        hidden = len(schedules) - max_rows
+        schedules = schedules[:max_rows]
+
+    table = Table(
+        title=title,
+        caption=f"{hidden} more not shown" if hidden else None,
+        show_header=True,
+        header_style="bold magenta",
+    )
 
     for header in headers:
         table.add_column(header)
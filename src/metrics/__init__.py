@@ -0,0 +1,6 @@
+"""
+Folder for the load metrics related files.
+
+Modules:
+    recorder: The recorder of stage timings and counters for load runs.
+"""
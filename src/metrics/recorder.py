@@ -0,0 +1,195 @@
+"""
+This module contains the MetricsRecorder class.
+
+The MetricsRecorder class is responsible for recording how long every stage of a load
+takes and counting what happened along the way, such as bytes transferred, retries and
+cache hits, so a slow load can be traced to the network, validation or the database.
+"""
+
+# Standard Library Imports
+import json
+import os
+import time
+from collections.abc import Iterator
+from contextlib import contextmanager
+from threading import Lock
+from typing import TYPE_CHECKING
+
+if TYPE_CHECKING:
+    from rich.table import Table
+
+# Constants
+PROMETHEUS_PREFIX = "lyzer"
+
+
+class MetricsRecorder:
+    """
+    This class is responsible for recording stage timings and counters for a load.
+
+    Stages are timed with the stage context manager or recorded directly when the time
+    is already known, counters are incremented with count. It is safe to record from
+    multiple threads.
+
+    Attributes:
+        stages (dict): The number of calls, total and maximum seconds, keyed by stage.
+        counters (dict): The value of every counter, keyed by name.
+
+    Methods:
+        stage: Time a block of code as a stage.
+        record: Record a stage that took the given number of seconds.
+        count: Increment a counter.
+        summary_table: Build a table of every stage and counter.
+        to_dict: Get every stage and counter as a dict.
+        to_prometheus: Get every stage and counter in the Prometheus text format.
+        export: Write every stage and counter to a JSON or Prometheus textfile.
+    """
+
+    def __init__(self) -> None:
+        """Construct the MetricsRecorder class."""
+        self.stages = {}
+        self.counters = {}
+        self.lock = Lock()
+
+    @contextmanager
+    def stage(self, name: str) -> Iterator[None]:
+        """
+        Time a block of code as a stage.
+
+        Args:
+            name (str): The name of the stage.
+
+        Yields:
+            None: The block is timed while it runs, even if it raises.
+        """
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.record(name, time.perf_counter() - start)
+
+    def record(self, name: str, seconds: float) -> None:
+        """
+        Record a stage that took the given number of seconds.
+
+        Args:
+            name (str): The name of the stage.
+            seconds (float): The time the stage took.
+        """
+        with self.lock:
+            stage = self.stages.setdefault(
+                name, {"calls": 0, "seconds": 0.0, "max": 0.0}
+            )
+            stage["calls"] += 1
+            stage["seconds"] += seconds
+            stage["max"] = max(stage["max"], seconds)
+
+    def count(self, name: str, value: int = 1) -> None:
+        """
+        Increment a counter.
+
+        Args:
+            name (str): The name of the counter.
+            value (int, optional): The amount to increment by. Defaults to 1.
+        """
+        with self.lock:
+            self.counters[name] = self.counters.get(name, 0) + value
+
+    def summary_table(self) -> "Table":
+        """
+        Build a table of every stage and counter.
+
+        Returns:
+            Table: The stages, slowest first, followed by the counters.
+        """
+        from rich.table import Table
+
+        table = Table(title="Metrics", show_header=True, header_style="bold magenta")
+        for header in ("Stage", "Calls", "Total (s)", "Mean (ms)", "Max (ms)"):
+            table.add_column(header)
+
+        metrics = self.to_dict()
+        by_time = sorted(
+            metrics["stages"].items(), key=lambda item: item[1]["seconds"], reverse=True
+        )
+        for name, stage in by_time:
+            table.add_row(
+                name,
+                str(stage["calls"]),
+                f"{stage['seconds']:.3f}",
+                f"{stage['seconds'] / stage['calls'] * 1000:.1f}",
+                f"{stage['max'] * 1000:.1f}",
+            )
+
+        if metrics["counters"]:
+            table.add_section()
+            for name, value in sorted(metrics["counters"].items()):
+                table.add_row(name, str(value), "", "", "")
+
+        return table
+
+    def to_dict(self) -> dict:
+        """
+        Get every stage and counter as a dict.
+
+        Returns:
+            dict: A copy of the stages and counters.
+        """
+        with self.lock:
+            return {
+                "stages": {name: dict(stage) for name, stage in self.stages.items()},
+                "counters": dict(self.counters),
+            }
+
+    def to_prometheus(self) -> str:
+        """
+        Get every stage and counter in the Prometheus text format.
+
+        Returns:
+            str: The stage times, calls and maximums labelled by stage,
+                and a metric for every counter.
+        """
+        metrics = self.to_dict()
+        stage_metrics = (
+            ("stage_seconds_total", "seconds", "counter", "Time spent in the stage."),
+            ("stage_calls_total", "calls", "counter", "Times the stage ran."),
+            ("stage_max_seconds", "max", "gauge", "Longest single run of the stage."),
+        )
+
+        lines = []
+        for metric, field, metric_type, help_text in stage_metrics:
+            name = f"{PROMETHEUS_PREFIX}_{metric}"
+            lines.append(f"# HELP {name} {help_text}")
+            lines.append(f"# TYPE {name} {metric_type}")
+            for stage, values in sorted(metrics["stages"].items()):
+                lines.append(f'{name}{{stage="{stage}"}} {values[field]}')
+
+        for counter, value in sorted(metrics["counters"].items()):
+            name = f"{PROMETHEUS_PREFIX}_{counter.replace('.', '_')}_total"
+            lines.append(f"# TYPE {name} counter")
+            lines.append(f"{name} {value}")
+
+        return "\n".join(lines) + "\n"
+
+    def export(self, path: str) -> None:
+        """
+        Write every stage and counter to a JSON or Prometheus textfile.
+
+        Paths ending in .prom are written in the Prometheus text format, anything else
+        as JSON. The file is replaced atomically, so a node exporter never reads it
+        half written.
+
+        Args:
+            path (str): The path of the file.
+        """
+        if path.endswith(".prom"):
+            content = self.to_prometheus()
+        else:
+            content = json.dumps(self.to_dict(), indent=4)
+
+        directory = os.path.dirname(path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        temporary_path = f"{path}.tmp"
+        with open(temporary_path, "w", encoding="UTF-8") as metrics_file:
+            metrics_file.write(content)
+        os.replace(temporary_path, path)
@@ -3,4 +3,9 @@ This folder contains all models for the Lyzer-ETL application.
 
 Modules:
     schedules: This module contains the Schedule and all related models.
+    results: This module contains the RaceResults and all related models.
+    qualifying: This module contains the RaceQualifying and all related models.
+    pit_stops: This module contains the RacePitStops and all related models.
+    lap_times: This module contains the RaceLaps and all related models.
+    pages: This module contains the PageData model shared by every response.
 """
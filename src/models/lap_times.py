@@ -0,0 +1,110 @@
+"""
+Contains lap time and related models.
+
+Classes:
+    Timing: The timing of a driver on a lap.
+    Lap: A lap.
+    RaceLaps: The laps of a race.
+    LapTable: A lap table.
+    LapMasterData: Master data for laps.
+    LapResponse: A lap response.
+"""
+from typing import Optional
+
+from pydantic import BaseModel, Field
+
+from src.models.pages import PageData
+
+
+class Timing(BaseModel):
+    """
+    Timing model.
+
+    Attributes:
+        DriverId (str): The unique id of the driver.
+        Position (str): The position of the driver at the end of the lap.
+        Time (str): The lap time.
+    """
+
+    DriverId: str = Field(alias="driverId")
+    Position: Optional[str] = Field(alias="position", default=None)
+    Time: Optional[str] = Field(alias="time", default=None)
+
+
+class Lap(BaseModel):
+    """
+    Lap model.
+
+    Attributes:
+        Number (str): The lap number.
+        Timings (list[Timing]): The timings of every driver on the lap.
+    """
+
+    Number: str = Field(alias="number")
+    Timings: list[Timing] = Field(alias="Timings", default=[])
+
+
+class RaceLaps(BaseModel):
+    """
+    Race laps model.
+
+    Attributes:
+        Season (str): The season of the race.
+        Round (str): The round of the race.
+        RaceName (str): The race name.
+        Laps (list[Lap]): The laps of the race.
+    """
+
+    Season: str = Field(alias="season")
+    Round: str = Field(alias="round")
+    RaceName: str = Field(alias="raceName")
+    Laps: list[Lap] = Field(alias="Laps", default=[])
+
+    def documents(self) -> list[dict]:
+        """
+        Flatten the laps into one document per driver per lap.
+
+        Returns:
+            list[dict]: The lap times with the season, round, race name and lap number.
+        """
+        race = {"Season": self.Season, "Round": self.Round, "RaceName": self.RaceName}
+        return [
+            {**race, "Lap": lap.Number, **timing.model_dump()}
+            for lap in self.Laps
+            for timing in lap.Timings
+        ]
+
+
+class LapTable(BaseModel):
+    """
+    Lap table model.
+
+    Attributes:
+        Races (list[RaceLaps]): List of races with their laps.
+    """
+
+    Races: list[RaceLaps] = Field(alias="Races")
+
+
+class LapMasterData(PageData):
+    """
+    Lap master data model.
+
+    The pagination fields are inherited from PageData.
+
+    Attributes:
+        RaceTable (LapTable): The lap table.
+    """
+
+    RaceTable: LapTable = Field(alias="RaceTable")
+
+
+class LapResponse(BaseModel):
+    """
+    Lap response model.
+
+    Attributes:
+        MRData (LapMasterData): The master data object.
+    """
+
+    MRData: LapMasterData = Field(alias="MRData")
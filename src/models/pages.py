@@ -0,0 +1,27 @@
+"""
+Contains the pagination model shared by every response.
+
+Classes:
+    PageData: The pagination fields of a response's master data.
+"""
+from typing import Optional
+
+from pydantic import BaseModel, Field
+
+
+class PageData(BaseModel):
+    """
+    Page data model.
+
+    Every master data model extends this model, so the pagination of any response
+    can be read without knowing which dataset it holds.
+
+    Attributes:
+        Limit (int): The maximum number of results in the page.
+        Offset (int): The offset of the first result in the page.
+        Total (int): The total number of results across every page.
+    """
+
+    Limit: Optional[int] = Field(alias="limit", default=None)
+    Offset: Optional[int] = Field(alias="offset", default=None)
+    Total: Optional[int] = Field(alias="total", default=None)
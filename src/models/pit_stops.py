@@ -0,0 +1,96 @@
+"""
+Contains pit stop and related models.
+
+Classes:
+    PitStop: A pit stop.
+    RacePitStops: The pit stops of a race.
+    PitStopTable: A pit stop table.
+    PitStopMasterData: Master data for pit stops.
+    PitStopResponse: A pit stop response.
+"""
+from typing import Optional
+
+from pydantic import BaseModel, Field
+
+from src.models.pages import PageData
+
+
+class PitStop(BaseModel):
+    """
+    Pit stop model.
+
+    Attributes:
+        DriverId (str): The unique id of the driver.
+        Lap (str): The lap of the pit stop.
+        Stop (str): The number of the stop for the driver.
+        Time (str): The time of day of the pit stop.
+        Duration (str): The duration of the pit stop.
+    """
+
+    DriverId: str = Field(alias="driverId")
+    Lap: str = Field(alias="lap")
+    Stop: str = Field(alias="stop")
+    Time: Optional[str] = Field(alias="time", default=None)
+    Duration: Optional[str] = Field(alias="duration", default=None)
+
+
+class RacePitStops(BaseModel):
+    """
+    Race pit stops model.
+
+    Attributes:
+        Season (str): The season of the race.
+        Round (str): The round of the race.
+        RaceName (str): The race name.
+        PitStops (list[PitStop]): The pit stops of the race.
+    """
+
+    Season: str = Field(alias="season")
+    Round: str = Field(alias="round")
+    RaceName: str = Field(alias="raceName")
+    PitStops: list[PitStop] = Field(alias="PitStops", default=[])
+
+    def documents(self) -> list[dict]:
+        """
+        Flatten the pit stops into one document per pit stop.
+
+        Returns:
+            list[dict]: The pit stops with the season, round and race name of the race.
+        """
+        race = {"Season": self.Season, "Round": self.Round, "RaceName": self.RaceName}
+        return [{**race, **pit_stop.model_dump()} for pit_stop in self.PitStops]
+
+
+class PitStopTable(BaseModel):
+    """
+    Pit stop table model.
+
+    Attributes:
+        Races (list[RacePitStops]): List of races with their pit stops.
+    """
+
+    Races: list[RacePitStops] = Field(alias="Races")
+
+
+class PitStopMasterData(PageData):
+    """
+    Pit stop master data model.
+
+    The pagination fields are inherited from PageData.
+
+    Attributes:
+        RaceTable (PitStopTable): The pit stop table.
+    """
+
+    RaceTable: PitStopTable = Field(alias="RaceTable")
+
+
+class PitStopResponse(BaseModel):
+    """
+    Pit stop response model.
+
+    Attributes:
+        MRData (PitStopMasterData): The master data object.
+    """
+
+    MRData: PitStopMasterData = Field(alias="MRData")
@@ -0,0 +1,104 @@
+"""
+Contains qualifying and related models.
+
+Classes:
+    QualifyingResult: A qualifying result.
+    RaceQualifying: The qualifying results of a race.
+    QualifyingTable: A qualifying table.
+    QualifyingMasterData: Master data for qualifying.
+    QualifyingResponse: A qualifying response.
+"""
+from typing import Optional
+
+from pydantic import BaseModel, Field
+
+from src.models.pages import PageData
+
+from src.models.results import ConstructorDetails, DriverDetails
+
+
+class QualifyingResult(BaseModel):
+    """
+    Qualifying result model.
+
+    Attributes:
+        Number (str): The car number.
+        Position (str): The qualifying position.
+        Driver (DriverDetails): The driver.
+        Constructor (ConstructorDetails): The constructor.
+        Q1 (str): The best time in the first session.
+        Q2 (str): The best time in the second session.
+        Q3 (str): The best time in the third session.
+    """
+
+    Number: Optional[str] = Field(alias="number", default=None)
+    Position: str = Field(alias="position")
+    Driver: DriverDetails = Field(alias="Driver")
+    Constructor: ConstructorDetails = Field(alias="Constructor")
+    Q1: Optional[str] = Field(alias="Q1", default=None)
+    Q2: Optional[str] = Field(alias="Q2", default=None)
+    Q3: Optional[str] = Field(alias="Q3", default=None)
+
+
+class RaceQualifying(BaseModel):
+    """
+    Race qualifying model.
+
+    Attributes:
+        Season (str): The season of the race.
+        Round (str): The round of the race.
+        RaceName (str): The race name.
+        QualifyingResults (list[QualifyingResult]): The qualifying results of the race.
+    """
+
+    Season: str = Field(alias="season")
+    Round: str = Field(alias="round")
+    RaceName: str = Field(alias="raceName")
+    QualifyingResults: list[QualifyingResult] = Field(
+        alias="QualifyingResults", default=[]
+    )
+
+    def documents(self) -> list[dict]:
+        """
+        Flatten the qualifying results into one document per result.
+
+        Returns:
+            list[dict]: The qualifying results with the season, round and race name.
+        """
+        race = {"Season": self.Season, "Round": self.Round, "RaceName": self.RaceName}
+        return [{**race, **result.model_dump()} for result in self.QualifyingResults]
+
+
+class QualifyingTable(BaseModel):
+    """
+    Qualifying table model.
+
+    Attributes:
+        Races (list[RaceQualifying]): List of races with their qualifying results.
+    """
+
+    Races: list[RaceQualifying] = Field(alias="Races")
+
+
+class QualifyingMasterData(PageData):
+    """
+    Qualifying master data model.
+
+    The pagination fields are inherited from PageData.
+
+    Attributes:
+        RaceTable (QualifyingTable): The qualifying table.
+    """
+
+    RaceTable: QualifyingTable = Field(alias="RaceTable")
+
+
+class QualifyingResponse(BaseModel):
+    """
+    Qualifying response model.
+
+    Attributes:
+        MRData (QualifyingMasterData): The master data object.
+    """
+
+    MRData: QualifyingMasterData = Field(alias="MRData")
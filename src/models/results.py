@@ -0,0 +1,194 @@
+"""
+Contains race result and related models.
+
+Classes:
+    DriverDetails: A driver.
+    ConstructorDetails: A constructor.
+    ResultTime: The finishing time of a result.
+    Speed: The average speed of a lap.
+    FastestLapResult: The fastest lap of a result.
+    Result: A race result.
+    RaceResults: The results of a race.
+    ResultsTable: A results table.
+    ResultsMasterData: Master data for results.
+    ResultsResponse: A results response.
+"""
+from typing import Optional
+
+from pydantic import BaseModel, Field
+
+from src.models.pages import PageData
+
+
+class DriverDetails(BaseModel):
+    """
+    Driver details model.
+
+    Attributes:
+        DriverId (str): The unique id of the driver.
+        PermanentNumber (str): The permanent number of the driver.
+        Code (str): The three letter code of the driver.
+        GivenName (str): The given name of the driver.
+        FamilyName (str): The family name of the driver.
+        DateOfBirth (str): The date of birth of the driver.
+        Nationality (str): The nationality of the driver.
+    """
+
+    DriverId: str = Field(alias="driverId")
+    PermanentNumber: Optional[str] = Field(alias="permanentNumber", default=None)
+    Code: Optional[str] = Field(alias="code", default=None)
+    GivenName: str = Field(alias="givenName")
+    FamilyName: str = Field(alias="familyName")
+    DateOfBirth: Optional[str] = Field(alias="dateOfBirth", default=None)
+    Nationality: Optional[str] = Field(alias="nationality", default=None)
+
+
+class ConstructorDetails(BaseModel):
+    """
+    Constructor details model.
+
+    Attributes:
+        ConstructorId (str): The unique id of the constructor.
+        Name (str): The name of the constructor.
+        Nationality (str): The nationality of the constructor.
+    """
+
+    ConstructorId: str = Field(alias="constructorId")
+    Name: str = Field(alias="name")
+    Nationality: Optional[str] = Field(alias="nationality", default=None)
+
+
+class ResultTime(BaseModel):
+    """
+    Result time model.
+
+    Attributes:
+        Millis (str): The finishing time in milliseconds.
+        Time (str): The finishing time or the gap to the winner.
+    """
+
+    Millis: Optional[str] = Field(alias="millis", default=None)
+    Time: str = Field(alias="time")
+
+
+class Speed(BaseModel):
+    """
+    Speed model.
+
+    Attributes:
+        Units (str): The units of the speed.
+        Speed (str): The average speed.
+    """
+
+    Units: str = Field(alias="units")
+    Speed: str = Field(alias="speed")
+
+
+class FastestLapResult(BaseModel):
+    """
+    Fastest lap result model.
+
+    Attributes:
+        Rank (str): The rank of the fastest lap in the race.
+        Lap (str): The lap the fastest lap was set on.
+        Time (ResultTime): The time of the fastest lap.
+        AverageSpeed (Speed): The average speed of the fastest lap.
+    """
+
+    Rank: Optional[str] = Field(alias="rank", default=None)
+    Lap: str = Field(alias="lap")
+    Time: Optional[ResultTime] = Field(alias="Time", default=None)
+    AverageSpeed: Optional[Speed] = Field(alias="AverageSpeed", default=None)
+
+
+class Result(BaseModel):
+    """
+    Result model.
+
+    Attributes:
+        Number (str): The car number.
+        Position (str): The finishing position.
+        PositionText (str): The finishing position, or the reason for not classifying.
+        Points (str): The points scored.
+        Driver (DriverDetails): The driver.
+        Constructor (ConstructorDetails): The constructor.
+        Grid (str): The starting grid position.
+        Laps (str): The number of laps completed.
+        Status (str): The finishing status.
+        Time (ResultTime): The finishing time.
+        FastestLap (FastestLapResult): The fastest lap.
+    """
+
+    Number: Optional[str] = Field(alias="number", default=None)
+    Position: str = Field(alias="position")
+    PositionText: str = Field(alias="positionText")
+    Points: str = Field(alias="points")
+    Driver: DriverDetails = Field(alias="Driver")
+    Constructor: ConstructorDetails = Field(alias="Constructor")
+    Grid: Optional[str] = Field(alias="grid", default=None)
+    Laps: Optional[str] = Field(alias="laps", default=None)
+    Status: Optional[str] = Field(alias="status", default=None)
+    Time: Optional[ResultTime] = Field(alias="Time", default=None)
+    FastestLap: Optional[FastestLapResult] = Field(alias="FastestLap", default=None)
+
+
+class RaceResults(BaseModel):
+    """
+    Race results model.
+
+    Attributes:
+        Season (str): The season of the race.
+        Round (str): The round of the race.
+        RaceName (str): The race name.
+        Results (list[Result]): The results of the race.
+    """
+
+    Season: str = Field(alias="season")
+    Round: str = Field(alias="round")
+    RaceName: str = Field(alias="raceName")
+    Results: list[Result] = Field(alias="Results", default=[])
+
+    def documents(self) -> list[dict]:
+        """
+        Flatten the results into one document per result.
+
+        Returns:
+            list[dict]: The results with the season, round and race name of the race.
+        """
+        race = {"Season": self.Season, "Round": self.Round, "RaceName": self.RaceName}
+        return [{**race, **result.model_dump()} for result in self.Results]
+
+
+class ResultsTable(BaseModel):
+    """
+    Results table model.
+
+    Attributes:
+        Races (list[RaceResults]): List of races with their results.
+    """
+
+    Races: list[RaceResults] = Field(alias="Races")
+
+
+class ResultsMasterData(PageData):
+    """
+    Results master data model.
+
+    The pagination fields are inherited from PageData.
+
+    Attributes:
+        RaceTable (ResultsTable): The results table.
+    """
+
+    RaceTable: ResultsTable = Field(alias="RaceTable")
+
+
+class ResultsResponse(BaseModel):
+    """
+    Results response model.
+
+    Attributes:
+        MRData (ResultsMasterData): The master data object.
+    """
+
+    MRData: ResultsMasterData = Field(alias="MRData")
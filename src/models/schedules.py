@@ -7,10 +7,19 @@ Classes:
     ScheduleTable: A schedule table.
     MasterData: Master data.
     ScheduleResponse: A schedule response.
+
+Functions:
+    parse_start: Parse the date and time of a session into a UTC datetime.
 """
+from datetime import datetime, timezone
 from typing import Optional
 
-from pydantic import BaseModel, Field
+from pydantic import BaseModel, ConfigDict, Field
+
+from src.models.pages import PageData
+
+# Constants
+SESSIONS = ("FirstPractice", "SecondPractice", "ThirdPractice", "Qualifying", "Sprint")
 
 
 class Session(BaseModel):
@@ -22,15 +31,28 @@ class Session(BaseModel):
         Time (str): The time of the session.
     """
 
+    # Stored schedules are dumped by field name and validated again when exported
+    model_config = ConfigDict(populate_by_name=True)
+
     Date: Optional[str] = Field(alias="date", default=None)
     Time: Optional[str] = Field(alias="time", default=None)
 
+    def starts_at(self) -> Optional[datetime]:
+        """
+        Get the start of the session.
+
+        Returns:
+            datetime | None: The start of the session in UTC, None if it has no date.
+        """
+        return parse_start(self.Date, self.Time)
+
 
 class Schedule(BaseModel):
     """
     Schedule model.
 
     Attributes:
+        Season (str): The season of the schedule.
         Round (int): The round of the schedule.
         RaceName(str): The race name.
         Date (str): The date of the race.
@@ -42,6 +64,9 @@ class Schedule(BaseModel):
         Sprint (Session): The sprint session.
     """
 
+    model_config = ConfigDict(populate_by_name=True)
+
+    Season: Optional[str] = Field(alias="season", default=None)
     Round: str = Field(alias="round")
     RaceName: str = Field(alias="raceName")
     Date: str = Field(alias="date")
@@ -52,6 +77,39 @@ class Schedule(BaseModel):
     Qualifying: Optional[Session] = Field(alias="Qualifying", default=None)
     Sprint: Optional[Session] = Field(alias="Sprint", default=None)
 
+    def starts_at(self) -> datetime:
+        """
+        Get the start of the race.
+
+        Returns:
+            datetime: The start of the race in UTC.
+        """
+        return parse_start(self.Date, self.Time)
+
+    def typed_document(self, season: int) -> dict:
+        """
+        Build the typed document for the schedule.
+
+        The season and round are stored as numbers and every session as a UTC datetime,
+        so schedules can be sorted and queried by date across seasons.
+
+        Args:
+            season (int): The season of the schedule.
+
+        Returns:
+            dict: The schedule with numeric fields and a datetime for every session.
+        """
+        document = {
+            "Season": season,
+            "Round": int(self.Round),
+            "RaceName": self.RaceName,
+            "Race": self.starts_at(),
+        }
+        for name in SESSIONS:
+            session = getattr(self, name)
+            document[name] = session.starts_at() if session else None
+        return document
+
 
 class ScheduleTable(BaseModel):
     """
@@ -64,10 +122,12 @@ class ScheduleTable(BaseModel):
     Races: list[Schedule] = Field(alias="Races")
 
 
-class MasterData(BaseModel):
+class MasterData(PageData):
     """
     Master data model.
 
+    The pagination fields are inherited from PageData.
+
     Attributes:
         RaceTable (ScheduleTable): The schedule table.
     """
@@ -84,3 +144,24 @@ class ScheduleResponse(BaseModel):
     """
 
     MRData: MasterData = Field(alias="MRData")
+
+
+def parse_start(date: Optional[str], time: Optional[str]) -> Optional[datetime]:
+    """
+    Parse the date and time of a session into a UTC datetime.
+
+    Ergast gives times in UTC with a trailing Z, older seasons have no times at all,
+    those sessions start at midnight.
+
+    Args:
+        date (str | None): The date of the session, for example "2023-03-05".
+        time (str | None): The time of the session, for example "15:00:00Z".
+
+    Returns:
+        datetime | None: The start of the session in UTC, None if it has no date.
+    """
+    if not date:
+        return None
+
+    start = datetime.fromisoformat(f"{date}T{(time or '00:00:00').rstrip('Z')}")
+    return start.replace(tzinfo=timezone.utc)
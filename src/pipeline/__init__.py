@@ -0,0 +1,6 @@
+"""
+Folder for the load pipeline related files.
+
+Modules:
+    async_pipeline: The asyncio pipeline that loads many seasons and datasets at once.
+"""
@@ -0,0 +1,439 @@
+"""
+This module contains the AsyncPipeline class.
+
+The AsyncPipeline class is responsible for loading many seasons and datasets at once,
+moving every round through fetch, validate and write stages connected by bounded queues.
+
+Functions:
+    run_pipeline: Run the pipeline to completion.
+    page_documents: Validate a page and flatten its races into documents.
+    page_bson: Validate a page and encode its documents into a single BSON buffer.
+    page_total: Read the total number of results from a raw response.
+"""
+
+# Standard Library Imports
+import asyncio
+import multiprocessing
+import re
+import time
+from collections.abc import Callable
+from concurrent.futures import Executor, ProcessPoolExecutor, ThreadPoolExecutor
+from datetime import datetime, timezone
+from typing import NamedTuple
+
+# Third Party Imports
+from bson import decode_all, encode
+from bson.codec_options import CodecOptions
+from bson.raw_bson import RawBSONDocument
+
+# Local Imports
+from src.api.ergast_service import (
+    MAX_PAGE_SIZE,
+    ROUND_ENDPOINTS,
+    ErgastService,
+    loads,
+    page_url,
+)
+from src.sinks.sink import Sink
+
+# Constants
+TOTAL_PATTERN = re.compile(rb'"total"\s*:\s*"(\d+)"')
+SCHEDULE = "Schedules"
+
+
+class RoundJob(NamedTuple):
+    """
+    A round of a dataset to load.
+
+    Attributes:
+        database (str): The database of the dataset.
+        endpoint (str): The Ergast endpoint of the dataset, one of ROUND_ENDPOINTS.
+        season (int): The season.
+        round (int): The round.
+    """
+
+    database: str
+    endpoint: str
+    season: int
+    round: int
+
+
+class AsyncPipeline:
+    """
+    This class is responsible for loading many seasons and datasets at once.
+
+    A producer fetches the schedule of every season and queues a job for every round
+    of every dataset. Fetchers download every page of a job, validators turn the pages
+    into documents and a single writer replaces each round once all of its pages are in.
+    Every queue is bounded, so a slow stage holds back the stages before it instead of
+    letting pages pile up in memory.
+
+    The Ergast client and the sinks are blocking, so their calls are run on bounded
+    thread pools from the event loop: the number of requests in flight is set by
+    concurrency, not by the number of jobs.
+
+    Validation is CPU-bound, so with processes it moves to a process pool. Only the
+    raw page goes to a process and only a single buffer of encoded BSON documents comes
+    back, so no object graphs are pickled on either side.
+
+    Attributes:
+        ergast_service (ErgastService): The service to fetch data with.
+        sink (Sink): The sink to write data to.
+        concurrency (int): The maximum number of requests in flight.
+        validators (int): The number of pages validated at once.
+        processes (int): The number of processes validating pages, 0 to use threads.
+        queue_size (int): The maximum number of items waiting between two stages.
+        progress (Callable | None): Called with a message after every write.
+        summary (dict): The number of documents written, keyed by database and season.
+
+    Methods:
+        run: Load the given datasets for the given seasons.
+        produce: Queue a job for every round of every dataset.
+        fetch: Download every page of the queued jobs.
+        validate: Turn downloaded pages into documents.
+        write: Write the documents of every completed round.
+        record: Record a write in the summary and report it.
+    """
+
+    def __init__(
+        self,
+        ergast_service: ErgastService,
+        sink: Sink,
+        concurrency: int = 16,
+        validators: int = 2,
+        processes: int = 0,
+        queue_size: int = 64,
+        progress: Callable[[str], None] | None = None,
+    ) -> None:
+        """
+        Construct the AsyncPipeline class.
+
+        Args:
+            ergast_service (ErgastService): The service to fetch data with.
+            sink (Sink): The sink to write data to.
+            concurrency (int, optional): The maximum number of requests in flight.
+                Defaults to 16.
+            validators (int, optional): The number of pages validated at once,
+                raised to the number of processes. Defaults to 2.
+            processes (int, optional): The number of processes validating pages.
+                Defaults to 0, which validates on threads.
+            queue_size (int, optional): The maximum number of items waiting between two
+                stages. Defaults to 64.
+            progress (Callable, optional): Called with a message after every write.
+                Defaults to None.
+        """
+        self.ergast_service = ergast_service
+        self.sink = sink
+        self.concurrency = concurrency
+        self.validators = max(validators, processes)
+        self.processes = processes
+        self.queue_size = queue_size
+        self.progress = progress
+        self.summary = {}
+
+    async def run(
+        self, seasons: list[int], datasets: list[tuple[str, str]], schedules: bool
+    ) -> dict:
+        """
+        Load the given datasets for the given seasons.
+
+        If any stage fails, every other stage is cancelled and the error is raised.
+
+        Args:
+            seasons (list[int]): The seasons to load.
+            datasets (list[tuple[str, str]]): The database and endpoint of every dataset.
+            schedules (bool): Also load the schedules of the seasons.
+
+        Returns:
+            dict: The number of documents written, keyed by database and season.
+        """
+        jobs = asyncio.Queue(self.queue_size)
+        pages = asyncio.Queue(self.queue_size)
+        writes = asyncio.Queue(self.queue_size)
+        fetch_pool = ThreadPoolExecutor(self.concurrency, "pipeline-fetch")
+        work_pool = ThreadPoolExecutor(self.validators + 1, "pipeline-work")
+        validate_pool = work_pool
+        if self.processes:
+            # Threads are already running, so processes are spawned rather than forked
+            context = multiprocessing.get_context("spawn")
+            validate_pool = ProcessPoolExecutor(self.processes, mp_context=context)
+
+        async def fetch_stage() -> None:
+            await asyncio.gather(
+                *(self.fetch(jobs, pages, fetch_pool) for _ in range(self.concurrency))
+            )
+            for _ in range(self.validators):
+                await pages.put(None)
+
+        async def validate_stage() -> None:
+            await asyncio.gather(
+                *(
+                    self.validate(pages, writes, validate_pool)
+                    for _ in range(self.validators)
+                )
+            )
+            await writes.put(None)
+
+        tasks = [
+            asyncio.ensure_future(stage)
+            for stage in (
+                self.produce(seasons, datasets, schedules, jobs, writes, fetch_pool),
+                fetch_stage(),
+                validate_stage(),
+                self.write(writes, work_pool),
+            )
+        ]
+        try:
+            await asyncio.gather(*tasks)
+        except BaseException:
+            for task in tasks:
+                task.cancel()
+            await asyncio.gather(*tasks, return_exceptions=True)
+            raise
+        finally:
+            fetch_pool.shutdown(cancel_futures=True)
+            work_pool.shutdown(cancel_futures=True)
+            validate_pool.shutdown(cancel_futures=True)
+
+        return self.summary
+
+    async def produce(
+        self,
+        seasons: list[int],
+        datasets: list[tuple[str, str]],
+        schedules: bool,
+        jobs: asyncio.Queue,
+        writes: asyncio.Queue,
+        pool: ThreadPoolExecutor,
+    ) -> None:
+        """
+        Queue a job for every round of every dataset that has been raced.
+
+        Args:
+            seasons (list[int]): The seasons to load.
+            datasets (list[tuple[str, str]]): The database and endpoint of every dataset.
+            schedules (bool): Also queue the schedules of the seasons for writing.
+            jobs (asyncio.Queue): The queue of round jobs.
+            writes (asyncio.Queue): The queue of writes.
+            pool (ThreadPoolExecutor): The pool to fetch the schedules on.
+        """
+        loop = asyncio.get_running_loop()
+        now = datetime.now(timezone.utc)
+
+        for season in seasons:
+            season_schedules = await loop.run_in_executor(
+                pool, self.ergast_service.get_schedules, season
+            )
+            if schedules:
+                await writes.put((SCHEDULE, season, season_schedules))
+
+            for schedule in season_schedules:
+                if schedule.starts_at() > now:
+                    break
+                for database, endpoint in datasets:
+                    await jobs.put(
+                        RoundJob(database, endpoint, season, int(schedule.Round))
+                    )
+
+        for _ in range(self.concurrency):
+            await jobs.put(None)
+
+    async def fetch(
+        self, jobs: asyncio.Queue, pages: asyncio.Queue, pool: ThreadPoolExecutor
+    ) -> None:
+        """
+        Download every page of the queued jobs until the jobs run out.
+
+        The number of pages is read from the first page without decoding it,
+        the remaining pages are then downloaded by the same fetcher.
+
+        Args:
+            jobs (asyncio.Queue): The queue of round jobs.
+            pages (asyncio.Queue): The queue of downloaded pages.
+            pool (ThreadPoolExecutor): The pool to send the requests on.
+        """
+        loop = asyncio.get_running_loop()
+        base_url = self.ergast_service.base_url
+
+        while (job := await jobs.get()) is not None:
+            url = f"{base_url}/{job.season}/{job.round}/{job.endpoint}.json"
+            body, _ = await loop.run_in_executor(
+                pool, self.ergast_service.get_raw, page_url(url, MAX_PAGE_SIZE, 0)
+            )
+            offsets = range(MAX_PAGE_SIZE, page_total(body), MAX_PAGE_SIZE)
+            count = len(offsets) + 1
+            await pages.put((job, 0, count, body))
+
+            for index, offset in enumerate(offsets, start=1):
+                body, _ = await loop.run_in_executor(
+                    pool,
+                    self.ergast_service.get_raw,
+                    page_url(url, MAX_PAGE_SIZE, offset),
+                )
+                await pages.put((job, index, count, body))
+
+    async def validate(
+        self, pages: asyncio.Queue, writes: asyncio.Queue, pool: Executor
+    ) -> None:
+        """
+        Turn downloaded pages into documents until the pages run out.
+
+        On a process pool the documents come back encoded, they are split into raw
+        documents, or decoded when the sink does not take raw BSON.
+
+        Args:
+            pages (asyncio.Queue): The queue of downloaded pages.
+            writes (asyncio.Queue): The queue of writes.
+            pool (Executor): The pool to validate the pages on.
+        """
+        loop = asyncio.get_running_loop()
+        document_class = RawBSONDocument if self.sink.raw_bson else dict
+        codec_options = CodecOptions(document_class=document_class)
+
+        while (page := await pages.get()) is not None:
+            job, index, count, body = page
+            start = time.perf_counter()
+            if self.processes:
+                buffer = await loop.run_in_executor(pool, page_bson, job.endpoint, body)
+                documents = decode_all(buffer, codec_options)
+            else:
+                documents = await loop.run_in_executor(
+                    pool, page_documents, job.endpoint, body
+                )
+            self.ergast_service.metrics.record(
+                "pipeline.validate", time.perf_counter() - start
+            )
+            await writes.put((job, index, count, documents))
+
+    async def write(self, writes: asyncio.Queue, pool: ThreadPoolExecutor) -> None:
+        """
+        Write the documents of every round once all of its pages are in.
+
+        Schedules are written as soon as they arrive. Once every round is written the
+        sink is flushed, so the summary only counts documents that are durable.
+
+        Args:
+            writes (asyncio.Queue): The queue of writes.
+            pool (ThreadPoolExecutor): The pool to write on.
+        """
+        loop = asyncio.get_running_loop()
+        pending: dict[RoundJob, dict[int, list[dict]]] = {}
+
+        while (item := await writes.get()) is not None:
+            if item[0] == SCHEDULE:
+                _, season, season_schedules = item
+                await loop.run_in_executor(
+                    pool, self.sink.upsert_schedules, season, season_schedules
+                )
+                self.record(SCHEDULE, season, len(season_schedules))
+                continue
+
+            job, index, count, documents = item
+            pages = pending.setdefault(job, {})
+            pages[index] = documents
+            if len(pages) < count:
+                continue
+
+            del pending[job]
+            documents = [
+                document for index in sorted(pages) for document in pages[index]
+            ]
+            if documents:
+                await loop.run_in_executor(
+                    pool,
+                    self.sink.replace_round,
+                    job.database,
+                    job.season,
+                    job.round,
+                    documents,
+                )
+            self.record(job.database, job.season, len(documents))
+
+        await loop.run_in_executor(pool, self.sink.flush)
+
+    def record(self, database: str, season: int, count: int) -> None:
+        """
+        Record a write in the summary and report it.
+
+        Args:
+            database (str): The database that was written to.
+            season (int): The season that was written.
+            count (int): The number of documents written.
+        """
+        seasons = self.summary.setdefault(database, {})
+        seasons[season] = seasons.get(season, 0) + count
+        if self.progress:
+            written = sum(sum(seasons.values()) for seasons in self.summary.values())
+            self.progress(f"{written} documents written")
+
+
+def run_pipeline(
+    pipeline: AsyncPipeline,
+    seasons: list[int],
+    datasets: list[tuple[str, str]],
+    schedules: bool = False,
+) -> dict:
+    """
+    Run the pipeline to completion.
+
+    Args:
+        pipeline (AsyncPipeline): The pipeline to run.
+        seasons (list[int]): The seasons to load.
+        datasets (list[tuple[str, str]]): The database and endpoint of every dataset.
+        schedules (bool, optional): Also load the schedules of the seasons.
+            Defaults to False.
+
+    Returns:
+        dict: The number of documents written, keyed by database and season.
+    """
+    return asyncio.run(pipeline.run(seasons, datasets, schedules))
+
+
+def page_documents(endpoint: str, body: bytes) -> list[dict]:
+    """
+    Validate a page and flatten its races into documents.
+
+    Args:
+        endpoint (str): The endpoint of the page, one of ROUND_ENDPOINTS.
+        body (bytes): The raw page.
+
+    Returns:
+        list[dict]: The documents of the page.
+    """
+    page = ROUND_ENDPOINTS[endpoint].model_validate(loads(body))
+    return [
+        document
+        for race in page.MRData.RaceTable.Races
+        for document in race.documents()
+    ]
+
+
+def page_bson(endpoint: str, body: bytes) -> bytes:
+    """
+    Validate a page and encode its documents into a single BSON buffer.
+
+    BSON documents are prefixed with their length, so the documents are concatenated
+    and returned as one bytes object, which is pickled as a single copy.
+
+    Args:
+        endpoint (str): The endpoint of the page, one of ROUND_ENDPOINTS.
+        body (bytes): The raw page.
+
+    Returns:
+        bytes: The encoded documents of the page, back to back.
+    """
+    return b"".join(encode(document) for document in page_documents(endpoint, body))
+
+
+def page_total(body: bytes) -> int:
+    """
+    Read the total number of results from a raw response.
+
+    Args:
+        body (bytes): The raw response.
+
+    Returns:
+        int: The total number of results, 0 if the response has none.
+    """
+    match = TOTAL_PATTERN.search(body)
+    return int(match.group(1)) if match else 0
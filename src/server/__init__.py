@@ -0,0 +1,6 @@
+"""
+Folder for the local servers of the application.
+
+Modules:
+    schedule_api: The HTTP read API over the loaded schedules.
+"""
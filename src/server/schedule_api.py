@@ -0,0 +1,436 @@
+"""
+This module contains the local schedule read API.
+
+The API answers the questions other services keep asking the database, a season's
+calendar and the next or previous session, from an in-memory index of the loaded
+schedules, so those reads never reach the database.
+
+Classes:
+    ScheduleIndex: The loaded schedules, indexed for reads.
+    ScheduleCache: The in-memory cache of the schedule index.
+    ScheduleApi: The HTTP server of the schedule read API.
+
+Functions:
+    load_schedules: Read the schedules of every loaded season from the database.
+    entity_tag: Get the ETag of a response body.
+    encode: Encode a response body, with datetimes in ISO 8601.
+    parse_time: Parse a time from a query, times without a zone are UTC.
+"""
+
+# Standard Library Imports
+import hashlib
+import json
+import re
+import threading
+import time
+from bisect import bisect_left, bisect_right
+from collections.abc import Callable
+from datetime import datetime, timezone
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import TYPE_CHECKING
+from urllib.parse import parse_qs, urlsplit
+
+# Third Party Imports
+from pymongo.errors import PyMongoError
+
+# Local Imports
+from src.models.schedules import SESSIONS, Schedule
+
+if TYPE_CHECKING:
+    from src.database.mongo_service import MongoService
+
+# Constants
+DEFAULT_HOST = "127.0.0.1"
+DEFAULT_PORT = 8000
+DEFAULT_MAX_AGE = 5 * 60
+# An unencoded + in a query string arrives as a space
+SPACED_OFFSET = re.compile(r"(\d{2}:\d{2}(?::\d{2}(?:\.\d+)?)?) (\d{2}(?::?\d{2})?)$")
+
+
+class ScheduleIndex:
+    """
+    This class holds the loaded schedules, indexed for reads.
+
+    The calendar of every season is encoded once, with its ETag. The start of every
+    session of every season is kept sorted next to the session it belongs to, so the
+    next and previous session are a binary search away.
+
+    Attributes:
+        seasons (list[int]): The loaded seasons, in order.
+        calendars (dict): The encoded calendar and ETag of every season, keyed by season.
+        starts (list[datetime]): The start of every session, in order.
+        sessions (list[dict]): The session of every start.
+
+    Methods:
+        next_session: Get the first session that starts after a point in time.
+        previous_session: Get the last session that started at or before a point in time.
+        sessions_between: Get the sessions that start within a period.
+    """
+
+    def __init__(self, schedules: dict[int, list[Schedule]]) -> None:
+        """
+        Construct the ScheduleIndex class.
+
+        Args:
+            schedules (dict[int, list[Schedule]]): The schedules of every season.
+        """
+        self.seasons = sorted(schedules)
+        self.calendars = {}
+        sessions = []
+        for season, season_schedules in schedules.items():
+            body = json.dumps(
+                [schedule.model_dump() for schedule in season_schedules]
+            ).encode("UTF-8")
+            self.calendars[season] = (body, entity_tag(body))
+
+            for schedule in season_schedules:
+                starts = {"Race": schedule.starts_at()}
+                for name in SESSIONS:
+                    session = getattr(schedule, name)
+                    starts[name] = session.starts_at() if session else None
+                for name, start in starts.items():
+                    if start is not None:
+                        sessions.append(
+                            {
+                                "Season": season,
+                                "Round": int(schedule.Round),
+                                "RaceName": schedule.RaceName,
+                                "Session": name,
+                                "Start": start,
+                            }
+                        )
+
+        sessions.sort(key=lambda session: session["Start"])
+        self.starts = [session["Start"] for session in sessions]
+        self.sessions = sessions
+
+    def next_session(self, moment: datetime) -> dict | None:
+        """
+        Get the first session that starts after a point in time.
+
+        Args:
+            moment (datetime): The point in time, in UTC.
+
+        Returns:
+            dict | None: The session, None if there is none.
+        """
+        index = bisect_right(self.starts, moment)
+        return self.sessions[index] if index < len(self.sessions) else None
+
+    def previous_session(self, moment: datetime) -> dict | None:
+        """
+        Get the last session that started at or before a point in time.
+
+        Args:
+            moment (datetime): The point in time, in UTC.
+
+        Returns:
+            dict | None: The session, None if there is none.
+        """
+        index = bisect_right(self.starts, moment)
+        return self.sessions[index - 1] if index > 0 else None
+
+    def sessions_between(self, start: datetime, end: datetime) -> list[dict]:
+        """
+        Get the sessions that start within a period.
+
+        Args:
+            start (datetime): The start of the period, in UTC.
+            end (datetime): The end of the period, in UTC.
+
+        Returns:
+            list[dict]: The sessions, in order.
+        """
+        first = bisect_left(self.starts, start)
+        last = bisect_right(self.starts, end)
+        return self.sessions[first:last]
+
+
+class ScheduleCache:
+    """
+    This class is the in-memory cache of the schedule index.
+
+    The index is built on first use and rebuilt when it is invalidated, which whoever
+    loads schedules in the same process does, or when it gets older than its maximum
+    age, which catches loads made by other processes.
+
+    Attributes:
+        loader (Callable): The function that reads the schedules of every season.
+        max_age (float): The seconds after which the index is rebuilt.
+        index (ScheduleIndex | None): The cached index, None until it is built.
+        built_at (float): The monotonic time the index was built at.
+
+    Methods:
+        get: Get the index, building it if it is missing or stale.
+        invalidate: Drop the index, so the next read builds it again.
+    """
+
+    def __init__(
+        self,
+        loader: Callable[[], dict[int, list[Schedule]]],
+        max_age: float = DEFAULT_MAX_AGE,
+    ) -> None:
+        """
+        Construct the ScheduleCache class.
+
+        Args:
+            loader (Callable): The function that reads the schedules of every season.
+            max_age (float, optional): The seconds after which the index is rebuilt.
+                Defaults to DEFAULT_MAX_AGE.
+        """
+        self.loader = loader
+        self.max_age = max_age
+        self.lock = threading.Lock()
+        self.index = None
+        self.built_at = 0.0
+
+    def get(self) -> ScheduleIndex:
+        """
+        Get the index, building it if it is missing or stale.
+
+        Returns:
+            ScheduleIndex: The index.
+        """
+        with self.lock:
+            if self.index is None or time.monotonic() - self.built_at > self.max_age:
+                self.index = ScheduleIndex(self.loader())
+                self.built_at = time.monotonic()
+            return self.index
+
+    def invalidate(self) -> None:
+        """Drop the index, so the next read builds it again."""
+        with self.lock:
+            self.index = None
+
+
+class ScheduleApi:
+    """
+    This class is the HTTP server of the schedule read API.
+
+    Every response carries an ETag, requests that send it back in If-None-Match get a
+    304 Not Modified without a body. It can be used as a context manager, which starts
+    the server in a background thread and stops it on exit.
+
+    Endpoints:
+        GET /seasons: The loaded seasons.
+        GET /schedules/<season>: The calendar of a season.
+        GET /sessions/next?at=<time>: The first session after a time, defaults to now.
+        GET /sessions/previous?at=<time>: The last session at or before a time.
+        GET /sessions?from=<time>&to=<time>: The sessions within a period.
+
+    Attributes:
+        cache (ScheduleCache): The cache of the schedule index.
+        host (str): The host to listen on.
+        port (int): The port to listen on, 0 for any free port.
+        server (ThreadingHTTPServer | None): The server, None until it is started.
+
+    Methods:
+        create_server: Create the server.
+        start: Start the server in a background thread.
+        stop: Stop the server.
+        serve_forever: Run the server in the current thread until interrupted.
+        respond: Build the status and body of the response to a request.
+    """
+
+    def __init__(
+        self, cache: ScheduleCache, host: str = DEFAULT_HOST, port: int = DEFAULT_PORT
+    ) -> None:
+        """
+        Construct the ScheduleApi class.
+
+        Args:
+            cache (ScheduleCache): The cache of the schedule index.
+            host (str, optional): The host to listen on. Defaults to DEFAULT_HOST.
+            port (int, optional): The port to listen on. Defaults to DEFAULT_PORT.
+        """
+        self.cache = cache
+        self.host = host
+        self.port = port
+        self.server = None
+
+    def __enter__(self) -> "ScheduleApi":
+        """Start the server."""
+        self.start()
+        return self
+
+    def __exit__(self, *args: object) -> None:
+        """Stop the server."""
+        self.stop()
+
+    @property
+    def url(self) -> str:
+        """Get the base url of the API."""
+        return f"http://{self.host}:{self.server.server_port}"
+
+    def create_server(self) -> ThreadingHTTPServer:
+        """
+        Create the server.
+
+        Returns:
+            ThreadingHTTPServer: The server, bound to the host and port.
+        """
+        api = self
+
+        class Handler(BaseHTTPRequestHandler):
+            protocol_version = "HTTP/1.1"
+            disable_nagle_algorithm = True
+
+            def do_GET(self) -> None:
+                status, body, tag = api.respond(self.path)
+                if tag is not None and self.headers.get("If-None-Match") == tag:
+                    status, body = 304, b""
+                self.send_response(status)
+                if tag is not None:
+                    self.send_header("ETag", tag)
+                    self.send_header("Cache-Control", "no-cache")
+                self.send_header("Content-Type", "application/json")
+                self.send_header("Content-Length", str(len(body)))
+                self.end_headers()
+                self.wfile.write(body)
+
+            def log_message(self, *args: object) -> None:
+                pass
+
+        server = ThreadingHTTPServer((self.host, self.port), Handler)
+        server.daemon_threads = True
+        return server
+
+    def start(self) -> None:
+        """Start the server in a background thread."""
+        self.server = self.create_server()
+        threading.Thread(target=self.server.serve_forever, daemon=True).start()
+
+    def stop(self) -> None:
+        """Stop the server."""
+        self.server.shutdown()
+        self.server.server_close()
+
+    def serve_forever(self) -> None:
+        """Run the server in the current thread until interrupted."""
+        self.server = self.create_server()
+        try:
+            self.server.serve_forever()
+        finally:
+            self.server.server_close()
+
+    def respond(self, target: str) -> tuple[int, bytes, str | None]:
+        """
+        Build the status and body of the response to a request.
+
+        Args:
+            target (str): The path and query of the request.
+
+        Returns:
+            tuple[int, bytes, str | None]: The status code, body and ETag of the
+                response, errors have no ETag. Bad queries are a 400, a database that
+                cannot be read a 503 and any other failure a 500.
+        """
+        parts = urlsplit(target)
+        segments = parts.path.strip("/").split("/")
+        query = {key: values[0] for key, values in parse_qs(parts.query).items()}
+
+        try:
+            index = self.cache.get()
+            if segments == ["seasons"]:
+                body = json.dumps(index.seasons).encode("UTF-8")
+            elif len(segments) == 2 and segments[0] == "schedules":
+                calendar = index.calendars.get(int(segments[1]))
+                if calendar is None:
+                    return 404, b'{"error": "Season not loaded."}', None
+                return 200, *calendar
+            elif segments == ["sessions", "next"]:
+                body = encode(index.next_session(parse_time(query.get("at"))))
+            elif segments == ["sessions", "previous"]:
+                body = encode(index.previous_session(parse_time(query.get("at"))))
+            elif segments == ["sessions"]:
+                if "from" not in query or "to" not in query:
+                    raise ValueError("Both from and to are required.")
+                body = encode(
+                    index.sessions_between(
+                        parse_time(query.get("from")), parse_time(query.get("to"))
+                    )
+                )
+            else:
+                return 404, b'{"error": "Not found."}', None
+        except ValueError as error:
+            return 400, json.dumps({"error": str(error)}).encode("UTF-8"), None
+        except PyMongoError:
+            return 503, b'{"error": "The schedules cannot be read right now."}', None
+        except Exception:
+            return 500, b'{"error": "Internal server error."}', None
+
+        return 200, body, entity_tag(body)
+
+
+def load_schedules(mongo_service: "MongoService") -> dict[int, list[Schedule]]:
+    """
+    Read the schedules of every loaded season from the database.
+
+    Args:
+        mongo_service (MongoService): The service to read the schedules with.
+
+    Returns:
+        dict[int, list[Schedule]]: The schedules of every season, ordered by round.
+    """
+    schedules = {}
+    for season in mongo_service.seasons("Schedules"):
+        schedules[season] = sorted(
+            (
+                Schedule.model_validate(document)
+                for document in mongo_service.iter_season("Schedules", season)
+            ),
+            key=lambda schedule: int(schedule.Round),
+        )
+    return schedules
+
+
+def entity_tag(body: bytes) -> str:
+    """
+    Get the ETag of a response body.
+
+    Args:
+        body (bytes): The body.
+
+    Returns:
+        str: The quoted hash of the body.
+    """
+    return f'"{hashlib.sha256(body).hexdigest()[:32]}"'
+
+
+def encode(value: object) -> bytes:
+    """
+    Encode a response body, with datetimes in ISO 8601.
+
+    Args:
+        value (object): The value to encode.
+
+    Returns:
+        bytes: The JSON body.
+    """
+    return json.dumps(value, default=datetime.isoformat).encode("UTF-8")
+
+
+def parse_time(value: str | None) -> datetime:
+    """
+    Parse a time from a query, times without a zone are UTC.
+
+    A + in a query string has to be encoded as %2B, an unencoded one arrives as a
+    space, so a space before the offset of a time is read as a +.
+
+    Args:
+        value (str | None): The time in ISO 8601, None for now.
+
+    Returns:
+        datetime: The time in UTC.
+
+    Raises:
+        ValueError: If the time is not in ISO 8601.
+    """
+    if value is None:
+        return datetime.now(timezone.utc)
+
+    value = SPACED_OFFSET.sub(r"\1+\2", value.strip())
+    moment = datetime.fromisoformat(value.replace("Z", "+00:00"))
+    if moment.tzinfo is None:
+        return moment.replace(tzinfo=timezone.utc)
+    return moment.astimezone(timezone.utc)
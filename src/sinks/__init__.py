@@ -0,0 +1,8 @@
+"""
+Folder for the storage sink related files.
+
+Modules:
+    sink: The interface of every destination the load commands write to.
+    jsonl_sink: The sink writing a JSON Lines file per season of every dataset.
+    sqlite_sink: The sink writing to an embedded SQLite database.
+"""
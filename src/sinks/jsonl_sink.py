@@ -0,0 +1,306 @@
+"""
+This module contains the JsonlSink class.
+
+The JsonlSink class is responsible for writing loaded data to JSON Lines files, one file
+per season of every dataset, so loads can run where there is no MongoDB server.
+"""
+
+# Standard Library Imports
+import json
+import os
+from collections.abc import Callable, Iterable, Iterator
+from itertools import chain
+from threading import Lock
+
+# Local Imports
+from src.config.configuration import CONFIG_DIRECTORY
+from src.database.mongo_service import schedule_document
+from src.helpers.utilities import batched
+from src.metrics.recorder import MetricsRecorder
+from src.models.schedules import Schedule
+from src.sinks.sink import DEFAULT_BATCH_SIZE, Sink, diff_documents
+
+# Constants
+JSONL_DIRECTORY = os.path.join(CONFIG_DIRECTORY, "jsonl")
+
+
+class JsonlSink(Sink):
+    """
+    This class is responsible for writing loaded data to JSON Lines files.
+
+    Every season of a dataset is a file, <directory>/<dataset>/<season>.jsonl, with a
+    document per line. Documents are appended to a temporary file as they stream in,
+    which is moved over the season's file once complete, so readers never see a
+    partial season.
+
+    Replaced rounds are buffered per season and written together, streaming the rest
+    of the season into the new file once, when a round of another season of the
+    dataset arrives or the sink is flushed or closed. Loading a season round by round
+    therefore rewrites its file once instead of once per round.
+
+    Attributes:
+        directory (str): The directory of the files.
+        metrics (MetricsRecorder): The recorder of stage timings and counters.
+        pending (dict): The buffered rounds, keyed by dataset and season, then round.
+
+    Methods:
+        season_path: Get the path of the file of a season of a dataset.
+        read_season: Stream the documents of a season of a dataset.
+        write_season: Replace a season of a dataset with a stream of documents.
+        insert_schedules: Replace all schedules for a year.
+        upsert_schedules: Write the schedules for a year if any of them changed.
+        insert_dataset: Replace a season of a dataset.
+        replace_round: Replace a single round of a dataset.
+        flush_season: Write the buffered rounds of a season of a dataset.
+        flush: Write every buffered round.
+        close: Write every buffered round.
+    """
+
+    def __init__(
+        self, directory: str | None = None, metrics: MetricsRecorder | None = None
+    ) -> None:
+        """
+        Construct the JsonlSink class.
+
+        Args:
+            directory (str, optional): The directory of the files.
+                Defaults to None, which uses JSONL_DIRECTORY.
+            metrics (MetricsRecorder, optional): The recorder of stage timings and
+                counters. Defaults to None, which records into a private recorder.
+        """
+        super().__init__(metrics)
+        self.directory = directory or JSONL_DIRECTORY
+        self.lock = Lock()
+        self.pending: dict[tuple[str, int], dict[str, list[dict]]] = {}
+
+    def season_path(self, dataset: str, year: int) -> str:
+        """
+        Get the path of the file of a season of a dataset.
+
+        Args:
+            dataset (str): The name of the dataset, for example "Results".
+            year (int): The year of the season.
+
+        Returns:
+            str: The path of the file.
+        """
+        return os.path.join(self.directory, dataset, f"{year}.jsonl")
+
+    def read_season(self, dataset: str, year: int) -> Iterator[dict]:
+        """
+        Stream the documents of a season of a dataset.
+
+        Args:
+            dataset (str): The name of the dataset, for example "Results".
+            year (int): The year of the season.
+
+        Yields:
+            dict: The next document, nothing if the season was never written.
+        """
+        path = self.season_path(dataset, year)
+        if not os.path.exists(path):
+            return
+
+        with open(path, "r", encoding="UTF-8") as season_file:
+            for line in season_file:
+                yield json.loads(line)
+
+    def write_season(
+        self,
+        dataset: str,
+        year: int,
+        documents: Iterable[dict],
+        batch_size: int = DEFAULT_BATCH_SIZE,
+        written: Callable[[int], None] | None = None,
+    ) -> int:
+        """
+        Replace a season of a dataset with a stream of documents.
+
+        Args:
+            dataset (str): The name of the dataset, for example "Results".
+            year (int): The year of the season.
+            documents (Iterable[dict]): The documents of the season.
+            batch_size (int, optional): The number of documents written at once.
+                Defaults to DEFAULT_BATCH_SIZE.
+            written (Callable, optional): Called with the number of documents of every
+                batch once it is written. Defaults to None.
+
+        Returns:
+            int: The number of documents written.
+        """
+        path = self.season_path(dataset, year)
+        temporary_path = f"{path}.tmp"
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+
+        count = 0
+        try:
+            with open(temporary_path, "w", encoding="UTF-8") as season_file:
+                for batch in batched(documents, batch_size):
+                    with self.metrics.stage("dump"):
+                        lines = "".join(
+                            json.dumps(document, separators=(",", ":"), default=str)
+                            + "\n"
+                            for document in batch
+                        )
+                    with self.metrics.stage("write"):
+                        season_file.write(lines)
+                    count += len(batch)
+                    if written:
+                        written(len(batch))
+            os.replace(temporary_path, path)
+        except BaseException:
+            if os.path.exists(temporary_path):
+                os.remove(temporary_path)
+            raise
+
+        return count
+
+    def insert_schedules(self, year: int, schedules: list[Schedule]):
+        """
+        Replace all schedules for a year.
+
+        Args:
+            year (int): The year to insert schedules for.
+            schedules (list[Schedule]): The schedules to insert.
+
+        Returns:
+            None
+        """
+        documents = (schedule_document(year, schedule) for schedule in schedules)
+        with self.lock:
+            self.write_season("Schedules", year, documents)
+
+    def upsert_schedules(self, year: int, schedules: list[Schedule]) -> dict:
+        """
+        Write the schedules for a year if any of them changed.
+
+        The content hash of every schedule is compared with the one on file, the file
+        is only written again when a schedule was inserted, updated or deleted.
+
+        Args:
+            year (int): The year to upsert schedules for.
+            schedules (list[Schedule]): The schedules to upsert.
+
+        Returns:
+            dict: The number of inserted, updated, deleted and unchanged schedules.
+        """
+        with self.metrics.stage("dump"):
+            documents = [schedule_document(year, schedule) for schedule in schedules]
+
+        with self.lock:
+            with self.metrics.stage("read.hashes"):
+                existing_hashes = {
+                    document["Round"]: document.get("ContentHash")
+                    for document in self.read_season("Schedules", year)
+                }
+            changed, removed_keys, summary = diff_documents(
+                existing_hashes, documents, "Round"
+            )
+            if changed or removed_keys:
+                self.write_season("Schedules", year, documents)
+
+        return summary
+
+    def insert_dataset(
+        self,
+        dataset: str,
+        year: int,
+        documents: Iterable[dict],
+        batch_size: int = DEFAULT_BATCH_SIZE,
+        written: Callable[[int], None] | None = None,
+    ) -> int:
+        """
+        Replace a season of a dataset.
+
+        Rounds of the season that are still buffered are dropped, the season replaces
+        them.
+
+        Args:
+            dataset (str): The name of the dataset, for example "Results".
+            year (int): The year of the season.
+            documents (Iterable[dict]): The documents of the season.
+            batch_size (int, optional): The number of documents written at once.
+                Defaults to DEFAULT_BATCH_SIZE.
+            written (Callable, optional): Called with the number of documents of every
+                batch once it is written. Defaults to None.
+
+        Returns:
+            int: The number of documents written.
+        """
+        with self.lock:
+            self.pending.pop((dataset, year), None)
+            return self.write_season(dataset, year, documents, batch_size, written)
+
+    def replace_round(
+        self,
+        dataset: str,
+        year: int,
+        round: int,
+        documents: list[dict],
+        batch_size: int = DEFAULT_BATCH_SIZE,
+    ) -> int:
+        """
+        Replace a single round of a dataset.
+
+        The round is buffered until the season is flushed, which happens when a round
+        of another season of the dataset is replaced or the sink is flushed or closed.
+        Callers must flush the sink before they rely on the round being on disk.
+
+        Args:
+            dataset (str): The name of the dataset, for example "Results".
+            year (int): The year of the season.
+            round (int): The round.
+            documents (list[dict]): The documents of the round.
+            batch_size (int, optional): The number of documents written at once.
+                Defaults to DEFAULT_BATCH_SIZE.
+
+        Returns:
+            int: The number of documents buffered.
+        """
+        with self.lock:
+            for other_dataset, other_year in list(self.pending):
+                if other_dataset == dataset and other_year != year:
+                    self.flush_season(other_dataset, other_year, batch_size)
+            self.pending.setdefault((dataset, year), {})[str(round)] = documents
+        return len(documents)
+
+    def flush_season(
+        self, dataset: str, year: int, batch_size: int = DEFAULT_BATCH_SIZE
+    ) -> int:
+        """
+        Write the buffered rounds of a season of a dataset.
+
+        The other rounds of the season are streamed from the old file into the new one,
+        followed by the buffered rounds. This must run while holding the lock.
+
+        Args:
+            dataset (str): The name of the dataset, for example "Results".
+            year (int): The year of the season.
+            batch_size (int, optional): The number of documents written at once.
+                Defaults to DEFAULT_BATCH_SIZE.
+
+        Returns:
+            int: The number of documents written, 0 if no round was buffered.
+        """
+        rounds = self.pending.pop((dataset, year), None)
+        if not rounds:
+            return 0
+
+        other_rounds = (
+            document
+            for document in self.read_season(dataset, year)
+            if document["Round"] not in rounds
+        )
+        return self.write_season(
+            dataset, year, chain(other_rounds, *rounds.values()), batch_size
+        )
+
+    def flush(self) -> None:
+        """Write every buffered round."""
+        with self.lock:
+            for dataset, year in list(self.pending):
+                self.flush_season(dataset, year)
+
+    def close(self) -> None:
+        """Write every buffered round."""
+        self.flush()
@@ -0,0 +1,177 @@
+"""
+This module contains the Sink class.
+
+The Sink class is the interface of every destination the load commands write to, so
+data can be loaded into MongoDB, JSONL files or SQLite alike.
+
+Functions:
+    diff_documents: Compare documents with the content hashes already stored.
+"""
+
+# Standard Library Imports
+from abc import ABC, abstractmethod
+from collections.abc import Callable, Iterable
+
+# Local Imports
+from src.metrics.recorder import MetricsRecorder
+from src.models.schedules import Schedule
+
+# Constants
+DEFAULT_BATCH_SIZE = 1000
+
+
+class Sink(ABC):
+    """
+    This class is the interface of every destination data is loaded into.
+
+    Every dataset is stored by season. Schedules are written a season at a time, the
+    other datasets a season or a round at a time. Documents are the ones loaded into
+    MongoDB: schedules carry their content hash, rounds are strings as ergast gives them.
+
+    Attributes:
+        raw_bson (bool): The sink takes documents already encoded to BSON.
+        metrics (MetricsRecorder): The recorder of stage timings and counters.
+
+    Methods:
+        insert_schedules: Replace all schedules for a year.
+        upsert_schedules: Write only the schedules that changed for a year.
+        insert_dataset: Replace a season of a dataset.
+        replace_round: Replace a single round of a dataset.
+        flush: Write everything the sink buffers.
+        close: Release everything the sink holds open.
+    """
+
+    raw_bson = False
+
+    def __init__(self, metrics: MetricsRecorder | None = None) -> None:
+        """
+        Construct the Sink class.
+
+        Args:
+            metrics (MetricsRecorder, optional): The recorder of stage timings and
+                counters. Defaults to None, which records into a private recorder.
+        """
+        self.metrics = metrics or MetricsRecorder()
+
+    def __enter__(self) -> "Sink":
+        """Enter the context manager."""
+        return self
+
+    def __exit__(self, *args: object) -> None:
+        """Exit the context manager, closing the sink."""
+        self.close()
+
+    @abstractmethod
+    def insert_schedules(self, year: int, schedules: list[Schedule]):
+        """
+        Replace all schedules for a year.
+
+        Args:
+            year (int): The year to insert schedules for.
+            schedules (list[Schedule]): The schedules to insert.
+        """
+
+    @abstractmethod
+    def upsert_schedules(self, year: int, schedules: list[Schedule]) -> dict:
+        """
+        Write only the schedules that changed for a year.
+
+        Args:
+            year (int): The year to upsert schedules for.
+            schedules (list[Schedule]): The schedules to upsert.
+
+        Returns:
+            dict: The number of inserted, updated, deleted and unchanged schedules.
+        """
+
+    @abstractmethod
+    def insert_dataset(
+        self,
+        dataset: str,
+        year: int,
+        documents: Iterable[dict],
+        batch_size: int = DEFAULT_BATCH_SIZE,
+        written: Callable[[int], None] | None = None,
+    ) -> int:
+        """
+        Replace a season of a dataset.
+
+        Args:
+            dataset (str): The name of the dataset, for example "Results".
+            year (int): The year of the season.
+            documents (Iterable[dict]): The documents of the season.
+            batch_size (int, optional): The number of documents written at once.
+                Defaults to DEFAULT_BATCH_SIZE.
+            written (Callable, optional): Called with the number of documents of every
+                batch once it is written. Defaults to None.
+
+        Returns:
+            int: The number of documents written.
+        """
+
+    @abstractmethod
+    def replace_round(
+        self,
+        dataset: str,
+        year: int,
+        round: int,
+        documents: list[dict],
+        batch_size: int = DEFAULT_BATCH_SIZE,
+    ) -> int:
+        """
+        Replace a single round of a dataset.
+
+        Args:
+            dataset (str): The name of the dataset, for example "Results".
+            year (int): The year of the season.
+            round (int): The round.
+            documents (list[dict]): The documents of the round.
+            batch_size (int, optional): The number of documents written at once.
+                Defaults to DEFAULT_BATCH_SIZE.
+
+        Returns:
+            int: The number of documents written.
+        """
+
+    def flush(self) -> None:
+        """
+        Write everything the sink buffers.
+
+        Callers that report or checkpoint what they wrote call this first, so nothing
+        is counted as loaded before it is durable. Sinks that write straight away have
+        nothing to do.
+        """
+
+    def close(self) -> None:
+        """Release everything the sink holds open."""
+
+
+def diff_documents(
+    existing_hashes: dict, documents: list[dict], key: str
+) -> tuple[list[dict], set, dict]:
+    """
+    Compare documents with the content hashes already stored.
+
+    Args:
+        existing_hashes (dict): The stored content hashes, keyed by the key field.
+        documents (list[dict]): The documents to write, with their content hash.
+        key (str): The field that identifies a document.
+
+    Returns:
+        tuple[list[dict], set, dict]: The documents that are new or changed, the keys
+            that are no longer present and the number of inserted, updated, deleted and
+            unchanged documents.
+    """
+    changed = []
+    summary = {"inserted": 0, "updated": 0, "deleted": 0, "unchanged": 0}
+    for document in documents:
+        existing_hash = existing_hashes.get(document[key])
+        if existing_hash == document["ContentHash"]:
+            summary["unchanged"] += 1
+            continue
+        summary["updated" if document[key] in existing_hashes else "inserted"] += 1
+        changed.append(document)
+
+    removed_keys = set(existing_hashes) - {document[key] for document in documents}
+    summary["deleted"] = len(removed_keys)
+    return changed, removed_keys, summary
@@ -0,0 +1,287 @@
+"""
+This module contains the SqliteSink class.
+
+The SqliteSink class is responsible for writing loaded data to an embedded SQLite
+database, so loads can run where there is no MongoDB server.
+"""
+
+# Standard Library Imports
+import json
+import os
+import sqlite3
+from collections.abc import Callable, Iterable
+from threading import Lock
+from uuid import uuid4
+
+# Local Imports
+from src.config.configuration import CONFIG_DIRECTORY
+from src.database.mongo_service import schedule_document
+from src.helpers.utilities import batched
+from src.metrics.recorder import MetricsRecorder
+from src.models.schedules import Schedule
+from src.sinks.sink import DEFAULT_BATCH_SIZE, Sink, diff_documents
+
+# Constants
+SQLITE_FILE = os.path.join(CONFIG_DIRECTORY, "lyzer.db")
+
+
+class SqliteSink(Sink):
+    """
+    This class is responsible for writing loaded data to an embedded SQLite database.
+
+    Every dataset is a table of documents stored as JSON next to their season, round
+    and content hash, indexed on the season and round, so they can be queried with
+    SQLite's JSON functions. The database runs in WAL mode and every season or round
+    is replaced in a single transaction.
+
+    Documents are encoded before the lock is taken and a transaction begins, so no
+    transaction stays open while documents are still being fetched. A streamed season
+    is written in batches to a temporary staging table, which is then swapped in.
+
+    Attributes:
+        path (str): The path of the database file.
+        metrics (MetricsRecorder): The recorder of stage timings and counters.
+        connection (sqlite3.Connection): The connection, shared by every thread.
+
+    Methods:
+        ensure_table: Create the table of a dataset once.
+        encode_rows: Encode documents into the rows of a table.
+        insert_rows: Insert rows into a table.
+        insert_schedules: Replace all schedules for a year.
+        upsert_schedules: Write only the schedules that changed for a year.
+        insert_dataset: Replace a season of a dataset.
+        replace_round: Replace a single round of a dataset.
+        close: Close the connection.
+    """
+
+    def __init__(
+        self, path: str | None = None, metrics: MetricsRecorder | None = None
+    ) -> None:
+        """
+        Construct the SqliteSink class.
+
+        Args:
+            path (str, optional): The path of the database file.
+                Defaults to None, which uses SQLITE_FILE.
+            metrics (MetricsRecorder, optional): The recorder of stage timings and
+                counters. Defaults to None, which records into a private recorder.
+        """
+        super().__init__(metrics)
+        self.path = path or SQLITE_FILE
+        os.makedirs(os.path.dirname(os.path.abspath(self.path)), exist_ok=True)
+
+        # Writes are serialised by the lock, so the connection can be shared
+        self.connection = sqlite3.connect(self.path, check_same_thread=False)
+        self.connection.execute("PRAGMA journal_mode=WAL")
+        self.connection.execute("PRAGMA synchronous=NORMAL")
+        self.lock = Lock()
+        self.tables = set()
+
+    def close(self) -> None:
+        """Close the connection."""
+        self.connection.close()
+
+    def ensure_table(self, dataset: str) -> None:
+        """
+        Create the table of a dataset once.
+
+        Args:
+            dataset (str): The name of the dataset, which is also the table name.
+        """
+        if dataset in self.tables:
+            return
+
+        with self.connection:
+            self.connection.execute(
+                f'CREATE TABLE IF NOT EXISTS "{dataset}" ('
+                "Season INTEGER NOT NULL, Round INTEGER NOT NULL, "
+                "ContentHash TEXT, Document TEXT NOT NULL)"
+            )
+            self.connection.execute(
+                f'CREATE INDEX IF NOT EXISTS "{dataset}_season_round" '
+                f'ON "{dataset}" (Season, Round)'
+            )
+        self.tables.add(dataset)
+
+    def encode_rows(self, year: int, documents: Iterable[dict]) -> list[tuple]:
+        """
+        Encode documents into the rows of a table.
+
+        Args:
+            year (int): The year of the season.
+            documents (Iterable[dict]): The documents to encode.
+
+        Returns:
+            list[tuple]: The season, round, content hash and JSON of every document.
+        """
+        with self.metrics.stage("dump"):
+            return [
+                (
+                    year,
+                    int(document["Round"]),
+                    document.get("ContentHash"),
+                    json.dumps(document, separators=(",", ":"), default=str),
+                )
+                for document in documents
+            ]
+
+    def insert_rows(self, table: str, rows: list[tuple]) -> None:
+        """
+        Insert rows into a table.
+
+        This must run inside a transaction.
+
+        Args:
+            table (str): The name of the table.
+            rows (list[tuple]): The rows, as encoded by encode_rows.
+        """
+        with self.metrics.stage("write"):
+            self.connection.executemany(
+                f'INSERT INTO "{table}" VALUES (?, ?, ?, ?)', rows
+            )
+
+    def insert_schedules(self, year: int, schedules: list[Schedule]):
+        """
+        Replace all schedules for a year.
+
+        Args:
+            year (int): The year to insert schedules for.
+            schedules (list[Schedule]): The schedules to insert.
+
+        Returns:
+            None
+        """
+        documents = (schedule_document(year, schedule) for schedule in schedules)
+        self.insert_dataset("Schedules", year, documents)
+
+    def upsert_schedules(self, year: int, schedules: list[Schedule]) -> dict:
+        """
+        Write only the schedules that changed for a year.
+
+        Args:
+            year (int): The year to upsert schedules for.
+            schedules (list[Schedule]): The schedules to upsert.
+
+        Returns:
+            dict: The number of inserted, updated, deleted and unchanged schedules.
+        """
+        with self.metrics.stage("dump"):
+            documents = [schedule_document(year, schedule) for schedule in schedules]
+
+        with self.lock:
+            self.ensure_table("Schedules")
+            with self.metrics.stage("read.hashes"):
+                existing_hashes = {
+                    str(round): content_hash
+                    for round, content_hash in self.connection.execute(
+                        'SELECT Round, ContentHash FROM "Schedules" WHERE Season = ?',
+                        (year,),
+                    )
+                }
+            changed, removed_keys, summary = diff_documents(
+                existing_hashes, documents, "Round"
+            )
+            rows = self.encode_rows(year, changed)
+            with self.connection:
+                self.connection.executemany(
+                    'DELETE FROM "Schedules" WHERE Season = ? AND Round = ?',
+                    [
+                        (year, int(round))
+                        for round in removed_keys
+                        | {document["Round"] for document in changed}
+                    ],
+                )
+                self.insert_rows("Schedules", rows)
+
+        return summary
+
+    def insert_dataset(
+        self,
+        dataset: str,
+        year: int,
+        documents: Iterable[dict],
+        batch_size: int = DEFAULT_BATCH_SIZE,
+        written: Callable[[int], None] | None = None,
+    ) -> int:
+        """
+        Replace a season of a dataset.
+
+        Every batch is encoded and inserted into a staging table on its own, the lock is
+        only held while a batch is inserted. The season is then replaced with the
+        staging table in a single transaction.
+
+        Args:
+            dataset (str): The name of the dataset, which is also the table name.
+            year (int): The year of the season.
+            documents (Iterable[dict]): The documents of the season.
+            batch_size (int, optional): The number of documents inserted at once.
+                Defaults to DEFAULT_BATCH_SIZE.
+            written (Callable, optional): Called with the number of documents of every
+                batch once it is inserted into the staging table. Defaults to None.
+
+        Returns:
+            int: The number of documents written.
+        """
+        staging = f"{dataset}.staging.{uuid4().hex}"
+        with self.lock:
+            self.ensure_table(dataset)
+            with self.connection:
+                self.connection.execute(
+                    f'CREATE TEMP TABLE "{staging}" AS SELECT * FROM "{dataset}" WHERE 0'
+                )
+
+        count = 0
+        try:
+            for batch in batched(documents, batch_size):
+                rows = self.encode_rows(year, batch)
+                with self.lock, self.connection:
+                    self.insert_rows(staging, rows)
+                count += len(rows)
+                if written:
+                    written(len(rows))
+
+            with self.lock, self.connection, self.metrics.stage("write.swap"):
+                self.connection.execute(
+                    f'DELETE FROM "{dataset}" WHERE Season = ?', (year,)
+                )
+                self.connection.execute(
+                    f'INSERT INTO "{dataset}" SELECT * FROM temp."{staging}"'
+                )
+        finally:
+            with self.lock, self.connection:
+                self.connection.execute(f'DROP TABLE temp."{staging}"')
+
+        return count
+
+    def replace_round(
+        self,
+        dataset: str,
+        year: int,
+        round: int,
+        documents: list[dict],
+        batch_size: int = DEFAULT_BATCH_SIZE,
+    ) -> int:
+        """
+        Replace a single round of a dataset.
+
+        Args:
+            dataset (str): The name of the dataset, which is also the table name.
+            year (int): The year of the season.
+            round (int): The round.
+            documents (list[dict]): The documents of the round.
+            batch_size (int, optional): Unused, the round is inserted at once.
+                Defaults to DEFAULT_BATCH_SIZE.
+
+        Returns:
+            int: The number of documents written.
+        """
+        rows = self.encode_rows(year, documents)
+        with self.lock:
+            self.ensure_table(dataset)
+            with self.connection:
+                self.connection.execute(
+                    f'DELETE FROM "{dataset}" WHERE Season = ? AND Round = ?',
+                    (year, round),
+                )
+                self.insert_rows(dataset, rows)
+        return len(rows)
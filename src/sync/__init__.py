@@ -0,0 +1,7 @@
+"""
+Folder for incremental sync related files.
+
+Modules:
+    watermarks: The on-disk store of what every dataset has been synced up to.
+    scheduler: The race-weekend-aware schedule of the serve command.
+"""
@@ -0,0 +1,136 @@
+"""
+This module contains the SyncScheduler class.
+
+The SyncScheduler class is responsible for deciding when the serve command syncs next,
+from the session times of the loaded schedules, so ergast is polled often right after a
+session ends and rarely the rest of the week.
+
+Functions:
+    session_ends: Get the end of every session of a list of schedules.
+"""
+
+# Standard Library Imports
+from bisect import bisect_left, bisect_right
+from datetime import datetime, timedelta
+
+# Local Imports
+from src.models.schedules import SESSIONS, Schedule
+
+# Constants
+SESSION_DURATIONS = {
+    "FirstPractice": timedelta(hours=1),
+    "SecondPractice": timedelta(hours=1),
+    "ThirdPractice": timedelta(hours=1),
+    "Qualifying": timedelta(hours=1),
+    "Sprint": timedelta(hours=1),
+    "Race": timedelta(hours=2),
+}
+DEFAULT_POLL_INTERVAL = timedelta(minutes=15)
+DEFAULT_POLL_WINDOW = timedelta(hours=6)
+DEFAULT_IDLE_INTERVAL = timedelta(days=1)
+
+
+class SyncScheduler:
+    """
+    This class is responsible for deciding when to sync next.
+
+    The end of every session is kept sorted, so finding the sessions around a point in
+    time is a binary search. For a while after a session ends, ergast is polled every
+    poll interval until its data is published, otherwise syncs back off to the idle
+    interval, waking up early when the next session ends.
+
+    Attributes:
+        poll_interval (timedelta): The time between syncs after a session ends.
+        poll_window (timedelta): How long after a session ends to keep polling.
+        idle_interval (timedelta): The time between syncs when no session ended.
+        ends (list[datetime]): The end of every known session, in order.
+
+    Methods:
+        update: Replace the known sessions with the sessions of schedules.
+        polling: Determine if a session ended within the poll window.
+        next_run: Get the time of the next sync.
+    """
+
+    def __init__(
+        self,
+        poll_interval: timedelta = DEFAULT_POLL_INTERVAL,
+        poll_window: timedelta = DEFAULT_POLL_WINDOW,
+        idle_interval: timedelta = DEFAULT_IDLE_INTERVAL,
+    ) -> None:
+        """
+        Construct the SyncScheduler class.
+
+        Args:
+            poll_interval (timedelta, optional): The time between syncs after a session
+                ends. Defaults to DEFAULT_POLL_INTERVAL.
+            poll_window (timedelta, optional): How long after a session ends to keep
+                polling. Defaults to DEFAULT_POLL_WINDOW.
+            idle_interval (timedelta, optional): The time between syncs when no session
+                ended. Defaults to DEFAULT_IDLE_INTERVAL.
+        """
+        self.poll_interval = poll_interval
+        self.poll_window = poll_window
+        self.idle_interval = idle_interval
+        self.ends = []
+
+    def update(self, schedules: list[Schedule]) -> None:
+        """
+        Replace the known sessions with the sessions of schedules.
+
+        Args:
+            schedules (list[Schedule]): The schedules, of any number of seasons.
+        """
+        self.ends = session_ends(schedules)
+
+    def polling(self, now: datetime) -> bool:
+        """
+        Determine if a session ended within the poll window.
+
+        Args:
+            now (datetime): The current time in UTC.
+
+        Returns:
+            bool: True if ergast should be polled every poll interval.
+        """
+        index = bisect_right(self.ends, now)
+        return index > 0 and now - self.ends[index - 1] <= self.poll_window
+
+    def next_run(self, now: datetime) -> datetime:
+        """
+        Get the time of the next sync.
+
+        Args:
+            now (datetime): The current time in UTC.
+
+        Returns:
+            datetime: The time of the next sync in UTC.
+        """
+        if self.polling(now):
+            return now + self.poll_interval
+
+        next_run = now + self.idle_interval
+        index = bisect_left(self.ends, now)
+        if index < len(self.ends):
+            next_run = min(next_run, self.ends[index])
+        return next_run
+
+
+def session_ends(schedules: list[Schedule]) -> list[datetime]:
+    """
+    Get the end of every session of a list of schedules.
+
+    Args:
+        schedules (list[Schedule]): The schedules.
+
+    Returns:
+        list[datetime]: The end of every session with a date, in UTC and in order.
+    """
+    ends = []
+    for schedule in schedules:
+        ends.append(schedule.starts_at() + SESSION_DURATIONS["Race"])
+        for name in SESSIONS:
+            session = getattr(schedule, name)
+            start = session.starts_at() if session else None
+            if start is not None:
+                ends.append(start + SESSION_DURATIONS[name])
+    return sorted(ends)
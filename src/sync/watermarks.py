@@ -0,0 +1,149 @@
+"""
+This module contains the WatermarkStore class.
+
+The WatermarkStore class is responsible for remembering how far every dataset has been
+synced, so a sync only has to fetch what is newer.
+"""
+
+# Standard Library Imports
+import json
+import os
+from datetime import datetime
+from threading import Lock
+
+# Local Imports
+from src.config.configuration import CONFIG_DIRECTORY
+
+# Constants
+WATERMARKS_FILE = os.path.join(CONFIG_DIRECTORY, "watermarks.json")
+
+
+class WatermarkStore:
+    """
+    This class is responsible for remembering how far every dataset has been synced.
+
+    Every dataset has a watermark holding the last season and round that was loaded
+    and the content hashes of what was written, keyed by "season" or "season/round".
+    The watermarks are kept in a single JSON file that is replaced atomically.
+
+    Attributes:
+        path (str): The path of the watermarks file.
+        watermarks (dict): The watermark of every dataset, keyed by dataset.
+
+    Methods:
+        read: Read the watermarks from disk.
+        write: Write the watermarks to disk.
+        get: Get the watermark of a dataset.
+        position: Get the last season and round loaded for a dataset.
+        content_hash: Get the content hash written for a season or round of a dataset.
+        advance: Record that a season or round of a dataset was loaded.
+    """
+
+    def __init__(self, path: str = WATERMARKS_FILE) -> None:
+        """
+        Construct the WatermarkStore class.
+
+        Args:
+            path (str, optional): The path of the watermarks file.
+                Defaults to WATERMARKS_FILE.
+        """
+        self.path = path
+        self.lock = Lock()
+        self.watermarks = self.read()
+
+    def read(self) -> dict:
+        """
+        Read the watermarks from disk.
+
+        Returns:
+            dict: The watermarks, empty if there are none yet or the file is unreadable.
+        """
+        try:
+            with open(self.path, "r", encoding="UTF-8") as watermarks_file:
+                return json.load(watermarks_file)
+        except (FileNotFoundError, json.JSONDecodeError):
+            return {}
+
+    def write(self) -> None:
+        """Write the watermarks to disk, replacing the old file atomically."""
+        os.makedirs(os.path.dirname(self.path), exist_ok=True)
+        temporary_path = f"{self.path}.tmp"
+        with open(temporary_path, "w", encoding="UTF-8") as watermarks_file:
+            json.dump(self.watermarks, watermarks_file, indent=4)
+        os.replace(temporary_path, self.path)
+
+    def get(self, dataset: str) -> dict:
+        """
+        Get the watermark of a dataset.
+
+        Args:
+            dataset (str): The name of the dataset.
+
+        Returns:
+            dict: The watermark, empty if the dataset was never synced.
+        """
+        with self.lock:
+            return dict(self.watermarks.get(dataset, {}))
+
+    def position(self, dataset: str) -> tuple[int, int] | None:
+        """
+        Get the last season and round loaded for a dataset.
+
+        Args:
+            dataset (str): The name of the dataset.
+
+        Returns:
+            tuple[int, int] | None: The season and round, None if the dataset was never
+                synced. The round is 0 for datasets that are loaded a season at a time.
+        """
+        watermark = self.get(dataset)
+        if "season" not in watermark:
+            return None
+        return watermark["season"], watermark.get("round", 0)
+
+    def content_hash(self, dataset: str, key: str) -> str | None:
+        """
+        Get the content hash written for a season or round of a dataset.
+
+        Args:
+            dataset (str): The name of the dataset.
+            key (str): The season, or the season and round as "season/round".
+
+        Returns:
+            str | None: The content hash, None if nothing was written for the key.
+        """
+        return self.get(dataset).get("hashes", {}).get(key)
+
+    def advance(
+        self,
+        dataset: str,
+        season: int,
+        round: int = 0,
+        key: str | None = None,
+        content_hash: str | None = None,
+    ) -> None:
+        """
+        Record that a season or round of a dataset was loaded.
+
+        The position never moves backwards, so re-syncing older seasons keeps the
+        watermark where it was. The watermarks are written to disk straight away,
+        so an interrupted sync resumes where it stopped.
+
+        Args:
+            dataset (str): The name of the dataset.
+            season (int): The season that was loaded.
+            round (int, optional): The round that was loaded. Defaults to 0.
+            key (str, optional): The key of the content hash. Defaults to None.
+            content_hash (str, optional): The content hash of what was written.
+                Defaults to None.
+        """
+        with self.lock:
+            watermark = self.watermarks.setdefault(dataset, {"hashes": {}})
+            position = (watermark.get("season", 0), watermark.get("round", 0))
+            if (season, round) >= position:
+                watermark["season"] = season
+                watermark["round"] = round
+            if key is not None:
+                watermark.setdefault("hashes", {})[key] = content_hash
+            watermark["syncedAt"] = datetime.now().isoformat()
+            self.write()
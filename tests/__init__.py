@@ -0,0 +1,10 @@
+"""
+This package contains the tests of the application.
+
+Modules:
+    test_jsonl_sink: The tests of the JsonlSink class.
+    test_mongo_service: The tests of the MongoService class and its helpers.
+    test_output: The tests of the OutputWriter class.
+    test_response_cache: The tests of the ResponseCache class.
+    test_sync: The tests of the sync command.
+"""
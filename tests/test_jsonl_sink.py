@@ -0,0 +1,52 @@
+"""This module contains the tests of the JsonlSink class."""
+
+# Standard Library Imports
+import os
+from unittest.mock import Mock
+
+# Local Imports
+from src.cli.import_cli import import_rounds
+from src.cli.load_cli import Dataset
+from src.sinks.jsonl_sink import JsonlSink
+
+
+class Race:
+    """A race of a dump round."""
+
+    def __init__(self, round: int) -> None:
+        """Construct the Race class."""
+        self.round = round
+
+    def documents(self) -> list[dict]:
+        """Get the documents of the race."""
+        return [{"Round": str(self.round), "Position": "1"}]
+
+
+class FakeDump:
+    """A dump with a single season of rounds."""
+
+    def iter_rounds(self, endpoint, seasons):
+        """Yield the season, round and race of every round."""
+        for round in range(1, 4):
+            yield 2010, round, Race(round)
+
+
+def test_replaced_rounds_are_buffered_until_flushed(tmp_path):
+    """A replaced round only reaches disk once the sink is flushed."""
+    sink = JsonlSink(str(tmp_path))
+    assert sink.replace_round("Results", 2010, 1, Race(1).documents()) == 1
+    assert not os.path.exists(sink.season_path("Results", 2010))
+
+    sink.flush()
+    assert list(sink.read_season("Results", 2010)) == Race(1).documents()
+    assert not sink.pending
+
+
+def test_imported_rounds_are_on_disk_when_counted(tmp_path):
+    """Importing flushes the sink before it reports the documents it imported."""
+    sink = JsonlSink(str(tmp_path))
+
+    count = import_rounds(FakeDump(), sink, Dataset.RESULTS, None, Mock())
+
+    assert count == 3
+    assert len(list(sink.read_season("Results", 2010))) == 3
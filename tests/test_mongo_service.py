@@ -0,0 +1,65 @@
+"""This module contains the tests of the MongoService class and its helpers."""
+
+# Third Party Imports
+import mongomock
+from bson import decode_all
+from bson.codec_options import CodecOptions
+from bson.raw_bson import RawBSONDocument
+
+# Local Imports
+from benchmarks.fake_ergast import paginate, round_rows
+from src.database import client_pool
+from src.database.mongo_service import (
+    DATASET_KEYS,
+    MongoService,
+    hash_document,
+    key_values,
+    plain_document,
+)
+from src.pipeline.async_pipeline import page_bson, page_documents
+
+# Constants
+MONGOMOCK_URI = "mongomock://tests"
+
+
+def page_body(endpoint: str) -> bytes:
+    """Build a raw page of a round of a dataset."""
+    rows = round_rows(2023, 1, endpoint)
+    return paginate(2023, 1, endpoint, rows, len(rows), 0)
+
+
+def test_process_and_thread_documents_have_the_same_keys_and_hashes():
+    """Raw BSON documents from the process pool key and hash like thread documents."""
+    for dataset, endpoint in (("Results", "results"), ("Qualifying", "qualifying")):
+        body = page_body(endpoint)
+        documents = page_documents(endpoint, body)
+        raw_documents = decode_all(
+            page_bson(endpoint, body), CodecOptions(document_class=RawBSONDocument)
+        )
+
+        fields = DATASET_KEYS[dataset]
+        keys = [key_values(document, fields) for document in documents]
+        assert None not in {value for key in keys for value in key}
+        assert [key_values(document, fields) for document in raw_documents] == keys
+        assert [hash_document(document) for document in raw_documents] == [
+            hash_document(document) for document in documents
+        ]
+        assert [plain_document(document) for document in raw_documents] == documents
+
+
+def test_replace_round_keeps_every_result_of_a_shared_drive():
+    """A driver with several results in one race keeps every one of them."""
+    client_pool.clients[MONGOMOCK_URI] = mongomock.MongoClient()
+    mongo_service = MongoService(MONGOMOCK_URI, raw_bson=False)
+    documents = [
+        {"Round": "1", "Position": "1", "Driver": {"DriverId": "fagioli"}},
+        {"Round": "1", "Position": "2", "Driver": {"DriverId": "farina"}},
+        {"Round": "1", "Position": "4", "Driver": {"DriverId": "fagioli"}},
+    ]
+
+    mongo_service.replace_round("Results", 1951, 1, documents)
+    mongo_service.replace_round("Results", 1951, 1, documents)
+
+    collection = mongo_service.client["Results"]["1951"]
+    stored = collection.find({}, {"_id": 0, "ContentHash": 0}).sort("Position", 1)
+    assert list(stored) == documents
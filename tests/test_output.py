@@ -0,0 +1,33 @@
+"""This module contains the tests of the OutputWriter class."""
+
+# Standard Library Imports
+import io
+import json
+
+# Local Imports
+from src.helpers.output import OutputWriter
+from src.sinks.jsonl_sink import JsonlSink
+
+
+def test_rows_are_printed_as_every_batch_is_written(tmp_path):
+    """Held rows are released batch by batch, not once the season is written."""
+    stream = io.StringIO()
+    writer = OutputWriter("jsonl", stream)
+    held = []
+
+    def documents():
+        for position in range(1, 8):
+            held.append(len(writer.held))
+            yield {"Round": "1", "Position": str(position)}
+
+    with JsonlSink(str(tmp_path)) as sink:
+        count = sink.insert_dataset(
+            "Results", 2010, writer.hold(documents()), 3, writer.release
+        )
+
+    assert count == 7
+    assert max(held) < 3
+    assert not writer.held
+    assert [
+        json.loads(line)["Position"] for line in stream.getvalue().splitlines()
+    ] == [str(position) for position in range(1, 8)]
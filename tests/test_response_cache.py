@@ -0,0 +1,41 @@
+"""This module contains the tests of the ResponseCache class."""
+
+# Standard Library Imports
+import os
+
+# Local Imports
+from src.cache.response_cache import INDEX_FILE, ResponseCache
+
+# Constants
+URL = "https://ergast.com/api/f1/2010/{}/results.json"
+
+
+def test_store_writes_the_index_on_flush(tmp_path):
+    """Stores change the index in memory until the cache is flushed."""
+    cache = ResponseCache(str(tmp_path))
+    for round in range(1, 4):
+        cache.store(URL.format(round), b"{}")
+
+    assert not os.path.exists(os.path.join(tmp_path, INDEX_FILE))
+    assert not [name for name in os.listdir(tmp_path) if name.endswith(".tmp")]
+
+    cache.flush()
+    reopened = ResponseCache(str(tmp_path))
+    assert reopened.lookup(URL.format(2))["body"] == b"{}"
+    assert reopened.total_size == 6
+
+
+def test_store_evicts_the_least_recently_used_when_full(tmp_path):
+    """The running total evicts the oldest responses once the cache is over its size."""
+    cache = ResponseCache(str(tmp_path), max_size=10)
+    cache.store(URL.format(1), b"1111")
+    cache.store(URL.format(2), b"2222")
+    cache.store(URL.format(2), b"22")
+    cache.store(URL.format(3), b"3333")
+
+    assert cache.total_size == 10
+    cache.store(URL.format(4), b"4444")
+
+    assert cache.lookup(URL.format(1)) is None
+    assert cache.lookup(URL.format(2))["body"] == b"22"
+    assert cache.total_size == 10
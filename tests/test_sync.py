@@ -0,0 +1,101 @@
+"""This module contains the tests of the sync command."""
+
+# Standard Library Imports
+import os
+from datetime import datetime, timezone
+
+# Local Imports
+from src.cli.load_cli import Dataset
+from src.cli.sync_cli import sync_rounds
+from src.models.schedules import Schedule
+from src.sync.watermarks import WatermarkStore
+
+# Constants
+NOW = datetime(2024, 6, 1, tzinfo=timezone.utc)
+
+
+class Race:
+    """A race that flattens into the given documents."""
+
+    def __init__(self, documents: list[dict]) -> None:
+        """Construct the Race class."""
+        self.documents = lambda: documents
+
+
+class FakeErgast:
+    """An ergast service with two raced rounds a season and data for some of them."""
+
+    def __init__(self, published: set[tuple[int, int]]) -> None:
+        """Construct the FakeErgast class."""
+        self.published = published
+
+    def get_schedules(self, season: int) -> list[Schedule]:
+        """Get two rounds raced in March, in every season."""
+        return [
+            Schedule.model_validate(
+                {
+                    "season": str(season),
+                    "round": str(round),
+                    "raceName": f"Grand Prix {round}",
+                    "date": f"{season}-03-0{round}",
+                    "time": "14:00:00Z",
+                }
+            )
+            for round in (1, 2)
+        ]
+
+    def iter_round(self, season: int, round: int, endpoint: str) -> list[Race]:
+        """Get the race of a round, nothing if it is not published."""
+        if (season, round) not in self.published:
+            return []
+        return [Race([{"Season": str(season), "Round": str(round)}])]
+
+
+class FakeMongo:
+    """A database that records the rounds written to it."""
+
+    def __init__(self) -> None:
+        """Construct the FakeMongo class."""
+        self.rounds = []
+
+    def replace_round(self, database, season, round, documents) -> int:
+        """Record a round."""
+        self.rounds.append((season, round))
+        return len(documents)
+
+    def flush(self) -> None:
+        """Write nothing, every round is recorded straight away."""
+
+
+def test_rounds_before_the_dataset_existed_are_skipped(tmp_path):
+    """Past rounds without data do not stop the sync or hold back the watermark."""
+    store = WatermarkStore(os.path.join(tmp_path, "watermarks.json"))
+    mongo = FakeMongo()
+    ergast = FakeErgast({(2023, 2), (2024, 1)})
+
+    summary = sync_rounds(ergast, mongo, store, Dataset.PIT_STOPS, 2022, NOW)
+
+    assert mongo.rounds == [(2023, 2), (2024, 1)]
+    assert summary == {"loaded": 2, "unchanged": 0, "empty": 3}
+    assert store.position(Dataset.PIT_STOPS.value) == (2024, 1)
+
+
+def test_unpublished_round_of_the_current_season_stops_the_sync(tmp_path):
+    """The first new round of the current season without data is retried later."""
+    store = WatermarkStore(os.path.join(tmp_path, "watermarks.json"))
+    mongo = FakeMongo()
+    ergast = FakeErgast({(2024, 1)})
+    store.advance(Dataset.PIT_STOPS.value, 2023, 2)
+
+    summary = sync_rounds(ergast, mongo, store, Dataset.PIT_STOPS, None, NOW)
+
+    assert mongo.rounds == [(2024, 1)]
+    assert summary == {"loaded": 1, "unchanged": 0, "empty": 0}
+    assert store.position(Dataset.PIT_STOPS.value) == (2024, 1)
+
+    ergast.published = {(2024, 2)}
+    summary = sync_rounds(ergast, mongo, store, Dataset.PIT_STOPS, None, NOW)
+
+    assert mongo.rounds == [(2024, 1), (2024, 2)]
+    assert summary == {"loaded": 1, "unchanged": 0, "empty": 1}
+    assert store.position(Dataset.PIT_STOPS.value) == (2024, 2)